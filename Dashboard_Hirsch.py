@@ -1,10 +1,25 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from fredapi import Fred
-import yfinance as yf
+from concurrent.futures import as_completed
 from datetime import datetime
+from analytics import (align_calendars, align_frequencies, block_average, cluster_order, correlation_matrix,
+                       curve_slopes, curve_snapshots, log_returns, mean_pairwise, price_metrics,
+                       rolling_correlations, summarize, top_pairs)
+from cache_backend import shared_cache, submit
+from charts import CHART_MAX_POINTS, downsample_figure, pyramid_view
+from fetchers import fetch_concurrently, fetch_start, fetch_yahoo_info, period_start
+from http_session import yahoo_session
+from instrumentation import prometheus_text, recorded, span, start_metrics_server, start_run, timed
+from prewarm import PREWARM_ENABLED, start_prewarmer
+from series_registry import (BOND_10Y_SERIES, COMMODITY_TICKERS, CPI_SERIES, FOREX_TICKERS, GDP_SERIES,
+                             MATURITY_ORDER, POLICY_RATE_SERIES, UNEMPLOYMENT_SERIES, YIELD_CURVE_SERIES,
+                             series_info)
+from timeseries_store import (cached_fred_pyramids, cached_fred_series, cached_yahoo_prices, cached_yahoo_pyramids,
+                              prewarm_fred_series, prewarm_yahoo_prices)
+
+# Mesure des temps de cette exécution du script (panneau de debug, /metrics)
+run_recorder = start_run()
+start_metrics_server()
 
 # Fonction de formattage des données 
     # Ajout de la fonction de formatage des grands nombres
@@ -24,6 +39,63 @@ def format_number(x):
     except:
         return str(x)
 
+# Affichage des graphiques : les longues séries sont sous-échantillonnées
+# (max_points par trace) avant d'être envoyées au navigateur
+def show_chart(fig, max_points=CHART_MAX_POINTS):
+    fig = downsample_figure(fig, max_points)
+    points = sum(len(trace.x) for trace in fig.data if trace.x is not None)
+    with span('plotly_chart', 'render', rows=points):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Affichage progressif : chaque section est dessinée dans son conteneur dès que
+# toutes ses données (Futures de wrapper.submit) sont arrivées, quel que soit
+# l'ordre des sections sur la page
+def render_as_ready(sections):
+    """sections : liste de (conteneur, [futures], fonction de rendu(*résultats))"""
+    slots = []
+    for container, futures, render in sections:
+        slot = container.empty()
+        slot.caption("⏳ Loading...")
+        slots.append(slot)
+    
+    pending = set(range(len(sections)))
+    all_futures = {f for _, futures, _ in sections for f in futures}
+    for _ in as_completed(all_futures):
+        for i in sorted(pending):
+            container, futures, render = sections[i]
+            if not all(f.done() for f in futures):
+                continue
+            pending.discard(i)
+            slots[i].empty()
+            with container:
+                try:
+                    render(*[f.result() for f in futures])
+                except Exception:
+                    st.error("Error loading data for this section.")
+
+# Panneau de debug : temps de chaque étape de l'exécution courante
+def show_timing_panel(recorder):
+    events = pd.DataFrame(recorder.events)
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("#### ⏱️ Rerun timings")
+        st.caption(f"Total: {(datetime.now().timestamp() - recorder.started_at) * 1000:.0f} ms")
+        if events.empty:
+            st.caption("No instrumented call in this rerun.")
+            return
+        for column in ['cache', 'rows', 'payload_bytes']:
+            if column not in events:
+                events[column] = None
+        by_kind = events.groupby('kind')['duration_ms'].agg(['count', 'sum']).round(1)
+        st.dataframe(by_kind, use_container_width=True)
+        st.dataframe(
+            events[['kind', 'name', 'duration_ms', 'cache', 'rows', 'payload_bytes']].sort_values('duration_ms', ascending=False),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button("Download JSON lines", recorder.to_jsonl(), file_name="hirsch_rerun.jsonl", mime="application/json")
+        st.download_button("Download Prometheus metrics", prometheus_text(), file_name="hirsch_metrics.prom", mime="text/plain")
+
 # Configuration de la page
 st.set_page_config(
     page_title="Hirsch Capital - Dashboard",
@@ -197,13 +269,6 @@ hr {
 """, unsafe_allow_html=True)
 
 
-# Initialisation FRED API
-@st.cache_resource
-def init_fred():
-    return Fred(api_key='2d1c543149c61f38630e0e0ff35d539c')
-
-fred = init_fred()
-
 # Mapping des devises par pays
 COUNTRY_CURRENCIES = {
     'USA': 'USD',
@@ -215,174 +280,226 @@ COUNTRY_CURRENCIES = {
     'Switzerland': 'CHF'
 }
 
-# Fonctions de récupération des données
-@st.cache_data(ttl=3600)
-def get_gdp_data(countries, period='5Y'):
-    gdp_series = {
-        'USA': 'GDP',
-        'France': 'CPMNACSCAB1GQFR',
-        'UK': 'UKNGDP',
-        'Germany': 'CPMNACSCAB1GQDE',
-        'Japan': 'JPNNGDP',
-        'China': 'MKTGDPCNA646NWDB'
-    }
-    
+# Indicateurs des cards (dernière valeur et variation en %) pour tout un panel de séries
+def value_and_variation(data):
+    stats = summarize(data, {'variation': 1}).rename(columns={'last': 'value'})
+    return stats[['value', 'variation']].round(2).to_dict('index')
+
+# Fonctions de récupération des données. Seules les séries brutes sont en cache
+# (une entrée par série, voir timeseries_store) : les vues par pays et par
+# période sont des tranches assemblées à chaque rendu, sans copie en cache.
+# Les séries destinées aux graphiques quotidiens sont renvoyées en pyramides
+# (quotidien, hebdomadaire, mensuel) : le graphique choisit son niveau avec pyramid_view
+@timed('fetch')
+def get_gdp_data(countries, period='5y'):
     data = {}
-    variations = {}
+    # Au moins 2 ans d'historique pour la variation YoY des séries trimestrielles
+    fetched = cached_fred_series(
+        [GDP_SERIES[c] for c in countries if c in GDP_SERIES],
+        observation_start=fetch_start(period, pd.DateOffset(years=2))
+    )
     
     for country in countries:
-        if country in gdp_series:
-            series = fred.get_series(gdp_series[country])
-            data[country] = series
-            variations[country] = {
-                'QoQ': round(series.pct_change().iloc[-1] * 100, 2),
-                'YoY': round(series.pct_change(4).iloc[-1] * 100, 2)
-            }
+        if GDP_SERIES.get(country) in fetched:
+            data[country] = fetched[GDP_SERIES[country]]
     
+    variations = summarize(data, {'QoQ': 1, 'YoY': 4})[['QoQ', 'YoY']].round(2).to_dict('index')
     return data, variations
 
-@st.cache_data(ttl=3600)
-def get_cpi_data(countries):
-    cpi_series = {
-        'USA': 'CPIAUCSL',
-        'France': 'CP0000FRM086NEST',
-        'UK': 'CP0000GBM086NEST',
-        'Germany': 'CP0000DEM086NEST',
-        'Japan': 'CPALTT01JPM657N',
-        'China': 'CPALTT01CNM657N'
-    }
-    
+@timed('fetch')
+def get_cpi_data(countries, period='max'):
     data = {}
-    variations = {}
+    fetched = cached_fred_series(
+        [CPI_SERIES[c] for c in countries if c in CPI_SERIES],
+        observation_start=fetch_start(period, pd.DateOffset(years=2))
+    )
     
     for country in countries:
-        if country in cpi_series:
-            series = fred.get_series(cpi_series[country])
-            data[country] = series
-            variations[country] = {
-                'MoM': round(series.pct_change().iloc[-1] * 100, 2),
-                'YoY': round(series.pct_change(12).iloc[-1] * 100, 2)
-            }
+        if CPI_SERIES.get(country) in fetched:
+            data[country] = fetched[CPI_SERIES[country]]
     
+    variations = summarize(data, {'MoM': 1, 'YoY': 12})[['MoM', 'YoY']].round(2).to_dict('index')
     return data, variations
-@st.cache_data(ttl=3600)
 
+@timed('fetch')
 def unemployment_rate():
-    unemp_series = {
-        'USA': 'UNRATE',                 # US Unemployment Rate
-        'Europe': 'LRHUTTTTEUM156S'      # Euro Area Unemployment Rate
-    }
-    
     data = {}
-    summary = {}
+    fetched = cached_fred_series(UNEMPLOYMENT_SERIES.values(), observation_start='2000-01-01')
     
-    for region, series_id in unemp_series.items():
-        series = fred.get_series(series_id, observation_start='2000-01-01')
-        data[region] = series
+    for region, series_id in UNEMPLOYMENT_SERIES.items():
+        if series_id in fetched:
+            data[region] = fetched[series_id]
         
-        summary[region] = {
-            'value': round(series.iloc[-1], 2),
-            'variation': round(series.pct_change().iloc[-1] * 100, 2)
-        }
-    return data, summary
+    return data, value_and_variation(data)
 
-@st.cache_data(ttl=3600)
+@timed('fetch')
 def get_forex_data(pairs, period='1y'):
-    forex_tickers = {
-        'EURUSD': 'EURUSD=X',
-        'GBPUSD': 'GBPUSD=X',
-        'USDJPY': 'JPY=X',
-        'USDCNY': 'CNY=X',
-        'USDCHF': 'CHF=X'
-    }
-    
     data = {}
-    summary = {}
+    pyramids = cached_yahoo_pyramids([FOREX_TICKERS[p] for p in pairs if p in FOREX_TICKERS], period)
     
     for pair in pairs:
-        if pair in forex_tickers:
-            ticker_data = yf.Ticker(forex_tickers[pair]).history(period=period)['Close']
-            data[pair] = ticker_data
-            
-            var_1w = ticker_data.pct_change(5).iloc[-1] * 100
-            var_1m = ticker_data.pct_change(21).iloc[-1] * 100
-            
-            summary[pair] = {
-                'value': round(ticker_data.iloc[-1], 4),
-                'var_1w': round(var_1w, 2),
-                'var_1m': round(var_1m, 2)
-            }
+        if FOREX_TICKERS.get(pair) in pyramids:
+            data[pair] = pyramids[FOREX_TICKERS[pair]]
     
+    stats = summarize({pair: pyramid['D'] for pair, pyramid in data.items()}, {'var_1w': 5, 'var_1m': 21}).rename(columns={'last': 'value'})
+    summary = stats[['value', 'var_1w', 'var_1m']].round({'value': 4, 'var_1w': 2, 'var_1m': 2}).to_dict('index')
     return data, summary
 
-@st.cache_data(ttl=3600)
+@timed('fetch')
 def get_commodities_data(period='1y'):
-    gold = yf.Ticker("GC=F").history(period=period)['Close']
-    oil = yf.Ticker("CL=F").history(period=period)['Close']
+    pyramids = cached_yahoo_pyramids(COMMODITY_TICKERS.values(), period)
     
-    return {
-        'Gold': gold,
-        'Oil': oil
-    }
+    data = {name: pyramids[ticker] for name, ticker in COMMODITY_TICKERS.items()}
+    return data, value_and_variation({name: pyramid['D'] for name, pyramid in data.items()})
 
-@st.cache_data(ttl=3600)
-def get_interest_rates():
-    us_fed = fred.get_series('EFFR') 
-    euro_ecb = fred.get_series('ECBESTRVOLWGTTRMDMNRT') 
+@timed('fetch')
+def get_interest_rates(period='max'):
+    fetched = cached_fred_pyramids(
+        POLICY_RATE_SERIES.values(),
+        observation_start=fetch_start(period, pd.DateOffset(months=1))
+    )
     
-    return {
-        'US_Fed': us_fed,
-        'Euro_ECB': euro_ecb
-    }
+    data = {name: fetched[series_id] for name, series_id in POLICY_RATE_SERIES.items()}
+    return data, value_and_variation({name: pyramid['D'] for name, pyramid in data.items()})
 
-@st.cache_data(ttl=3600)
-def get_bond_rates(countries):
-    bond_series = {
-        'USA': 'DGS10',
-        'Germany': 'IRLTLT01DEM156N',
-        'France': 'IRLTLT01FRM156N',
-        'UK': 'IRLTLT01GBM156N',
-        'Japan': 'IRLTLT01JPM156N'
-    }
-    
+@timed('fetch')
+def get_bond_rates(countries, period='max'):
     data = {}
-    summary = {}
+    # Séries OCDE mensuelles publiées avec retard : au moins 1 an pour la variation
+    fetched = cached_fred_pyramids(
+        [BOND_10Y_SERIES[c] for c in countries if c in BOND_10Y_SERIES],
+        observation_start=fetch_start(period, pd.DateOffset(years=1))
+    )
     
     for country in countries:
-        if country in bond_series:
-            series = fred.get_series(bond_series[country])
-            data[country] = series
-            summary[country] = {
-                'value': round(series.iloc[-1], 2),
-                'variation': round(series.pct_change().iloc[-1] * 100, 2)
-            }
+        if BOND_10Y_SERIES.get(country) in fetched:
+            data[country] = fetched[BOND_10Y_SERIES[country]]
     
-    return data, summary
+    return data, value_and_variation({country: pyramid['D'] for country, pyramid in data.items()})
 
-@st.cache_data(ttl=3600)
-def get_yield_curve(country):
-    """Récupère la courbe des taux pour un pays"""
-    maturities = {
-        'USA': {
-            '1M': 'DGS1MO', '3M': 'DGS3MO', '6M': 'DGS6MO',
-            '1Y': 'DGS1', '2Y': 'DGS2', '5Y': 'DGS5',
-            '7Y': 'DGS7', '10Y': 'DGS10', '20Y': 'DGS20', '30Y': 'DGS30'
-        }
-    }
+# Spreads et comparaisons entre pays : les séries (quotidiennes, mensuelles OCDE,
+# trimestrielles, annuelles) sont d'abord alignées sur une grille commune
+SPREAD_ALIGNMENTS = {
+    'Monthly average': 'resample',
+    'Last published value': 'asof'
+}
+
+@shared_cache(ttl=3600, source='fred')
+def get_aligned_series(series_ids, policy='resample', observation_start=None):
+    """Séries FRED alignées selon policy (voir align_frequencies) : une colonne par série
     
-    if country not in maturities:
-        return None
+    Une entrée de cache par (séries, politique, début) : un spread n'est pas recalculé à chaque rerun.
+    """
+    fetched = cached_fred_series(series_ids, observation_start=observation_start)
+    frequencies = {code: series_info(code)['frequency'] for code in fetched if series_info(code)}
+    return align_frequencies(fetched, policy, frequencies=frequencies)
+
+@shared_cache(ttl=3600, source='fred')
+def get_yield_curve_histories(countries):
+    """Historique complet des courbes des taux : {pays: matrice dates x maturités}
     
-    curve_data = {}
-    for maturity, code in maturities[country].items():
-        try:
-            series = fred.get_series(code)
-            if series is not None and len(series) > 0:
-                curve_data[maturity] = series.iloc[-1]
-        except:
-            pass
+    Toutes les maturités de tous les pays partent en une seule vague de requêtes ;
+    les matrices assemblées sont en cache, une entrée par liste de pays.
+    """
+    countries = [c for c in countries if c in YIELD_CURVE_SERIES]
+    fetched = cached_fred_series([code for c in countries for code in YIELD_CURVE_SERIES[c].values()])
     
-    return curve_data
+    histories = {}
+    for country in countries:
+        maturities = YIELD_CURVE_SERIES[country]
+        matrix = pd.DataFrame({maturity: fetched[code] for maturity, code in maturities.items() if code in fetched})
+        if not matrix.empty:
+            histories[country] = matrix.sort_index().dropna(how='all')
+    return histories
+
+def get_yield_curve_history(country):
+    """Historique complet de la courbe des taux d'un pays (None si indisponible)"""
+    return get_yield_curve_histories([country]).get(country)
+
+def get_yield_curve(country):
+    """Dernière courbe des taux connue d'un pays : {maturité: taux}"""
+    history = get_yield_curve_history(country)
+    if history is None or history.empty:
+        return None
+    return history.ffill().iloc[-1].dropna().to_dict()
+
+# Données par ticker de l'equity suite : prix rafraîchis souvent, fondamentaux une fois par jour
+# (yfinance n'est importé qu'au premier appel, la page d'accueil n'en a pas besoin)
+def yahoo_ticker(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker, session=yahoo_session())
+
+@shared_cache(ttl=900)
+def get_ticker_history(ticker, period):
+    return yahoo_ticker(ticker).history(period=period)
+
+@shared_cache(ttl=86400)
+def get_ticker_info(ticker):
+    return fetch_yahoo_info(ticker)
+
+@shared_cache(ttl=86400)
+def get_financial_statement(ticker, statement):
+    """statement : 'financials', 'balance_sheet' ou 'cashflow'"""
+    return getattr(yahoo_ticker(ticker), statement)
+
+# Screener : la watchlist est traitée par lots de SCREENER_BATCH tickers (prix groupés,
+# fiches info en parallèle sous limite de débit) pour afficher les premières lignes au plus tôt
+SCREENER_BATCH = 25
+SCREENER_FIELDS = {
+    'shortName': 'Name',
+    'sector': 'Sector',
+    'industry': 'Industry',
+    'currency': 'Currency',
+    'marketCap': 'Market Cap',
+    'trailingPE': 'Trailing P/E',
+    'forwardPE': 'Forward P/E',
+    'priceToBook': 'Price to Book',
+    'enterpriseToEbitda': 'EV / EBITDA',
+    'revenueGrowth': 'Revenue Growth',
+    'earningsGrowth': 'Earnings Growth',
+    'grossMargins': 'Gross Margin',
+    'operatingMargins': 'Operating Margin',
+    'profitMargins': 'Profit Margin',
+    'returnOnEquity': 'ROE',
+    'debtToEquity': 'Debt to Equity',
+    'dividendYield': 'Dividend Yield',
+    'recommendationKey': 'Recommendation',
+}
+
+# Hors pré-chauffage : une watchlist saisie une fois ne doit pas être retéléchargée en boucle
+@shared_cache(ttl=900)
+def get_screener_batch(tickers, period):
+    """Lignes du screener pour un lot de tickers : métriques de prix et champs info"""
+    metrics = price_metrics(cached_yahoo_prices(tickers, period, prewarm=False))
+    infos = dict(fetch_concurrently(get_ticker_info, tickers))
+    fields = pd.DataFrame.from_dict(
+        {t: {k: infos[t].get(k) for k in SCREENER_FIELDS} for t in tickers if isinstance(infos.get(t), dict)},
+        orient='index',
+        columns=list(SCREENER_FIELDS)
+    ).rename(columns=SCREENER_FIELDS)
+    table = metrics.rename(columns={'last': 'Last Price', 'performance': 'Performance (%)', 'volatility': 'Volatility (%)'})
+    return table.join(fields, how='outer').reindex([t for t in tickers if t in table.index or t in fields.index])
+
+# Corrélations des rendements : les calendriers des places sont d'abord alignés
+# ('ffill' : union des dates, jours fériés comblés ; 'intersect' : dates communes).
+# Au-delà de LARGE_UNIVERSE_TICKERS, vue par classification et paires les plus fortes
+LARGE_UNIVERSE_TICKERS = 40
+# Corrélations glissantes : au plus ROLLING_MAX_FRAMES matrices N x N en float64,
+# soit ~10 Mo et ~0,13 s pour 50 tickers ; le plafond garde le résultat sous ~27 Mo
+ROLLING_MAX_TICKERS = 80
+
+# Univers libres, potentiellement grands : ni les matrices ni les prix ne sont pré-chauffés
+@shared_cache(ttl=3600)
+def get_return_correlations(tickers, period, alignment='ffill', method='pearson', shrinkage=False):
+    returns = log_returns(align_calendars(cached_yahoo_prices(tickers, period, prewarm=False), alignment))
+    return correlation_matrix(returns, method, shrinkage)
+
+@shared_cache(ttl=3600)
+def get_rolling_correlations(tickers, period, window, alignment='ffill'):
+    """Corrélations glissantes des rendements journaliers : (dates, matrices dates x N x N, tickers)"""
+    returns = log_returns(align_calendars(cached_yahoo_prices(tickers, period, prewarm=False), alignment))
+    dates, matrices = rolling_correlations(returns, window)
+    return dates, matrices, list(returns.columns)
 
 # Fonction pour déterminer les paires forex nécessaires
 def get_required_forex_pairs(countries):
@@ -405,6 +522,24 @@ def get_required_forex_pairs(countries):
     
     return pairs
 
+# Pré-chauffage en arrière-plan, démarré une seule fois par processus après le
+# premier rendu : sélections par défaut des pages, puis tous les appels faits
+# par les utilisateurs
+@st.cache_resource(show_spinner=False)
+def start_background_prewarm():
+    if not PREWARM_ENABLED:
+        return None
+    countries = ['USA', 'France', 'Germany', 'UK']
+    prewarm_fred_series([GDP_SERIES[c] for c in countries], fetch_start('1mo', pd.DateOffset(years=2)))
+    prewarm_fred_series([CPI_SERIES[c] for c in countries], fetch_start('1mo', pd.DateOffset(years=2)))
+    prewarm_fred_series(UNEMPLOYMENT_SERIES.values(), '2000-01-01')
+    prewarm_yahoo_prices([FOREX_TICKERS[p] for p in get_required_forex_pairs(['USA', 'France', 'Germany'])], '1mo')
+    prewarm_yahoo_prices(COMMODITY_TICKERS.values(), '1mo')
+    prewarm_fred_series(POLICY_RATE_SERIES.values(), fetch_start('1mo', pd.DateOffset(months=1)))
+    prewarm_fred_series([BOND_10Y_SERIES[c] for c in ['USA', 'Germany', 'France']], fetch_start('1mo', pd.DateOffset(years=1)))
+    prewarm_fred_series([code for c in ['USA', 'Germany', 'France'] for code in YIELD_CURVE_SERIES[c].values()])
+    return start_prewarmer()
+
 # ========== HEADER ==========
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -453,7 +588,11 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    show_timings = st.checkbox("Show rerun timings", key="debug_timing")
+
 # ========== NAVIGATION ==========
+# Chaque page importe ses propres bibliothèques de graphiques et ne charge que
+# ses données : la page d'accueil n'importe ni plotly ni yfinance.
 # Session state pour la navigation
 if 'page' not in st.session_state:
     st.session_state.page = 'home'
@@ -510,6 +649,8 @@ if st.session_state.page == 'home':
 
 # ========== PAGE GDP & CPI & UNEMPLOYMENT ==========
 elif st.session_state.page == 'gdp_cpi':
+    import plotly.graph_objects as go
+
     col1, col2 = st.columns([6, 1])
     with col1:
         st.markdown("## GDP,CPI & Unemployment Rate")
@@ -536,23 +677,27 @@ elif st.session_state.page == 'gdp_cpi':
     ['USA', 'France', 'Germany', 'UK', 'China', 'Japan'],
     default=['USA', 'France', 'Germany', 'UK'])
     
-    # Récupération des données
-    gdp_data, gdp_variations = get_gdp_data(macro_countries, selected_period)
-    cpi_data, cpi_variations = get_cpi_data(macro_countries)
-    unemp_data, unemp_summary = unemployment_rate()
+    # Récupération des données : les trois requêtes partent en même temps et
+    # chaque section est dessinée dès que ses propres données sont arrivées
+    gdp_future = submit(get_gdp_data, macro_countries, selected_period)
+    cpi_future = submit(get_cpi_data, macro_countries, selected_period)
+    unemp_future = submit(unemployment_rate)
+    # PIB trimestriels et annuel (Chine) sur une même grille pour la base 100
+    normalized_future = get_aligned_series.submit(
+        [GDP_SERIES[c] for c in macro_countries if c in GDP_SERIES],
+        'asof',
+        fetch_start(selected_period, pd.DateOffset(years=2))
+    )
 
-    
-    # Bar charts côte à côte
-    col1, col2 = st.columns(2)
-    
-    with col1:
+    def render_gdp_variations(gdp_result):
+        gdp_data, gdp_variations = gdp_result
         st.markdown("### GDP Variations")
-        
+    
         # Préparer les données pour le graphique
         gdp_countries = list(gdp_variations.keys())
         gdp_qoq = [gdp_variations[c]['QoQ'] for c in gdp_countries]
         gdp_yoy = [gdp_variations[c]['YoY'] for c in gdp_countries]
-        
+    
         fig = go.Figure()
         fig.add_trace(go.Bar(
             x=gdp_countries,
@@ -570,7 +715,7 @@ elif st.session_state.page == 'gdp_cpi':
             text=[f"{v:+.2f}%" for v in gdp_yoy],
             textposition='auto',
         ))
-        
+    
         fig.update_layout(
             barmode='group',
             yaxis_title="Variation (%)",
@@ -582,17 +727,18 @@ elif st.session_state.page == 'gdp_cpi':
             yaxis=dict(gridcolor='#1e3a5f'),
             legend=dict(font=dict(color='white'))
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
     
-    with col2:
+        show_chart(fig)
+
+    def render_cpi_variations(cpi_result):
+        cpi_data, cpi_variations = cpi_result
         st.markdown("### CPI Variations")
-        
+    
         # Préparer les données pour le graphique
         cpi_countries = list(cpi_variations.keys())
         cpi_mom = [cpi_variations[c]['MoM'] for c in cpi_countries]
         cpi_yoy = [cpi_variations[c]['YoY'] for c in cpi_countries]
-        
+    
         fig = go.Figure()
         fig.add_trace(go.Bar(
             x=cpi_countries,
@@ -610,7 +756,7 @@ elif st.session_state.page == 'gdp_cpi':
             text=[f"{v:+.2f}%" for v in cpi_yoy],
             textposition='auto',
         ))
-        
+    
         fig.update_layout(
             barmode='group',
             yaxis_title="Variation (%)",
@@ -622,90 +768,110 @@ elif st.session_state.page == 'gdp_cpi':
             yaxis=dict(gridcolor='#1e3a5f'),
             legend=dict(font=dict(color='white'))
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
     
-    st.markdown("---")
-    st.markdown("### 👷 Unemployment Rate")
+        show_chart(fig)
+
+    def render_unemployment(unemp_result):
+        unemp_data, unemp_summary = unemp_result
+        st.markdown("### 👷 Unemployment Rate")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.metric(
+                label="🇺🇸 USA Unemployment Rate",
+                value=f"{unemp_summary['USA']['value']}%",
+                delta=f"{unemp_summary['USA']['variation']}%"
+                )
+        with col2:
+            st.metric(
+                label="🇪🇺 Europe Unemployment Rate",
+                value=f"{unemp_summary['Europe']['value']}%",
+                delta=f"{unemp_summary['Europe']['variation']}%"
+                )
+        st.markdown("---")
+        st.markdown("### 📉 Unemployment Rate – Historic")
 
-    col1, col2 = st.columns(2)
+        fig = go.Figure()
+        colors = {'USA': '#FF6B6B', 'Europe': '#4FC3F7'}
 
-    with col1:
-        st.metric(
-            label="🇺🇸 USA Unemployment Rate",
-            value=f"{unemp_summary['USA']['value']}%",
-            delta=f"{unemp_summary['USA']['variation']}%"
-            )
-    with col2:
-        st.metric(
-            label="🇪🇺 Europe Unemployment Rate",
-            value=f"{unemp_summary['Europe']['value']}%",
-            delta=f"{unemp_summary['Europe']['variation']}%"
-            )
-    st.markdown("---")
-    st.markdown("### 📉 Unemployment Rate – Historic")
-
-    fig = go.Figure()
-    colors = {'USA': '#FF6B6B', 'Europe': '#4FC3F7'}
-
-    for region, series in unemp_data.items():
-        fig.add_trace(go.Scatter(
-            x=series.index,
-            y=series.values,
-            name=region,
-            line=dict(color=colors[region], width=3),
-            mode='lines'))
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Unemployment Rate (%)",
-        hovermode='x unified',
-        plot_bgcolor='#0A1929',
-        paper_bgcolor='#0A1929',
-        font=dict(color='white'),
-        height=450,
-        xaxis=dict(gridcolor='#1e3a5f'),
-        yaxis=dict(gridcolor='#1e3a5f'),
-    legend=dict(font=dict(color='white')))
-
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown("---")
+        for region, series in unemp_data.items():
+            fig.add_trace(go.Scatter(
+                x=series.index,
+                y=series.values,
+                name=region,
+                line=dict(color=colors[region], width=3),
+                mode='lines'))
+        fig.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Unemployment Rate (%)",
+            hovermode='x unified',
+            plot_bgcolor='#0A1929',
+            paper_bgcolor='#0A1929',
+            font=dict(color='white'),
+            height=450,
+            xaxis=dict(gridcolor='#1e3a5f'),
+            yaxis=dict(gridcolor='#1e3a5f'),
+        legend=dict(font=dict(color='white')))
 
+        show_chart(fig)
+
+    def render_normalized_gdp(aligned_gdp):
+        st.markdown("### Normalized GDP (Base 100)")
+        st.markdown("""
+        <div class='info-box'>
+            <p><strong>💡 Graphic reading :</strong> This chart normalizes the GDP of each country to 100 at the start to facilitate comparison of growth trajectories. An upward line indicates faster growth.</p>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # Line chart GDP normalisé
-    st.markdown("### Normalized GDP (Base 100)")
-    st.markdown("""
-    <div class='info-box'>
-        <p><strong>💡 Graphic reading :</strong> This chart normalizes the GDP of each country to 100 at the start to facilitate comparison of growth trajectories. An upward line indicates faster growth.</p>
-    </div>
-    """, unsafe_allow_html=True)
+        fig = go.Figure()
+        colors = ['#4FC3F7', '#2196F3', '#1976D2', '#0D47A1', '#FF6B6B', '#EE5A6F']
     
-    fig = go.Figure()
-    colors = ['#4FC3F7', '#2196F3', '#1976D2', '#0D47A1', '#FF6B6B', '#EE5A6F']
-    
-    for i, (country, data) in enumerate(gdp_data.items()):
-        normalized = (data / data.iloc[0]) * 100
-        fig.add_trace(go.Scatter(
-            x=normalized.index,
-            y=normalized.values,
-            name=country,
-            line=dict(color=colors[i % len(colors)], width=3),
-            mode='lines'
-        ))
+        # Base 100 à la première date connue pour tous les pays
+        aligned_gdp = aligned_gdp.rename(columns={code: country for country, code in GDP_SERIES.items()})
+        complete = aligned_gdp.dropna()
+        if not complete.empty:
+            aligned_gdp = aligned_gdp.loc[complete.index[0]:] / complete.iloc[0] * 100
     
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Normalized GDP (Base 100)",
-        hovermode='x unified',
-        plot_bgcolor='#0A1929',
-        paper_bgcolor='#0A1929',
-        font=dict(color='white'),
-        height=500,
-        xaxis=dict(gridcolor='#1e3a5f'),
-        yaxis=dict(gridcolor='#1e3a5f'),
-        legend=dict(font=dict(color='white'))
-    )
+        for i, (country, normalized) in enumerate(aligned_gdp.items()):
+            normalized = normalized.dropna()
+            fig.add_trace(go.Scatter(
+                x=normalized.index,
+                y=normalized.values,
+                name=country,
+                line=dict(color=colors[i % len(colors)], width=3),
+                mode='lines'
+            ))
+    
+        fig.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Normalized GDP (Base 100)",
+            hovermode='x unified',
+            plot_bgcolor='#0A1929',
+            paper_bgcolor='#0A1929',
+            font=dict(color='white'),
+            height=500,
+            xaxis=dict(gridcolor='#1e3a5f'),
+            yaxis=dict(gridcolor='#1e3a5f'),
+            legend=dict(font=dict(color='white'))
+        )
     
-    st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig)
+
+    # Bar charts côte à côte, puis chômage et PIB normalisé
+    col1, col2 = st.columns(2)
+    st.markdown("---")
+    unemp_section = st.container()
+    st.markdown("---")
+    # Line chart GDP normalisé
+    normalized_section = st.container()
+
+    render_as_ready([
+        (col1, [gdp_future], render_gdp_variations),
+        (col2, [cpi_future], render_cpi_variations),
+        (unemp_section, [unemp_future], render_unemployment),
+        (normalized_section, [normalized_future], render_normalized_gdp),
+    ])
     
     st.markdown("""
     <div class='info-box'>
@@ -715,6 +881,8 @@ elif st.session_state.page == 'gdp_cpi':
 
 # ========== PAGE FOREX & COMMODITIES ==========
 elif st.session_state.page == 'forex_commodities':
+    import plotly.graph_objects as go
+
     col1, col2 = st.columns([6, 1])
     with col1:
         st.markdown("## Forex & Commodities")
@@ -746,8 +914,16 @@ elif st.session_state.page == 'forex_commodities':
     # Déterminer les paires forex nécessaires
     forex_pairs = get_required_forex_pairs(forex_countries)
     
-    if forex_pairs:
-        forex_data, forex_summary = get_forex_data(forex_pairs, selected_period)
+    forex_section = st.container()
+    
+    st.markdown("---")
+    
+    # 2. COMMODITIES
+    st.markdown("### 🏆 Commodities")
+    commodities_section = st.container()
+    
+    def render_forex(forex_result):
+        forex_data, forex_summary = forex_result
         
         # Cards de devises
         cols = st.columns(len(forex_pairs))
@@ -774,7 +950,8 @@ elif st.session_state.page == 'forex_commodities':
         fig = go.Figure()
         colors = ['#4FC3F7', '#2196F3', '#1976D2', '#0D47A1', '#FF6B6B']
         
-        for i, (pair, data) in enumerate(forex_data.items()):
+        for i, (pair, pyramid) in enumerate(forex_data.items()):
+            data = pyramid_view(pyramid)
             fig.add_trace(go.Scatter(
                 x=data.index,
                 y=data.values,
@@ -796,93 +973,97 @@ elif st.session_state.page == 'forex_commodities':
             legend=dict(font=dict(color='white'))
         )
         
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Select countries in the sidebar to display exchange rates")
-    
-    st.markdown("---")
-    
-    # 2. COMMODITIES
-    st.markdown("### 🏆 Commodities")
+        show_chart(fig)
     
-    commodities = get_commodities_data(selected_period)
-    
-    col1, col2 = st.columns(2)
+    def render_commodities(commodities_result):
+        commodities, commodities_summary = commodities_result
+        
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("#### Gold")
+        with col1:
+            st.markdown("#### Gold")
         
-        gold = commodities['Gold']
-        gold_var = gold.pct_change().iloc[-1] * 100
+            gold = pyramid_view(commodities['Gold'], max_points=800)
         
-        st.metric(
-            "Gold Price",
-            f"${gold.iloc[-1]:,.2f}",
-            f"{gold_var:+.2f}%"
-        )
+            st.metric(
+                "Gold Price",
+                f"${commodities_summary['Gold']['value']:,.2f}",
+                f"{commodities_summary['Gold']['variation']:+.2f}%"
+            )
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=gold.index,
-            y=gold.values,
-            fill='tozeroy',
-            line=dict(color='#FFD700', width=3),
-            fillcolor='rgba(255, 215, 0, 0.3)',
-            name='Gold'
-        ))
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=gold.index,
+                y=gold.values,
+                fill='tozeroy',
+                line=dict(color='#FFD700', width=3),
+                fillcolor='rgba(255, 215, 0, 0.3)',
+                name='Gold'
+            ))
         
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Price (USD)",
-            plot_bgcolor='#0A1929',
-            paper_bgcolor='#0A1929',
-            font=dict(color='white'),
-            height=400,
-            xaxis=dict(gridcolor='#1e3a5f'),
-            yaxis=dict(gridcolor='#1e3a5f'),
-            showlegend=False
-        )
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Price (USD)",
+                plot_bgcolor='#0A1929',
+                paper_bgcolor='#0A1929',
+                font=dict(color='white'),
+                height=400,
+                xaxis=dict(gridcolor='#1e3a5f'),
+                yaxis=dict(gridcolor='#1e3a5f'),
+                showlegend=False
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, max_points=800)
     
-    with col2:
-        st.markdown("#### Oil (WTI)")
+        with col2:
+            st.markdown("#### Oil (WTI)")
         
-        oil = commodities['Oil']
-        oil_var = oil.pct_change().iloc[-1] * 100
+            oil = pyramid_view(commodities['Oil'], max_points=800)
         
-        st.metric(
-            "Oil Price",
-            f"${oil.iloc[-1]:,.2f}",
-            f"{oil_var:+.2f}%"
-        )
+            st.metric(
+                "Oil Price",
+                f"${commodities_summary['Oil']['value']:,.2f}",
+                f"{commodities_summary['Oil']['variation']:+.2f}%"
+            )
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=oil.index,
-            y=oil.values,
-            fill='tozeroy',
-            line=dict(color='#2196F3', width=3),
-            fillcolor='rgba(33, 150, 243, 0.3)',
-            name='Oil'
-        ))
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=oil.index,
+                y=oil.values,
+                fill='tozeroy',
+                line=dict(color='#2196F3', width=3),
+                fillcolor='rgba(33, 150, 243, 0.3)',
+                name='Oil'
+            ))
         
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Price (USD)",
-            plot_bgcolor='#0A1929',
-            paper_bgcolor='#0A1929',
-            font=dict(color='white'),
-            height=400,
-            xaxis=dict(gridcolor='#1e3a5f'),
-            yaxis=dict(gridcolor='#1e3a5f'),
-            showlegend=False
-        )
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Price (USD)",
+                plot_bgcolor='#0A1929',
+                paper_bgcolor='#0A1929',
+                font=dict(color='white'),
+                height=400,
+                xaxis=dict(gridcolor='#1e3a5f'),
+                yaxis=dict(gridcolor='#1e3a5f'),
+                showlegend=False
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, max_points=800)
+    
+    # Les deux téléchargements sont lancés ensemble ; chaque section s'affiche dès que ses prix arrivent
+    sections = []
+    if forex_pairs:
+        sections.append((forex_section, [submit(get_forex_data, forex_pairs, selected_period)], render_forex))
+    else:
+        forex_section.info("Select countries in the sidebar to display exchange rates")
+    sections.append((commodities_section, [submit(get_commodities_data, selected_period)], render_commodities))
+    
+    render_as_ready(sections)
 
 # ========== PAGE TAUX & OBLIGATIONS ==========
 elif st.session_state.page == 'rates_bonds':
+    import plotly.graph_objects as go
+
     col1, col2 = st.columns([6, 1])
     with col1:
         st.markdown("## Rates & Bonds")
@@ -906,94 +1087,83 @@ elif st.session_state.page == 'rates_bonds':
     # 1. TAUX DIRECTEURS
     st.markdown("### Interest Rates")
     
-    rates = get_interest_rates()
-    
-    col1, col2 = st.columns(2)
+    def render_interest_rates(rates_result):
+        rates, rates_summary = rates_result
+        
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("#### 🇺🇸 Effective Federal Funds Rate (FED)")
+        with col1:
+            st.markdown("#### 🇺🇸 Effective Federal Funds Rate (FED)")
         
-        fed_rate = rates['US_Fed']
+            fed_rate = pyramid_view(rates['US_Fed'], max_points=800)
         
-        st.metric(
-            "Current Rate",
-            f"{fed_rate.iloc[-1]:.2f}%",
-            f"{fed_rate.pct_change().iloc[-1]:+.2f}%"
-        )
+            st.metric(
+                "Current Rate",
+                f"{rates_summary['US_Fed']['value']:.2f}%",
+                f"{rates_summary['US_Fed']['variation']:+.2f}%"
+            )
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=fed_rate.index,
-            y=fed_rate.values,
-            fill='tozeroy',
-            line=dict(color='#4FC3F7', width=3),
-            fillcolor='rgba(79, 195, 247, 0.3)',
-            name='FED Rate'
-        ))
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=fed_rate.index,
+                y=fed_rate.values,
+                fill='tozeroy',
+                line=dict(color='#4FC3F7', width=3),
+                fillcolor='rgba(79, 195, 247, 0.3)',
+                name='FED Rate'
+            ))
         
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Rate (%)",
-            plot_bgcolor='#0A1929',
-            paper_bgcolor='#0A1929',
-            font=dict(color='white'),
-            height=400,
-            xaxis=dict(gridcolor='#1e3a5f'),
-            yaxis=dict(gridcolor='#1e3a5f'),
-            showlegend=False
-        )
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Rate (%)",
+                plot_bgcolor='#0A1929',
+                paper_bgcolor='#0A1929',
+                font=dict(color='white'),
+                height=400,
+                xaxis=dict(gridcolor='#1e3a5f'),
+                yaxis=dict(gridcolor='#1e3a5f'),
+                showlegend=False
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, max_points=800)
     
-    with col2:
-        st.markdown("#### 🇪🇺 Euro Short-Term Rate (BCE)")
+        with col2:
+            st.markdown("#### 🇪🇺 Euro Short-Term Rate (BCE)")
         
-        ecb_rate = rates['Euro_ECB']
+            ecb_rate = pyramid_view(rates['Euro_ECB'], max_points=800)
         
-        st.metric(
-            "Current Rate",
-            f"{ecb_rate.iloc[-1]:.2f}%",
-            f"{ecb_rate.pct_change().iloc[-1]:+.2f}%"
-        )
+            st.metric(
+                "Current Rate",
+                f"{rates_summary['Euro_ECB']['value']:.2f}%",
+                f"{rates_summary['Euro_ECB']['variation']:+.2f}%"
+            )
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=ecb_rate.index,
-            y=ecb_rate.values,
-            fill='tozeroy',
-            line=dict(color='#2196F3', width=3),
-            fillcolor='rgba(33, 150, 243, 0.3)',
-            name='ECB Rate'
-        ))
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=ecb_rate.index,
+                y=ecb_rate.values,
+                fill='tozeroy',
+                line=dict(color='#2196F3', width=3),
+                fillcolor='rgba(33, 150, 243, 0.3)',
+                name='ECB Rate'
+            ))
         
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Rate (%)",
-            plot_bgcolor='#0A1929',
-            paper_bgcolor='#0A1929',
-            font=dict(color='white'),
-            height=400,
-            xaxis=dict(gridcolor='#1e3a5f'),
-            yaxis=dict(gridcolor='#1e3a5f'),
-            showlegend=False
-        )
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Rate (%)",
+                plot_bgcolor='#0A1929',
+                paper_bgcolor='#0A1929',
+                font=dict(color='white'),
+                height=400,
+                xaxis=dict(gridcolor='#1e3a5f'),
+                yaxis=dict(gridcolor='#1e3a5f'),
+                showlegend=False
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # 2. OBLIGATIONS SOUVERAINES
-    st.markdown("### Government Bonds 10 Years")
+            show_chart(fig, max_points=800)
     
-    # Filtrer les pays pour les obligations
-    st.markdown("#### 🌍 SSelection of countries for bonds")
-    bond_countries = st.multiselect(
-    "Choose countries",
-    ['USA', 'Germany', 'France', 'UK', 'Japan'],
-    default=['USA', 'Germany', 'France'])
-    
-    if bond_countries:
-        bond_data, bond_summary = get_bond_rates(bond_countries)
+    def render_bond_cards(bond_result):
+        bond_data, bond_summary = bond_result
         
         # Cards des taux
         cols = st.columns(len(bond_countries))
@@ -1017,28 +1187,28 @@ elif st.session_state.page == 'rates_bonds':
                         delta=f"{data['variation']:+.2f}%",
                         delta_color=delta_color
                     )
+    
+    # Sections interactives en fragments : leurs widgets (pays, instantanés,
+    # paires du spread) ne réexécutent que la section
+    @st.fragment
+    @recorded
+    def render_yield_curves(curve_histories):
+        # Courbes des taux des pays sélectionnés, chargées en une seule fois
+        st.markdown("#### Yield Curves")
         
-        st.markdown("---")
-        
-        # Yield Curve (USA par défaut)
-        st.markdown("#### Yield Curve (USA)")
-        
-        yield_curve_data = get_yield_curve('USA')
-        
-        if yield_curve_data:
-            maturities = list(yield_curve_data.keys())
-            rates_values = list(yield_curve_data.values())
-            
+        if curve_histories:
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=maturities,
-                y=rates_values,
-                mode='lines+markers',
-                line=dict(color='#4FC3F7', width=4),
-                marker=dict(size=10, color='#2196F3'),
-                fill='tozeroy',
-                fillcolor='rgba(79, 195, 247, 0.2)'
-            ))
+            curve_colors = ['#4FC3F7', '#FFD700', '#FF6B6B', '#9CCC65', '#BA68C8']
+            for i, (country, history) in enumerate(curve_histories.items()):
+                curve = history.ffill().iloc[-1].dropna()
+                fig.add_trace(go.Scatter(
+                    x=curve.index,
+                    y=curve.values,
+                    name=f"{country} ({history.index[-1]:%m/%Y})",
+                    mode='lines+markers',
+                    line=dict(color=curve_colors[i % len(curve_colors)], width=3),
+                    marker=dict(size=8)
+                ))
             
             fig.update_layout(
                 xaxis_title="Maturity",
@@ -1047,14 +1217,146 @@ elif st.session_state.page == 'rates_bonds':
                 paper_bgcolor='#0A1929',
                 font=dict(color='white'),
                 height=450,
-                xaxis=dict(gridcolor='#1e3a5f'),
+                xaxis=dict(gridcolor='#1e3a5f', categoryorder='array', categoryarray=MATURITY_ORDER),
                 yaxis=dict(gridcolor='#1e3a5f'),
                 legend=dict(font=dict(color='white'))
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig)
+            st.caption("Outside the USA, FRED only provides the OECD 3-month interbank and 10-year rates (monthly)")
         
-        st.markdown("---")
+        # Dynamique de la courbe d'un pays : une seule matrice dates x maturités,
+        # dont sont tirés la courbe actuelle, les instantanés, les pentes et la surface
+        st.markdown("#### Curve Dynamics")
+        
+        curve_country = st.selectbox("Country", list(curve_histories.keys()), key="curve_country") if curve_histories else None
+        curve_history = curve_histories.get(curve_country)
+        
+        if curve_history is not None and not curve_history.empty:
+            last_date = curve_history.index[-1]
+            curve_tab, slopes_tab, surface_tab = st.tabs(["📈 Curve & snapshots", "📐 Slopes", "🌐 Surface"])
+            
+            with curve_tab:
+                snapshot_options = {
+                    '1 month ago': pd.DateOffset(months=1),
+                    '6 months ago': pd.DateOffset(months=6),
+                    '1 year ago': pd.DateOffset(years=1),
+                    '2 years ago': pd.DateOffset(years=2),
+                    '5 years ago': pd.DateOffset(years=5),
+                }
+                selected_snapshots = st.multiselect(
+                    "Compare with the curve from",
+                    list(snapshot_options.keys()),
+                    default=['1 year ago'],
+                    key="curve_snapshots"
+                )
+                snapshot_dates = [last_date] + [last_date - snapshot_options[label] for label in selected_snapshots]
+                snapshots = curve_snapshots(curve_history, snapshot_dates)
+                
+                fig = go.Figure()
+                snapshot_colors = ['#4FC3F7', '#FFD700', '#FF6B6B', '#9CCC65', '#BA68C8', '#FFB74D']
+                for i, date in enumerate(snapshots.columns):
+                    curve = snapshots[date].dropna()
+                    current = i == 0
+                    fig.add_trace(go.Scatter(
+                        x=curve.index,
+                        y=curve.values,
+                        name=f"{date:%d/%m/%Y}",
+                        mode='lines+markers',
+                        line=dict(color=snapshot_colors[i % len(snapshot_colors)], width=4 if current else 2, dash=None if current else 'dot'),
+                        marker=dict(size=10 if current else 6),
+                        fill='tozeroy' if current else None,
+                        fillcolor='rgba(79, 195, 247, 0.2)'
+                    ))
+                
+                fig.update_layout(
+                    xaxis_title="Maturity",
+                    yaxis_title="Yield (%)",
+                    plot_bgcolor='#0A1929',
+                    paper_bgcolor='#0A1929',
+                    font=dict(color='white'),
+                    height=450,
+                    xaxis=dict(gridcolor='#1e3a5f'),
+                    yaxis=dict(gridcolor='#1e3a5f'),
+                    legend=dict(font=dict(color='white'))
+                )
+                
+                show_chart(fig)
+            
+            # Les vues historiques suivent la période de la sidebar
+            curve_window = curve_history.loc[str(period_start(selected_period, end=last_date) or curve_history.index[0]):]
+            
+            with slopes_tab:
+                slopes = curve_slopes(curve_window)
+                if not slopes.empty:
+                    latest_slopes = slopes.ffill().iloc[-1]
+                    cols = st.columns(len(slopes.columns))
+                    for i, name in enumerate(slopes.columns):
+                        with cols[i]:
+                            st.metric(label=name, value=f"{latest_slopes[name]:+.0f} bps")
+                    
+                    fig = go.Figure()
+                    slope_colors = {'2s10s': '#4FC3F7', '3m10y': '#FFD700'}
+                    for name in slopes.columns:
+                        series = slopes[name].dropna()
+                        fig.add_trace(go.Scatter(
+                            x=series.index,
+                            y=series.values,
+                            name=name,
+                            line=dict(color=slope_colors.get(name, '#FF6B6B'), width=2),
+                            mode='lines'
+                        ))
+                    
+                    fig.add_hline(y=0, line_dash="dash", line_color="white", line_width=1)
+                    
+                    fig.update_layout(
+                        xaxis_title="Date",
+                        yaxis_title="Slope (bps)",
+                        hovermode='x unified',
+                        plot_bgcolor='#0A1929',
+                        paper_bgcolor='#0A1929',
+                        font=dict(color='white'),
+                        height=450,
+                        xaxis=dict(gridcolor='#1e3a5f'),
+                        yaxis=dict(gridcolor='#1e3a5f'),
+                        legend=dict(font=dict(color='white'))
+                    )
+                    
+                    show_chart(fig)
+                    st.caption("Negative slope = inverted curve")
+            
+            with surface_tab:
+                # Une ligne sur step pour garder une surface légère (au plus ~300 dates)
+                step = max(1, -(-len(curve_window) // 300))
+                surface = curve_window.ffill().iloc[::-1].iloc[::step].iloc[::-1].dropna(axis=1, how='all')
+                
+                fig = go.Figure(go.Surface(
+                    x=list(range(len(surface.columns))),
+                    y=surface.index,
+                    z=surface.values,
+                    colorscale='Blues',
+                    colorbar=dict(title='Yield (%)')
+                ))
+                
+                fig.update_layout(
+                    scene=dict(
+                        xaxis=dict(title='Maturity', tickvals=list(range(len(surface.columns))), ticktext=list(surface.columns)),
+                        yaxis=dict(title='Date'),
+                        zaxis=dict(title='Yield (%)')
+                    ),
+                    plot_bgcolor='#0A1929',
+                    paper_bgcolor='#0A1929',
+                    font=dict(color='white'),
+                    height=600,
+                    margin=dict(l=0, r=0, t=30, b=0)
+                )
+                
+                show_chart(fig)
+    
+    @st.fragment
+    @recorded
+    def render_bond_comparison(bond_result):
+        bond_data, bond_summary = bond_result
         
         # Graphique comparatif des obligations
         st.markdown("#### Comparison of 10Y Rates")
@@ -1062,7 +1364,8 @@ elif st.session_state.page == 'rates_bonds':
         fig = go.Figure()
         colors = ['#4FC3F7', '#2196F3', '#1976D2', '#0D47A1', '#FF6B6B']
         
-        for i, (country, data) in enumerate(bond_data.items()):
+        for i, (country, pyramid) in enumerate(bond_data.items()):
+            data = pyramid_view(pyramid)
             fig.add_trace(go.Scatter(
                 x=data.index,
                 y=data.values,
@@ -1084,7 +1387,7 @@ elif st.session_state.page == 'rates_bonds':
             legend=dict(font=dict(color='white'))
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig)
         
         st.markdown("---")
         
@@ -1118,9 +1421,23 @@ elif st.session_state.page == 'rates_bonds':
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Graphique du spread dans le temps
+                # Graphique du spread dans le temps, sur une grille commune aux deux séries
                 if country1 in bond_data and country2 in bond_data:
-                    spread_series = bond_data[country2] - bond_data[country1]
+                    alignment = st.radio(
+                        "Alignment",
+                        list(SPREAD_ALIGNMENTS),
+                        horizontal=True,
+                        key='spread_alignment',
+                        help="Monthly average: daily rates are averaged per month like the OECD series. "
+                             "Last published value: daily dates, each using the monthly value of the last completed month."
+                    )
+                    code1, code2 = BOND_10Y_SERIES[country1], BOND_10Y_SERIES[country2]
+                    aligned = get_aligned_series(
+                        [code1, code2],
+                        SPREAD_ALIGNMENTS[alignment],
+                        fetch_start(selected_period, pd.DateOffset(years=1))
+                    )
+                    spread_series = (aligned[code2] - aligned[code1]).dropna()
                     
                     fig = go.Figure()
                     fig.add_trace(go.Scatter(
@@ -1146,10 +1463,45 @@ elif st.session_state.page == 'rates_bonds':
                         showlegend=False
                     )
                     
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_chart(fig)
+    
+    # Taux directeurs, taux souverains et courbes sont demandés ensemble ;
+    # chaque section s'affiche dès que ses propres séries sont arrivées
+    rates_section = st.container()
+    sections = [(rates_section, [submit(get_interest_rates, selected_period)], render_interest_rates)]
+    
+    st.markdown("---")
+    
+    # 2. OBLIGATIONS SOUVERAINES
+    st.markdown("### Government Bonds 10 Years")
+    
+    # Filtrer les pays pour les obligations
+    st.markdown("#### 🌍 SSelection of countries for bonds")
+    bond_countries = st.multiselect(
+    "Choose countries",
+    ['USA', 'Germany', 'France', 'UK', 'Japan'],
+    default=['USA', 'Germany', 'France'])
+    
+    if bond_countries:
+        bond_future = submit(get_bond_rates, bond_countries, selected_period)
+        curves_future = submit(get_yield_curve_histories, bond_countries)
+        
+        bond_cards_section = st.container()
+        st.markdown("---")
+        curves_section = st.container()
+        st.markdown("---")
+        comparison_section = st.container()
+        
+        sections += [
+            (bond_cards_section, [bond_future], render_bond_cards),
+            (curves_section, [curves_future], render_yield_curves),
+            (comparison_section, [bond_future], render_bond_comparison),
+        ]
     else:
         st.info("Select countries in the sidebar to display bond rates")
     
+    render_as_ready(sections)
+    
     st.markdown("""
     <div class='info-box'>
         <p>📌 <strong>Note :</strong> The sovereign rates data is updated monthly</p>
@@ -1158,6 +1510,9 @@ elif st.session_state.page == 'rates_bonds':
 
 # ========== PAGE EQUITY ANALYSIS SUITE ==========
 elif st.session_state.page == 'equity_suite':
+    import plotly.express as px
+    import plotly.graph_objects as go
+
 
     col1, col2 = st.columns([6, 1])
     with col1:
@@ -1178,16 +1533,22 @@ elif st.session_state.page == 'equity_suite':
 
     st.markdown("---")
 
-    tab1, tab2, tab3 = st.tabs([
+    tab1, tab2, tab3, tab4 = st.tabs([
         "Price & Chart",
         "Correlation Heatmap",
-        "Financial Statements"
+        "Financial Statements",
+        "Screener"
     ])
 
+    # Chaque onglet est un fragment : un changement de ticker ou d'option ne
+    # réexécute que son propre onglet, pas tout le script
+
     # =====================================================
     # 1) PRICE & CHART
     # =====================================================
-    with tab1:
+    @st.fragment
+    @recorded
+    def price_chart_tab():
         st.markdown("### Price & Chart")
 
         ticker = st.text_input(
@@ -1200,8 +1561,7 @@ elif st.session_state.page == 'equity_suite':
             st.info("Enter a ticker to display the price analysis.")
         else:
             try:
-                tk = yf.Ticker(ticker)
-                hist = tk.history(period=selected_period)
+                hist = get_ticker_history(ticker, selected_period)
 
                 if hist.empty:
                     st.warning("Ticker invalid or data unavailable.")
@@ -1240,7 +1600,7 @@ elif st.session_state.page == 'equity_suite':
                         yaxis=dict(gridcolor="#1e3a5f")
                     )
 
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_chart(fig)
 
                     st.markdown("#### Last observations")
 
@@ -1248,7 +1608,7 @@ elif st.session_state.page == 'equity_suite':
                                 + hist.tail(5)[["Open", "High", "Low", "Close", "Volume"]].to_html(classes='table table-striped', border=0) 
                                 + "</div>", unsafe_allow_html=True)
                 
-                    info = tk.info
+                    info = get_ticker_info(ticker)
                     st.markdown("#### Key Information")
 
                     col1, col2 = st.columns(2)
@@ -1317,13 +1677,15 @@ elif st.session_state.page == 'equity_suite':
     # =====================================================
     # 2) CORRELATION HEATMAP
     # =====================================================
-    with tab2:
+    @st.fragment
+    @recorded
+    def correlation_tab():
         st.markdown("### Correlation Heatmap")
 
         st.markdown("""
         <div class='info-box'>
             <p>
-            Analysis of correlations between several assets over 1 year.
+            Correlations of daily log returns over the selected period.
             Enter at least two tickers separated by commas.
             </p>
         </div>
@@ -1343,21 +1705,109 @@ elif st.session_state.page == 'equity_suite':
             if len(tickers) < 2:
                 st.warning("Veuillez entrer au moins deux tickers.")
             else:
-                df = pd.DataFrame()
+                col1, col2 = st.columns(2)
+                with col1:
+                    alignment_label = st.radio(
+                        "Calendar alignment",
+                        ["Fill holidays", "Common dates only"],
+                        horizontal=True,
+                        key="corr_alignment"
+                    )
+                with col2:
+                    estimator = st.selectbox(
+                        "Estimator",
+                        ["Pearson", "Spearman", "Pearson + shrinkage"],
+                        key="corr_estimator"
+                    )
+                alignment = 'ffill' if alignment_label == "Fill holidays" else 'intersect'
 
-                for t in tickers:
-                    data = yf.Ticker(t).history(period=selected_period)["Close"]
-                    if not data.empty:
-                        df[t] = data
+                corr = get_return_correlations(
+                    tickers,
+                    selected_period,
+                    alignment,
+                    'spearman' if estimator == "Spearman" else 'pearson',
+                    estimator == "Pearson + shrinkage"
+                )
 
-                if df.shape[1] < 2:
+                if corr.shape[1] < 2 or corr.isna().all().all():
                     st.warning("Données insuffisantes pour calculer la corrélation.")
-                else:
-                    corr = df.corr()
+                elif len(corr) > LARGE_UNIVERSE_TICKERS:
+                    # Grand univers : matrice réordonnée par classification et affichée par blocs,
+                    # seules les paires les plus fortes sont tracées une à une
+                    order = cluster_order(corr)
+                    clustered = corr.loc[order, order]
 
+                    fig = px.imshow(
+                        block_average(clustered),
+                        color_continuous_scale="RdBu",
+                        zmin=-1,
+                        zmax=1
+                    )
+
+                    fig.update_layout(
+                        plot_bgcolor="#0A1929",
+                        paper_bgcolor="#0A1929",
+                        font=dict(color="white"),
+                        height=600,
+                        xaxis=dict(showticklabels=False),
+                        yaxis=dict(showticklabels=False)
+                    )
+
+                    show_chart(fig)
+                    st.caption(f"{len(corr)} tickers ordered by hierarchical clustering, averaged into blocks")
+
+                    if 'shrinkage' in corr.attrs:
+                        st.caption(f"Ledoit-Wolf shrinkage towards identity: {corr.attrs['shrinkage']:.0%}")
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        top_k = st.slider("Strongest pairs shown", 10, 200, 50, step=10, key="corr_top_k")
+                    with col2:
+                        threshold = st.slider("Minimum |correlation|", 0.0, 1.0, 0.5, step=0.05, key="corr_threshold")
+
+                    pairs = top_pairs(clustered, top_k, threshold)
+                    positions = {ticker: i for i, ticker in enumerate(order)}
+
+                    fig = go.Figure(go.Scattergl(
+                        x=pairs['asset_1'].map(positions),
+                        y=pairs['asset_2'].map(positions),
+                        mode='markers',
+                        text=pairs['asset_1'] + " / " + pairs['asset_2'],
+                        hovertemplate="%{text}: %{marker.color:.2f}<extra></extra>",
+                        marker=dict(
+                            color=pairs['correlation'],
+                            colorscale="RdBu",
+                            cmin=-1,
+                            cmax=1,
+                            size=9,
+                            colorbar=dict(title="ρ")
+                        )
+                    ))
+
+                    fig.update_layout(
+                        xaxis_title="Cluster order",
+                        yaxis_title="Cluster order",
+                        plot_bgcolor='#0A1929',
+                        paper_bgcolor='#0A1929',
+                        font=dict(color='white'),
+                        height=500,
+                        xaxis=dict(gridcolor='#1e3a5f', range=[-1, len(order)]),
+                        yaxis=dict(gridcolor='#1e3a5f', range=[len(order), -1])
+                    )
+
+                    show_chart(fig)
+
+                    st.dataframe(pairs.round(3), use_container_width=True, hide_index=True)
+
+                    st.download_button(
+                        "Télécharger CSV",
+                        clustered.to_csv().encode(),
+                        "correlations.csv"
+                    )
+                else:
                     fig = px.imshow(
                         corr,
-                        text_auto=True,
+                        text_auto='.2f' if len(corr) <= 15 else False,
                         color_continuous_scale="Blues"
                     )
 
@@ -1368,7 +1818,10 @@ elif st.session_state.page == 'equity_suite':
                         height=500
                     )
 
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_chart(fig)
+
+                    if 'shrinkage' in corr.attrs:
+                        st.caption(f"Ledoit-Wolf shrinkage towards identity: {corr.attrs['shrinkage']:.0%}")
 
                     st.download_button(
                         "Télécharger CSV",
@@ -1376,10 +1829,96 @@ elif st.session_state.page == 'equity_suite':
                         "correlations.csv"
                     )
 
+                # Corrélations glissantes des rendements, sur un historique propre à cette vue
+                # (une matrice N x N par date : réservées aux univers de taille raisonnable)
+                st.markdown("#### Rolling Correlations")
+
+                if len(tickers) > ROLLING_MAX_TICKERS:
+                    st.info(f"Rolling correlations are available up to {ROLLING_MAX_TICKERS} tickers.")
+                else:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        rolling_window = st.selectbox("Window (trading days)", [30, 60, 90], index=1, key="rolling_window")
+                    with col2:
+                        rolling_period = st.selectbox("History", ['1y', '2y', '5y', '10y'], index=1, key="rolling_period")
+
+                    dates, matrices, names = get_rolling_correlations(tickers, rolling_period, rolling_window, alignment)
+
+                    if len(dates) == 0 or len(names) < 2:
+                        st.warning("Not enough history for this window.")
+                    else:
+                        # Corrélation moyenne et paire choisie au fil du temps
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            pair_a = st.selectbox("Asset 1", names, index=0, key="rolling_pair_a")
+                        with col2:
+                            pair_b = st.selectbox("Asset 2", [n for n in names if n != pair_a], index=0, key="rolling_pair_b")
+
+                        i, j = names.index(pair_a), names.index(pair_b)
+                        fig = go.Figure()
+                        fig.add_trace(go.Scatter(
+                            x=dates,
+                            y=matrices[:, i, j],
+                            name=f"{pair_a} / {pair_b}",
+                            line=dict(color='#4FC3F7', width=2),
+                            mode='lines'
+                        ))
+                        fig.add_trace(go.Scatter(
+                            x=dates,
+                            y=mean_pairwise(matrices),
+                            name="Average of all pairs",
+                            line=dict(color='#FFD700', width=2, dash='dot'),
+                            mode='lines'
+                        ))
+
+                        fig.update_layout(
+                            xaxis_title="Date",
+                            yaxis_title=f"{rolling_window}-day correlation",
+                            hovermode='x unified',
+                            plot_bgcolor='#0A1929',
+                            paper_bgcolor='#0A1929',
+                            font=dict(color='white'),
+                            height=400,
+                            xaxis=dict(gridcolor='#1e3a5f'),
+                            yaxis=dict(gridcolor='#1e3a5f', range=[-1, 1]),
+                            legend=dict(font=dict(color='white'))
+                        )
+
+                        show_chart(fig)
+
+                        # Heatmap à une date choisie sur le curseur
+                        heatmap_date = st.select_slider(
+                            "Heatmap date",
+                            options=list(dates),
+                            value=dates[-1],
+                            format_func=lambda d: d.strftime('%d/%m/%Y'),
+                            key="rolling_heatmap_date"
+                        )
+                        frame = pd.DataFrame(matrices[dates.get_loc(heatmap_date)], index=names, columns=names)
+
+                        fig = px.imshow(
+                            frame,
+                            text_auto='.2f' if len(names) <= 15 else False,
+                            color_continuous_scale="RdBu",
+                            zmin=-1,
+                            zmax=1
+                        )
+
+                        fig.update_layout(
+                            plot_bgcolor="#0A1929",
+                            paper_bgcolor="#0A1929",
+                            font=dict(color="white"),
+                            height=500
+                        )
+
+                        show_chart(fig)
+
     # =====================================================
     # 3) FINANCIAL STATEMENTS
     # =====================================================
-    with tab3:
+    @st.fragment
+    @recorded
+    def financial_statements_tab():
         st.markdown("### Financial Statements")
 
         ticker_fs = st.text_input(
@@ -1438,14 +1977,12 @@ elif st.session_state.page == 'equity_suite':
             st.info("Entrez un ticker pour afficher les états financiers.")
         else:
             try:
-                tk = yf.Ticker(ticker_fs)
-
                 if choice == "Income Statement":
-                    fs = tk.financials
+                    fs = get_financial_statement(ticker_fs, 'financials')
                 elif choice == "Balance Sheet":
-                    fs = tk.balance_sheet
+                    fs = get_financial_statement(ticker_fs, 'balance_sheet')
                 else:
-                    fs = tk.cashflow
+                    fs = get_financial_statement(ticker_fs, 'cashflow')
 
                 if fs is None or fs.empty:
                     st.warning("Données financières indisponibles.")
@@ -1466,6 +2003,110 @@ elif st.session_state.page == 'equity_suite':
             except Exception:
                 st.error("Erreur lors du chargement des états financiers.")
 
+    # =====================================================
+    # 4) SCREENER
+    # =====================================================
+    @st.fragment
+    @recorded
+    def screener_tab():
+        st.markdown("### Watchlist Screener")
+
+        st.markdown("""
+        <div class='info-box'>
+            <p>
+            Price metrics over the selected period and key fundamentals for a whole watchlist.
+            Paste tickers separated by commas, spaces or new lines.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        watchlist_input = st.text_area(
+            "Watchlist (ex: AAPL, MSFT, NVDA)",
+            value="",
+            key="screener_tickers"
+        ).upper()
+        watchlist = list(dict.fromkeys(t for t in watchlist_input.replace(",", " ").split() if t))
+
+        if not watchlist:
+            st.info("Enter tickers to run the screener.")
+        else:
+            # Filtres posés au-dessus du tableau, remplis une fois la watchlist chargée
+            filters = st.container()
+            table_slot = st.empty()
+            progress = st.progress(0.0, text=f"Loading 0 / {len(watchlist)} tickers")
+
+            # Chaque lot est affiché dès qu'il est prêt
+            batches = []
+            for start in range(0, len(watchlist), SCREENER_BATCH):
+                batches.append(get_screener_batch(watchlist[start:start + SCREENER_BATCH], selected_period))
+                loaded = min(start + SCREENER_BATCH, len(watchlist))
+                table_slot.dataframe(pd.concat(batches), use_container_width=True)
+                progress.progress(loaded / len(watchlist), text=f"Loading {loaded} / {len(watchlist)} tickers")
+            progress.empty()
+
+            screener = pd.concat(batches)
+            if screener.empty:
+                table_slot.warning("No data available for this watchlist.")
+            else:
+                with filters:
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        sectors = st.multiselect(
+                            "Sector",
+                            sorted(screener['Sector'].dropna().unique()),
+                            key="screener_sectors"
+                        )
+                    with col2:
+                        min_performance = st.number_input(
+                            f"Min performance over {selected_period_label} (%)",
+                            value=None,
+                            key="screener_min_perf"
+                        )
+                    with col3:
+                        max_volatility = st.number_input(
+                            "Max volatility (%)",
+                            value=None,
+                            min_value=0.0,
+                            key="screener_max_vol"
+                        )
+
+                mask = pd.Series(True, index=screener.index)
+                if sectors:
+                    mask &= screener['Sector'].isin(sectors)
+                if min_performance is not None:
+                    mask &= screener['Performance (%)'] >= min_performance
+                if max_volatility is not None:
+                    mask &= screener['Volatility (%)'] <= max_volatility
+                filtered = screener[mask]
+
+                # Tableau triable en cliquant sur les en-têtes
+                table_slot.dataframe(
+                    filtered,
+                    use_container_width=True,
+                    column_config={
+                        'Last Price': st.column_config.NumberColumn(format="%.2f"),
+                        'Performance (%)': st.column_config.NumberColumn(format="%+.2f"),
+                        'Volatility (%)': st.column_config.NumberColumn(format="%.2f"),
+                        'Market Cap': st.column_config.NumberColumn(format="compact"),
+                    }
+                )
+                st.caption(f"{len(filtered)} / {len(screener)} tickers shown")
+
+                st.download_button(
+                    "Télécharger CSV",
+                    filtered.to_csv().encode(),
+                    "screener.csv"
+                )
+
+    with tab1:
+        price_chart_tab()
+    with tab2:
+        correlation_tab()
+    with tab3:
+        financial_statements_tab()
+    with tab4:
+        screener_tab()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -1474,3 +2115,11 @@ st.markdown("""
     <p style='font-size: 0.85em;'>Dashboard Macro Économique | Données: FRED & Yahoo Finance</p>
 </div>
 """, unsafe_allow_html=True)
+
+# ========== PANNEAU DE DEBUG ==========
+if show_timings:
+    show_timing_panel(run_recorder)
+run_recorder.finish()
+
+# Hors du chemin de rendu : la première page est servie avant le pré-chauffage
+start_background_prewarm()
@@ -0,0 +1,438 @@
+import itertools
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# Calculs vectorisés sur des panels de séries (dict {nom: pd.Series}).
+
+
+def _right_aligned(panel):
+    """Matrice (observations x séries) alignée sur la dernière observation de chaque série.
+
+    Chaque série garde sa propre fréquence : la ligne -1 est sa dernière valeur,
+    la ligne -1-h sa valeur h observations plus tôt (NaN au-delà de son historique).
+    """
+    arrays = [np.asarray(series.dropna(), dtype=float) for series in panel.values()]
+    length = max((len(a) for a in arrays), default=0)
+    matrix = np.full((length, len(arrays)), np.nan)
+    for j, values in enumerate(arrays):
+        if len(values):
+            matrix[length - len(values):, j] = values
+    return matrix
+
+
+@timed('compute')
+def summarize(panel, horizons, vol_window=21):
+    """Table des indicateurs de chaque série du panel, en un seul passage vectorisé.
+
+    horizons : {nom_colonne: nombre d'observations}, ex. {'QoQ': 1, 'YoY': 4}.
+    Colonnes : 'last', une variation en % par horizon, 'volatility' (écart-type
+    des variations sur vol_window observations, en %) et 'drawdown' (écart au
+    plus haut de la fenêtre, en %).
+    """
+    columns = ['last', *horizons, 'volatility', 'drawdown']
+    names = list(panel)
+    matrix = _right_aligned(panel)
+    if matrix.shape[0] == 0:
+        return pd.DataFrame(np.nan, index=names, columns=columns)
+
+    length = matrix.shape[0]
+    last = matrix[-1]
+    stats = {'last': last}
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for name, periods in horizons.items():
+            previous = matrix[-1 - periods] if periods < length else np.full(len(names), np.nan)
+            stats[name] = (last / previous - 1) * 100
+
+        window = matrix[-(vol_window + 1):]
+        returns = window[1:] / window[:-1] - 1
+        stats['volatility'] = np.nanstd(returns, axis=0, ddof=1) * 100
+        stats['drawdown'] = (last / np.nanmax(matrix, axis=0) - 1) * 100
+
+    return pd.DataFrame(stats, index=names, columns=columns)
+
+
+
+def price_metrics(prices):
+    """Dernier prix, performance (%) et volatilité annualisée (%) de chaque colonne de prix.
+
+    Mêmes formules que l'analyse d'un ticker : performance entre la première
+    et la dernière cotation, écart-type des rendements annualisé selon
+    l'espacement moyen des cotations de chaque série.
+    """
+    columns = ['last', 'performance', 'volatility']
+    if prices.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+    observed = prices.notna()
+    first = prices.bfill().iloc[0]
+    last = prices.ffill().iloc[-1]
+    count = observed.sum()
+
+    dates = prices.index.to_numpy()
+    first_date = pd.Series(dates[observed.to_numpy().argmax(axis=0)], index=prices.columns)
+    last_date = pd.Series(dates[len(dates) - 1 - observed.to_numpy()[::-1].argmax(axis=0)], index=prices.columns)
+    spacing = (last_date - first_date).dt.days / count
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices.pct_change(fill_method=None)
+        volatility = returns.std() * np.sqrt(252 / spacing)
+    volatility[returns.count() < 2] = np.nan
+    return pd.DataFrame({
+        'last': last,
+        'performance': (last / first - 1) * 100,
+        'volatility': volatility * 100,
+    }, columns=columns)
+
+# Courbe des taux : matrice (dates x maturités), colonnes triées par maturité.
+
+CURVE_SLOPES = {'2s10s': ('2Y', '10Y'), '3m10y': ('3M', '10Y')}
+
+
+def curve_slopes(matrix, slopes=CURVE_SLOPES):
+    """Pentes de la courbe en points de base, une colonne par pente (maturités absentes ignorées)."""
+    columns = {
+        name: (matrix[long] - matrix[short]) * 100
+        for name, (short, long) in slopes.items()
+        if short in matrix and long in matrix
+    }
+    return pd.DataFrame(columns, index=matrix.index).dropna(how='all')
+
+
+def curve_snapshots(matrix, dates):
+    """Courbe à chaque date demandée (dernière cotation connue à cette date) : maturités x dates."""
+    dates = pd.DatetimeIndex(dates)
+    known = matrix.sort_index().ffill()
+    snapshots = known.reindex(dates, method='ffill')
+    return snapshots.dropna(how='all').T
+
+# Séries de fréquences différentes (quotidienne, mensuelle, trimestrielle,
+# annuelle) ramenées sur une grille commune avant toute différence ou comparaison :
+#   - 'resample' : toutes les séries à la fréquence la plus basse du lot, les plus
+#     fines agrégées par période (dates en début de période, comme sur FRED) ;
+#   - 'asof' : grille de la série la plus fine ; les autres y prennent la valeur
+#     de leur dernière période révolue (une moyenne de janvier n'est connue
+#     qu'à partir du 1er février), pendant au plus une période.
+
+FREQUENCY_POLICIES = ('resample', 'asof')
+FREQUENCIES = ('D', 'M', 'Q', 'A')           # de la plus fine à la plus basse
+_RESAMPLE_RULES = {'M': 'MS', 'Q': 'QS', 'A': 'YS'}
+_ASOF_TOLERANCE = {'D': 4, 'M': 31, 'Q': 92, 'A': 366}      # jours
+# Date à partir de laquelle une observation datée en début de période est connue
+_PERIOD_AVAILABLE = {
+    'M': pd.offsets.MonthBegin(1),
+    'Q': pd.offsets.QuarterBegin(1, startingMonth=1),
+    'A': pd.offsets.YearBegin(1),
+}
+
+
+def infer_frequency(series):
+    """Fréquence d'une série ('D', 'M', 'Q', 'A') d'après l'écart médian entre observations."""
+    index = series.dropna().index
+    if len(index) < 2:
+        return 'D'
+    gap = (index[1:] - index[:-1]).median() / pd.Timedelta(days=1)
+    for frequency, max_days in (('D', 7), ('M', 45), ('Q', 120)):
+        if gap <= max_days:
+            return frequency
+    return 'A'
+
+
+@timed('compute')
+def align_frequencies(panel, policy='resample', how='mean', frequencies=None):
+    """Panel de séries de fréquences différentes aligné sur une grille commune.
+
+    frequencies : {nom: 'D'|'M'|'Q'|'A'} (déduites des dates si absentes) ;
+    how : agrégation des séries plus fines pour 'resample' ('mean', 'last'...).
+    Renvoie un DataFrame (une colonne par série), NaN là où une série manque.
+    """
+    if policy not in FREQUENCY_POLICIES:
+        raise ValueError(f"policy inconnue : {policy!r} (attendu : {', '.join(FREQUENCY_POLICIES)})")
+    panel = {name: series.dropna().sort_index() for name, series in panel.items()}
+    panel = {name: series[~series.index.duplicated(keep='last')] for name, series in panel.items() if not series.empty}
+    if not panel:
+        return pd.DataFrame()
+    frequencies = frequencies or {}
+    ranks = {name: FREQUENCIES.index(frequencies.get(name) or infer_frequency(series)) for name, series in panel.items()}
+
+    if policy == 'resample':
+        target = FREQUENCIES[max(ranks.values())]
+        if target == 'D':
+            return pd.DataFrame(panel).dropna(how='all')
+        rule = _RESAMPLE_RULES[target]
+        return pd.DataFrame({name: series.resample(rule).agg(how) for name, series in panel.items()}).dropna(how='all')
+
+    finest = min(ranks.values())
+    grid = pd.DatetimeIndex([])
+    for name, series in panel.items():
+        if ranks[name] == finest:
+            grid = grid.union(series.index)
+    aligned = {}
+    for name, series in panel.items():
+        frequency = FREQUENCIES[ranks[name]]
+        if ranks[name] > finest:
+            # Pas de regard vers l'avant : la valeur d'une période n'est utilisée qu'une fois celle-ci close
+            series = series.set_axis(series.index + _PERIOD_AVAILABLE[frequency])
+            series = series[~series.index.duplicated(keep='last')]
+        aligned[name] = series.reindex(grid, method='ffill', tolerance=pd.Timedelta(days=_ASOF_TOLERANCE[frequency]))
+    return pd.DataFrame(aligned, index=grid).dropna(how='all')
+
+
+# Corrélations : alignement des calendriers de cotation, rendements
+# logarithmiques, puis corrélations calculées par produits matriciels. Les
+# valeurs manquantes sont exclues paire par paire, comme dans DataFrame.corr().
+
+ALIGN_POLICIES = ('ffill', 'intersect')
+ALIGN_MAX_GAP = 5              # jours fériés comblés au plus sur 5 cotations
+ROLLING_MAX_FRAMES = 520       # au-delà, une fenêtre sur step est calculée
+ROLLING_BATCH = 64             # fenêtres traitées par produit matriciel
+
+
+def align_calendars(prices, policy='ffill', max_gap=ALIGN_MAX_GAP):
+    """Cale des cotations de places différentes sur un calendrier commun de dates.
+
+    Les horodatages sont ramenés à la date (une cotation par jour, la dernière).
+    'ffill' : union des calendriers, trous des jours fériés comblés (max_gap
+    cotations au plus) ; 'intersect' : seules les dates cotées partout.
+    """
+    if policy not in ALIGN_POLICIES:
+        raise ValueError(f"policy inconnue : {policy!r} (attendu : {', '.join(ALIGN_POLICIES)})")
+    index = pd.DatetimeIndex(prices.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    aligned = prices.set_axis(index.normalize()).sort_index()
+    aligned = aligned.groupby(level=0).last().dropna(how='all')
+    if policy == 'intersect':
+        return aligned.dropna(how='any')
+    # Pas de comblement avant la première ni après la dernière cotation d'une série
+    inside = aligned.ffill().notna() & aligned.bfill().notna()
+    return aligned.ffill(limit=max_gap).where(inside)
+
+
+def log_returns(prices):
+    """Rendements logarithmiques par période (prix non positifs ignorés)."""
+    return np.log(prices.where(prices > 0)).diff().iloc[1:]
+
+
+def _masked_corr(x, m, min_periods):
+    """Corrélations deux à deux de (..., N, T) ; m vaut 1 là où x est connu, x 0 ailleurs."""
+    xt, mt = np.swapaxes(x, -1, -2), np.swapaxes(m, -1, -2)
+    pairs = m @ mt                                 # observations communes de (i, j)
+    sum_x = x @ mt                                 # somme de x_i là où j est connu
+    sum_xx = (x * x) @ mt
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = x @ xt - sum_x * np.swapaxes(sum_x, -1, -2) / pairs
+        var = sum_xx - sum_x ** 2 / pairs
+        corr = cov / np.sqrt(var * np.swapaxes(var, -1, -2))
+    corr[pairs < min_periods] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+def _spearman(values, valid, min_periods):
+    """Spearman comme DataFrame.corr : rangs calculés sur l'échantillon commun de chaque paire.
+
+    Les colonnes de même motif de valeurs manquantes sont rangées ensemble ; seules
+    les paires de motifs différents demandent un classement de plus.
+    """
+    patterns = {}
+    for j in range(values.shape[1]):
+        patterns.setdefault(valid[:, j].tobytes(), []).append(j)
+    groups = list(patterns.values())
+
+    corr = np.full((values.shape[1],) * 2, np.nan)
+    for first, second in itertools.chain(((g, g) for g in groups), itertools.combinations(groups, 2)):
+        columns = first + second if first is not second else first
+        common = valid[:, first[0]] & valid[:, second[0]]
+        ranks = pd.DataFrame(values[common][:, columns]).rank().to_numpy().T
+        block = _masked_corr(ranks, np.ones_like(ranks), min_periods)
+        if first is second:
+            corr[np.ix_(first, first)] = block
+        else:
+            corr[np.ix_(first, second)] = block[:len(first), len(first):]
+            corr[np.ix_(second, first)] = block[len(first):, :len(first)]
+    return corr
+
+
+def _ledoit_wolf(x, corr):
+    """Rétrécit une matrice de corrélation vers l'identité (intensité de Ledoit-Wolf).
+
+    x : rendements standardisés (T x N), 0 là où la valeur manque.
+    """
+    length, n = x.shape
+    sample = np.nan_to_num(corr)
+    np.fill_diagonal(sample, 1.0)
+    distance = ((sample - np.eye(n)) ** 2).sum()
+    # Variance d'estimation : somme sur t de ||x_t x_t' - S||² / T²
+    dispersion = (((x * x).sum(axis=1) ** 2).sum() - length * (sample ** 2).sum()) / length ** 2
+    intensity = float(np.clip(dispersion / distance, 0, 1)) if distance > 0 else 1.0
+    return (1 - intensity) * sample + intensity * np.eye(n), intensity
+
+
+def correlation_matrix(returns, method='pearson', shrinkage=False, min_periods=20):
+    """Matrice de corrélation des rendements (Pearson ou Spearman), éventuellement rétrécie.
+
+    Spearman : Pearson sur les rangs, calculés comme DataFrame.corr sur les
+    dates communes à chaque paire. Avec shrinkage=True, l'intensité retenue
+    est dans result.attrs['shrinkage'].
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError(f"method inconnue : {method!r} (attendu : 'pearson' ou 'spearman')")
+    values = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    if method == 'spearman':
+        corr = _spearman(values, valid, min_periods)
+        # Le rétrécissement porte sur les rangs de chaque colonne
+        values = returns.rank().to_numpy(dtype=float)
+    else:
+        corr = _masked_corr(np.where(valid, values, 0.0).T, valid.T.astype(float), min_periods)
+
+    result = pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+    if shrinkage:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            standardized = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0)
+        shrunk, intensity = _ledoit_wolf(np.where(valid, np.nan_to_num(standardized), 0.0), corr)
+        result = pd.DataFrame(shrunk, index=returns.columns, columns=returns.columns)
+        result.attrs['shrinkage'] = intensity
+    return result
+
+
+def rolling_correlations(frame, window, step=None, min_periods=None, batch=ROLLING_BATCH):
+    """Matrices de corrélation glissantes de toutes les paires de colonnes.
+
+    Renvoie (dates de fin de fenêtre, tableau dates x N x N). step par défaut :
+    le plus petit pas qui garde au plus ROLLING_MAX_FRAMES matrices ; la
+    dernière fenêtre est toujours incluse. Les fenêtres sont des vues
+    glissantes (sans copie du panel), traitées par lots pour borner la mémoire.
+    """
+    values = frame.to_numpy(dtype=float)
+    length, n = values.shape
+    if length < window or n == 0:
+        return pd.DatetimeIndex([]), np.empty((0, n, n))
+    min_periods = min_periods or max(3, window // 2)
+
+    count = length - window + 1
+    step = step or max(1, -(-count // ROLLING_MAX_FRAMES))
+    starts = np.arange(count - 1, -1, -step)[::-1]
+
+    valid = ~np.isnan(values)
+    x_windows = np.lib.stride_tricks.sliding_window_view(np.where(valid, values, 0.0), window, axis=0)
+    m_windows = np.lib.stride_tricks.sliding_window_view(valid.astype(float), window, axis=0)
+
+    result = np.empty((len(starts), n, n))
+    for b in range(0, len(starts), batch):
+        idx = starts[b:b + batch]
+        result[b:b + batch] = _masked_corr(x_windows[idx], m_windows[idx], min_periods)
+    return pd.DatetimeIndex(frame.index[starts + window - 1]), result
+
+
+def mean_pairwise(matrices):
+    """Moyenne des corrélations hors diagonale de chaque matrice (dates x N x N -> dates)."""
+    n = matrices.shape[-1]
+    if n < 2:
+        return np.full(len(matrices), np.nan)
+    upper = np.triu_indices(n, k=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(matrices[:, upper[0], upper[1]], axis=1)
+
+
+# Grands univers : ordre de classification hiérarchique et vues creuses, dont
+# le coût d'affichage ne dépend pas du nombre de tickers.
+
+def cluster_order(corr):
+    """Ordre des colonnes par classification hiérarchique (lien moyen, distance sqrt((1 - ρ) / 2))."""
+    n = len(corr)
+    if n <= 2:
+        return list(corr.index)
+    values = np.nan_to_num(corr.to_numpy(dtype=float), nan=0.0)
+    distance = np.sqrt(np.clip((1 - values) / 2, 0, None))
+    np.fill_diagonal(distance, np.inf)
+    sizes = np.ones(n)
+    members = {i: [i] for i in range(n)}
+
+    # Chaque fusion remplace le groupe i par i ∪ j et désactive j (distances infinies)
+    for _ in range(n - 1):
+        i, j = divmod(int(np.argmin(distance)), n)
+        merged = (distance[i] * sizes[i] + distance[j] * sizes[j]) / (sizes[i] + sizes[j])
+        distance[i, :] = distance[:, i] = merged
+        distance[j, :] = distance[:, j] = np.inf
+        distance[i, i] = np.inf
+        sizes[i] += sizes[j]
+        members[i] += members.pop(j)
+
+    (order,) = members.values()
+    return [corr.index[k] for k in order]
+
+
+def block_average(corr, max_blocks=50):
+    """Matrice réduite à au plus max_blocks x max_blocks blocs (moyenne de chaque bloc)."""
+    n = len(corr)
+    if n <= max_blocks:
+        return corr
+    edges = np.linspace(0, n, max_blocks + 1).astype(int)
+    values = corr.to_numpy(dtype=float)
+    labels = [f"{corr.index[a]} … {corr.index[b - 1]}" if b - a > 1 else str(corr.index[a]) for a, b in zip(edges[:-1], edges[1:])]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        rows = np.add.reduceat(np.nan_to_num(values), edges[:-1], axis=0)
+        sums = np.add.reduceat(rows, edges[:-1], axis=1)
+        counts = np.add.reduceat(np.add.reduceat(~np.isnan(values), edges[:-1], axis=0), edges[:-1], axis=1)
+        return pd.DataFrame(sums / counts, index=labels, columns=labels)
+
+
+def top_pairs(corr, k=50, threshold=0.0):
+    """Les k paires les plus corrélées en valeur absolue, au-dessus de threshold."""
+    values = corr.to_numpy(dtype=float)
+    rows, cols = np.triu_indices(len(corr), k=1)
+    pair_values = values[rows, cols]
+    keep = np.abs(np.nan_to_num(pair_values)) >= threshold
+    rows, cols, pair_values = rows[keep], cols[keep], pair_values[keep]
+    if len(pair_values) > k:
+        best = np.argpartition(-np.abs(pair_values), k - 1)[:k]
+        rows, cols, pair_values = rows[best], cols[best], pair_values[best]
+    pairs = pd.DataFrame({
+        'asset_1': corr.index[rows],
+        'asset_2': corr.columns[cols],
+        'correlation': pair_values,
+    })
+    return pairs.reindex(pairs['correlation'].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+# Pyramide d'agrégats : chaque série en cache est aussi tenue en hebdomadaire et
+# en mensuel, calculés une fois au chargement. Les graphiques y choisissent leur
+# niveau (charts.pyramid_view), les fenêtres de période en sont des tranches.
+
+PYRAMID_LEVELS = {'W': 'W-FRI', 'M': 'ME'}      # dates en fin de période (pandas >= 2.2)
+
+
+def build_pyramid(series, close_ohlc=False):
+    """Niveaux {'D': série brute, 'W': ..., 'M': ...} d'une série.
+
+    Les niveaux agrégés gardent la dernière valeur de chaque période ; avec
+    close_ohlc, un DataFrame open/high/low/close des clôtures de la période
+    (première, plus haute, plus basse, dernière clôture, pas les extrêmes
+    intrajournaliers). Un niveau qui ne réduit pas le nombre de points (série
+    déjà mensuelle...) est omis.
+    """
+    series = series.dropna()
+    pyramid = {'D': series}
+    previous = len(series)
+    for level, rule in PYRAMID_LEVELS.items():
+        resampled = series.resample(rule)
+        aggregated = (resampled.ohlc() if close_ohlc else resampled.last()).dropna()
+        if len(aggregated) < previous:
+            pyramid[level] = aggregated
+            previous = len(aggregated)
+    return pyramid
+
+
+def slice_pyramid(pyramid, start=None):
+    """Même pyramide restreinte aux dates >= start (tranches, sans recalcul)."""
+    if start is None:
+        return pyramid
+    start = pd.Timestamp(start)
+    return {level: values.loc[start:] for level, values in pyramid.items()}
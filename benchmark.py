@@ -0,0 +1,444 @@
+"""Benchmark du dashboard.
+
+Rejoue des réponses FRED / Yahoo enregistrées (bench_fixtures/) à travers
+toutes les fonctions get_* et chaque page, en mode headless (Streamlit AppTest).
+Mesure par page la latence à froid et à chaud, le pic mémoire et la taille
+du rendu envoyé au navigateur, puis écrit les résultats en JSON.
+
+    python benchmark.py record               # enregistre les fixtures (accès réseau)
+    python benchmark.py run --output bench.json
+    python benchmark.py run --output history.jsonl   # ajoute une ligne par exécution
+
+Sans fixture enregistrée pour une série, des données synthétiques
+déterministes sont utilisées (signalées dans les résultats).
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from datetime import datetime
+
+# Exécutions isolées : cache mémoire et pas de pré-chauffage en arrière-plan
+os.environ['HIRSCH_CACHE_BACKEND'] = 'memory'
+os.environ['HIRSCH_PREWARM'] = '0'
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(ROOT, 'Dashboard_Hirsch.py')
+FIXTURES_DIR = os.path.join(ROOT, 'bench_fixtures')
+PAGES = ['home', 'gdp_cpi', 'forex_commodities', 'rates_bonds', 'equity_suite']
+# Saisies de l'equity suite pour exercer les trois onglets
+EQUITY_INPUTS = {
+    'price_ticker': 'AAPL',
+    'corr_tickers': 'AAPL,MSFT,NVDA,GOOGL,AMZN',
+    'fs_ticker': 'AAPL',
+}
+STATEMENTS = ('financials', 'balance_sheet', 'cashflow')
+# Séries FRED journalières (les autres sont synthétisées en mensuel)
+DAILY_FRED_PREFIXES = ('DGS', 'EFFR', 'ECBESTR')
+
+
+def _business_days(start):
+    # Plus rapide que pd.bdate_range sur plusieurs décennies
+    days = pd.date_range(start, pd.Timestamp.today().normalize(), freq='D')
+    return days[days.dayofweek < 5]
+
+
+def _window(frame, period=None, start=None, end=None):
+    """Fenêtre d'une série / d'un DataFrame comme le ferait l'API."""
+    from fetchers import period_start
+
+    if frame.empty:
+        return frame
+    if start is None and period is not None:
+        start = period_start(period, end=frame.index[-1])
+    if start is not None:
+        frame = frame[frame.index >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame.index <= pd.Timestamp(end)]
+    return frame
+
+
+class Fixtures:
+    """Réponses enregistrées (ou synthétiques) par série FRED et par ticker."""
+
+    def __init__(self, directory=FIXTURES_DIR, latency=0.0):
+        self.directory = directory
+        self.latency = latency
+        self.synthetic = set()
+        self._cache = {}
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def _seed(self, key):
+        return np.random.default_rng(zlib.crc32(key.encode()))
+
+    def fred(self, series_id):
+        if ('fred', series_id) not in self._cache:
+            path = self._path('fred', series_id + '.csv')
+            if os.path.exists(path):
+                series = pd.read_csv(path, index_col=0, parse_dates=True).iloc[:, 0]
+            else:
+                self.synthetic.add('fred:' + series_id)
+                daily = series_id.startswith(DAILY_FRED_PREFIXES)
+                index = _business_days('1962-01-02') if daily else pd.date_range('1950-01-01', datetime.now(), freq='MS')
+                steps = self._seed(series_id).normal(0.001, 0.01, len(index))
+                series = pd.Series(100 * np.exp(steps.cumsum()), index=index)
+            self._cache[('fred', series_id)] = series
+        return self._cache[('fred', series_id)]
+
+    def yahoo(self, ticker):
+        if ('yahoo', ticker) not in self._cache:
+            path = self._path('yahoo', ticker + '.csv')
+            if os.path.exists(path):
+                frame = pd.read_csv(path, index_col=0, parse_dates=True)
+            else:
+                self.synthetic.add('yahoo:' + ticker)
+                index = _business_days('1990-01-02')
+                close = 50 * np.exp(self._seed(ticker).normal(0.0003, 0.015, len(index)).cumsum())
+                frame = pd.DataFrame({
+                    'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                    'Close': close, 'Volume': 1_000_000.0,
+                }, index=index)
+            self._cache[('yahoo', ticker)] = frame
+        return self._cache[('yahoo', ticker)]
+
+    def info(self, ticker):
+        path = self._path('yahoo', ticker + '.info.json')
+        if not os.path.exists(path):
+            return {'sector': 'N/A', 'currency': 'USD'}
+        with open(path) as f:
+            return json.load(f)
+
+    def statement(self, ticker, name):
+        path = self._path('yahoo', f'{ticker}.{name}.csv')
+        if not os.path.exists(path):
+            return pd.DataFrame(
+                {'2024': [1.0e9, 4.0e8], '2023': [9.0e8, 3.5e8]},
+                index=['Total Revenue', 'Net Income'],
+            )
+        return pd.read_csv(path, index_col=0)
+
+    def wait(self):
+        # Latence réseau simulée pour chaque requête rejouée
+        if self.latency:
+            time.sleep(self.latency)
+
+
+@contextlib.contextmanager
+def _patched(patches):
+    """Remplace temporairement des attributs (objet, nom, valeur)."""
+    saved = [(obj, name, obj.__dict__.get(name, getattr(obj, name))) for obj, name, _ in patches]
+    try:
+        for obj, name, value in patches:
+            setattr(obj, name, value)
+        yield
+    finally:
+        for obj, name, value in saved:
+            setattr(obj, name, value)
+
+
+def replay(fixtures):
+    """Branche les clients FRED et Yahoo sur les fixtures."""
+    import fredapi
+    import yfinance as yf
+
+    def get_series(self, series_id, observation_start=None, observation_end=None, **kwargs):
+        fixtures.wait()
+        return _window(fixtures.fred(series_id), start=observation_start, end=observation_end)
+
+    def download(tickers, period=None, start=None, end=None, **kwargs):
+        fixtures.wait()
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        frames = {t: _window(fixtures.yahoo(t), period=period or '1mo', start=start, end=end) for t in tickers}
+        return pd.concat(frames, axis=1)
+
+    def history(self, period='1mo', start=None, end=None, **kwargs):
+        fixtures.wait()
+        return _window(fixtures.yahoo(self.ticker), period=period, start=start, end=end)
+
+    patches = [
+        (fredapi.Fred, 'get_series', get_series),
+        (yf, 'download', download),
+        (yf.Ticker, 'history', history),
+        (yf.Ticker, 'info', property(lambda self: fixtures.info(self.ticker))),
+    ]
+    for name in STATEMENTS:
+        patches.append((yf.Ticker, name, property(functools.partial(
+            lambda self, name: fixtures.statement(self.ticker, name), name=name))))
+    return _patched(patches)
+
+
+def record(fixtures):
+    """Branche des enregistreurs : chaque série demandée est téléchargée en entier et sauvegardée."""
+    import fredapi
+    import yfinance as yf
+
+    os.makedirs(fixtures._path('fred'), exist_ok=True)
+    os.makedirs(fixtures._path('yahoo'), exist_ok=True)
+    real_get_series = fredapi.Fred.get_series
+    real_history = yf.Ticker.history
+    real_info = yf.Ticker.info
+    real_statements = {name: getattr(yf.Ticker, name) for name in STATEMENTS}
+
+    def full_fred(fred, series_id):
+        path = fixtures._path('fred', series_id + '.csv')
+        if not os.path.exists(path):
+            real_get_series(fred, series_id).rename(series_id).to_csv(path)
+        return fixtures.fred(series_id)
+
+    def full_yahoo(ticker):
+        path = fixtures._path('yahoo', ticker + '.csv')
+        if not os.path.exists(path):
+            frame = real_history(yf.Ticker(ticker), period='max')
+            frame.index = frame.index.tz_localize(None)
+            frame[['Open', 'High', 'Low', 'Close', 'Volume']].to_csv(path)
+        return fixtures.yahoo(ticker)
+
+    def get_series(self, series_id, observation_start=None, observation_end=None, **kwargs):
+        return _window(full_fred(self, series_id), start=observation_start, end=observation_end)
+
+    def download(tickers, period=None, start=None, end=None, **kwargs):
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        frames = {t: _window(full_yahoo(t), period=period or '1mo', start=start, end=end) for t in tickers}
+        return pd.concat(frames, axis=1)
+
+    def history(self, period='1mo', start=None, end=None, **kwargs):
+        return _window(full_yahoo(self.ticker), period=period, start=start, end=end)
+
+    def info(self):
+        data = real_info.fget(self)
+        with open(fixtures._path('yahoo', self.ticker + '.info.json'), 'w') as f:
+            json.dump(data, f, default=str)
+        return data
+
+    def statement(self, name):
+        frame = real_statements[name].fget(self)
+        frame.to_csv(fixtures._path('yahoo', f'{self.ticker}.{name}.csv'))
+        return frame
+
+    patches = [
+        (fredapi.Fred, 'get_series', get_series),
+        (yf, 'download', download),
+        (yf.Ticker, 'history', history),
+        (yf.Ticker, 'info', property(info)),
+    ]
+    for name in STATEMENTS:
+        patches.append((yf.Ticker, name, property(functools.partial(statement, name=name))))
+    return _patched(patches)
+
+
+def timed_fetchers(timings):
+    """Chronomètre chaque appel des fonctions get_* (décorées par shared_cache ou timed('fetch'))."""
+    import cache_backend
+    import instrumentation
+
+    original = cache_backend.shared_cache
+    original_timed = instrumentation.timed
+
+    def timed(kind, name=None):
+        decorate = original_timed(kind, name)
+        if kind != 'fetch':
+            return decorate
+
+        def decorator(func):
+            traced = decorate(func)
+
+            @functools.wraps(func)
+            def wrapper(*a, **kw):
+                start = time.perf_counter()
+                try:
+                    return traced(*a, **kw)
+                finally:
+                    timings[func.__name__].append(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def shared_cache(*args, **kwargs):
+        decorate = original(*args, **kwargs)
+
+        def decorator(func):
+            cached = decorate(func)
+
+            @functools.wraps(func)
+            def wrapper(*a, **kw):
+                start = time.perf_counter()
+                try:
+                    return cached(*a, **kw)
+                finally:
+                    timings[func.__name__].append(time.perf_counter() - start)
+
+            wrapper.prewarm = cached.prewarm
+            wrapper.submit = functools.partial(cache_backend.submit, wrapper)
+            return wrapper
+        return decorator
+
+    return _patched([(cache_backend, 'shared_cache', shared_cache), (instrumentation, 'timed', timed)])
+
+
+def reset_caches(tmpdir):
+    """Cache vide et store local neuf : la prochaine exécution est à froid."""
+    import cache_backend
+    import timeseries_store
+
+    cache_backend.get_backend().clear()
+    path = os.path.join(tmpdir, f'store-{time.time_ns()}.sqlite')
+    timeseries_store._store = timeseries_store.TimeSeriesStore(path)
+
+
+def payload_bytes(at):
+    """Taille sérialisée des éléments rendus par la page."""
+    from streamlit.testing.v1.element_tree import Element
+
+    return sum(
+        len(node.proto.SerializeToString())
+        for node in at._tree
+        if isinstance(node, Element) and getattr(node, 'proto', None) is not None
+    )
+
+
+def run_page(page, timeout, measure_memory=False):
+    """Exécute une page une fois ; renvoie (AppTest, secondes, pic mémoire)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    at.session_state['page'] = page
+    if page == 'equity_suite':
+        for key, value in EQUITY_INPUTS.items():
+            at.session_state[key] = value
+
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return at, elapsed, peak
+
+
+def benchmark(pages, fixtures, warm_runs=3, timeout=120, measure_memory=True):
+    """Mesures par page et par fonction get_*."""
+    results = {'pages': {}, 'fetchers': {}}
+    fetcher_timings = {'cold': defaultdict(list), 'warm': defaultdict(list)}
+
+    with tempfile.TemporaryDirectory() as tmpdir, replay(fixtures):
+        for page in pages:
+            reset_caches(tmpdir)
+            with timed_fetchers(fetcher_timings['cold']):
+                at, cold, _ = run_page(page, timeout)
+            errors = [str(e.value) for e in at.exception]
+
+            peak = None
+            if measure_memory:
+                reset_caches(tmpdir)
+                _, _, peak = run_page(page, timeout, measure_memory=True)
+
+            warm = []
+            for _ in range(warm_runs):
+                with timed_fetchers(fetcher_timings['warm']):
+                    at, elapsed, _ = run_page(page, timeout)
+                warm.append(elapsed)
+
+            results['pages'][page] = {
+                'cold_s': round(cold, 4),
+                'warm_s': round(statistics.median(warm), 4),
+                'peak_memory_bytes': peak,
+                'payload_bytes': payload_bytes(at),
+                'charts': len(at.get('plotly_chart')),
+                'errors': errors,
+            }
+
+    for name in sorted(set(fetcher_timings['cold']) | set(fetcher_timings['warm'])):
+        cold, warm = fetcher_timings['cold'][name], fetcher_timings['warm'][name]
+        results['fetchers'][name] = {
+            'calls': len(cold),
+            'cold_s': round(sum(cold), 4),
+            'warm_s': round(statistics.median(warm), 6) if warm else None,
+        }
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results):
+    print(f"{'page':<20}{'cold (s)':>10}{'warm (s)':>10}{'peak MB':>10}{'payload KB':>12}  errors")
+    for page, r in results['pages'].items():
+        peak = f"{r['peak_memory_bytes'] / 1e6:.1f}" if r['peak_memory_bytes'] else '-'
+        print(f"{page:<20}{r['cold_s']:>10.3f}{r['warm_s']:>10.3f}{peak:>10}{r['payload_bytes'] / 1e3:>12.1f}  {len(r['errors'])}")
+    print()
+    print(f"{'fetcher':<28}{'calls':>6}{'cold (s)':>10}{'warm (s)':>10}")
+    for name, r in results['fetchers'].items():
+        warm = f"{r['warm_s']:.4f}" if r['warm_s'] is not None else '-'
+        print(f"{name:<28}{r['calls']:>6}{r['cold_s']:>10.3f}{warm:>10}")
+    if results['synthetic_fixtures']:
+        print(f"\n{len(results['synthetic_fixtures'])} series without recorded fixtures (synthetic data used)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['run', 'record'])
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--latency', type=float, default=0.1, help='simulated seconds per upstream request')
+    parser.add_argument('--warm-runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', help='JSON file (.jsonl: append one line per run)')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.command == 'record':
+        fixtures = Fixtures(args.fixtures)
+        with tempfile.TemporaryDirectory() as tmpdir, record(fixtures):
+            for page in args.pages:
+                reset_caches(tmpdir)
+                at, elapsed, _ = run_page(page, args.timeout)
+                print(f"{page:<20}{elapsed:>8.2f}s  errors={[str(e.value) for e in at.exception]}")
+        return 0
+
+    fixtures = Fixtures(args.fixtures, latency=args.latency)
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'latency_s': args.latency,
+    }
+    results.update(benchmark(args.pages, fixtures, args.warm_runs, args.timeout, not args.no_memory))
+    results['synthetic_fixtures'] = sorted(fixtures.synthetic)
+
+    print_report(results)
+    if args.output:
+        if args.output.endswith('.jsonl'):
+            with open(args.output, 'a') as f:
+                f.write(json.dumps(results) + '\n')
+        else:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+    return 1 if any(r['errors'] for r in results['pages'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,532 @@
+import contextvars
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import cache_codec
+from instrumentation import annotate, span
+
+# Cache partagé des fonctions de récupération de données. Contrairement à
+# st.cache_data (une copie par processus), le backend fichier ou Redis est
+# commun à tous les réplicas Streamlit, et un seul appel amont est lancé
+# quand plusieurs sessions ratent la même clé en même temps (single-flight).
+# Une entrée expirée reste servie pendant CACHE_STALE_TTL le temps qu'un
+# rafraîchissement en arrière-plan la remplace (stale-while-revalidate).
+#
+# Choix du backend via HIRSCH_CACHE_BACKEND :
+#   memory (défaut) | file | file:/chemin/du/dossier | redis://hote:6379/0
+
+CACHE_BACKEND = os.environ.get('HIRSCH_CACHE_BACKEND', 'memory')
+# Durée maximale d'un calcul en cours avant qu'un autre processus prenne le relais
+CACHE_LOCK_TTL = 120      # secondes
+CACHE_POLL_INTERVAL = 0.1
+# Durée pendant laquelle une entrée expirée peut encore être servie
+CACHE_STALE_TTL = float(os.environ.get('HIRSCH_CACHE_STALE_TTL', 24 * 3600))   # secondes
+# Plafond mémoire du backend en mémoire, au-delà les entrées les moins récemment lues sont évincées
+CACHE_MAX_BYTES = int(float(os.environ.get('HIRSCH_CACHE_MAX_MB', 512)) * 1024 * 1024)
+# Appels suivis par le pré-chauffage, au-delà les moins récemment demandés sont oubliés
+CACHE_MAX_TRACKED = int(os.environ.get('HIRSCH_CACHE_MAX_TRACKED', 2000))
+
+_MISS = object()
+
+
+# Interface commune des backends : get(key) -> (stored_at, value) ou _MISS,
+# stored_at(key) -> date d'écriture ou None, set(key, value, ttl) où ttl est
+# la durée de conservation totale (fraîche + périmée).
+# Chaque get renvoie une valeur propre à l'appelant : la modifier n'altère pas le cache.
+
+
+def _sizeof(value):
+    """Estimation de l'empreinte mémoire d'une valeur en cache (DataFrame, Series, dict...)."""
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class MemoryBackend:
+    """Cache en mémoire du processus, LRU borné à max_bytes.
+
+    Les valeurs sont copiées à l'écriture et à la lecture (pas d'objet partagé
+    entre sessions). on_evict(clé) est appelé pour chaque entrée évincée par le LRU.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, on_evict=None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._data = OrderedDict()    # clé -> (expires_at, stored_at, value, taille)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISS
+            if entry[0] < time.time():
+                self._pop(key)
+                return _MISS
+            self._data.move_to_end(key)
+        return entry[1], copy.deepcopy(entry[2])
+
+    def stored_at(self, key):
+        # Sans copie de la valeur : appelé à chaque passage du pré-chauffage
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        value = copy.deepcopy(value)
+        size = _sizeof(value)
+        evicted = []
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (now + ttl, now, value, size)
+            self._size += size
+            # Éviction LRU (on garde toujours la dernière entrée écrite)
+            while self._size > self.max_bytes and len(self._data) > 1:
+                evicted.append(next(iter(self._data)))
+                self._pop(evicted[-1])
+        if self.on_evict is not None:
+            for evicted_key in evicted:
+                self.on_evict(evicted_key)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry[3]
+
+    def acquire(self, key, ttl):
+        # Le single-flight en mémoire est entièrement géré par les verrous locaux
+        return True
+
+    def release(self, key):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+
+class FileBackend:
+    """Cache sur disque (voir cache_codec), partageable entre processus via un volume commun."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'hirsch_cache')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key, suffix='.cache'):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                expires_at, stored_at, value = cache_codec.loads(f.read())
+        except (OSError, ValueError):
+            return _MISS
+        if expires_at < time.time():
+            return _MISS
+        return stored_at, value
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        try:
+            payload = cache_codec.dumps((now + ttl, now, value))
+        except TypeError:
+            # Valeur hors des types sérialisables : calculée à chaque appel
+            return
+        # Écriture atomique : les autres processus ne lisent jamais un fichier partiel
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        # La date d'écriture est aussi la date de modification : stored_at ne lit pas le fichier
+        os.utime(tmp, (now, now))
+        os.replace(tmp, self._path(key))
+
+    def stored_at(self, key):
+        # Une entrée expirée garde sa date : son âge dépasse de toute façon ttl + stale_ttl
+        try:
+            return os.path.getmtime(self._path(key))
+        except OSError:
+            return None
+
+    def acquire(self, key, ttl):
+        path = self._path(key, '.lock')
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Verrou abandonné (processus tué) : on le reprend après expiration
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    return False
+                os.remove(path)
+            except OSError:
+                return False
+            return self.acquire(key, ttl)
+        os.close(fd)
+        return True
+
+    def release(self, key):
+        try:
+            os.remove(self._path(key, '.lock'))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class RedisBackend:
+    """Cache Redis (ou tout serveur compatible : Valkey, KeyDB, fakeredis en local)."""
+
+    def __init__(self, url):
+        # Dépendance optionnelle : pip install redis
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get('hirsch:' + key)
+        if raw is None:
+            return _MISS
+        try:
+            return cache_codec.loads(raw)
+        except ValueError:
+            return _MISS
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        try:
+            payload = cache_codec.dumps((now, value))
+        except TypeError:
+            return
+        # Date d'écriture aussi sous une clé à part : stored_at ne transfère pas la valeur
+        with self._client.pipeline() as pipe:
+            pipe.set('hirsch:' + key, payload, ex=int(ttl))
+            pipe.set('hirsch:meta:' + key, repr(now), ex=int(ttl))
+            pipe.execute()
+
+    def stored_at(self, key):
+        raw = self._client.get('hirsch:meta:' + key)
+        return None if raw is None else float(raw)
+
+    def acquire(self, key, ttl):
+        return bool(self._client.set('hirsch:lock:' + key, b'1', nx=True, ex=int(ttl)))
+
+    def release(self, key):
+        self._client.delete('hirsch:lock:' + key)
+
+    def clear(self):
+        for key in self._client.scan_iter('hirsch:*'):
+            self._client.delete(key)
+
+
+def make_backend(spec=CACHE_BACKEND):
+    """Instancie le backend décrit par spec (voir HIRSCH_CACHE_BACKEND)."""
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(spec)
+    if spec == 'file':
+        return FileBackend()
+    if spec.startswith('file:'):
+        return FileBackend(spec[len('file:'):])
+    if spec == 'memory':
+        return MemoryBackend()
+    raise ValueError(f"Unknown cache backend: {spec}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+# Un verrou par clé : une seule thread du processus calcule une clé donnée
+# (références faibles : le verrou disparaît quand plus personne ne l'attend)
+_flight_locks = weakref.WeakValueDictionary()
+_flight_guard = threading.Lock()
+_revalidate_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-revalidate')
+# Appels lancés en avance par les pages (wrapper.submit), pour qu'elles attendent en parallèle
+_submit_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='cache-submit')
+# Appels mémorisés pour le pré-chauffage : clé -> description de l'appel (LRU)
+_tracked = OrderedDict()
+_tracked_lock = threading.Lock()
+
+
+def get_backend():
+    """Backend unique pour tout le processus."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = make_backend()
+                if isinstance(_backend, MemoryBackend):
+                    # Une entrée évincée faute de place n'est plus rafraîchie en fond
+                    _backend.on_evict = untrack
+    return _backend
+
+
+def _flight_lock(key):
+    with _flight_guard:
+        lock = _flight_locks.get(key)
+        if lock is None:
+            lock = _flight_locks[key] = threading.Lock()
+        return lock
+
+
+def refresh_many(entries, ttl, compute_many, stale_ttl=CACHE_STALE_TTL, backend=None):
+    """Recalcule ensemble les clés de entries ({clé: argument}) par un seul compute_many.
+
+    Sans bloquer : les clés déjà en cours de calcul ailleurs sont laissées de côté.
+    Renvoie {clé recalculée: True si compute_many lui a donné une valeur}.
+    """
+    backend = backend or get_backend()
+    locks, owned = [], []
+    try:
+        for key in sorted(entries):
+            lock = _flight_lock(key)
+            if not lock.acquire(blocking=False):
+                continue
+            locks.append(lock)
+            if backend.acquire(key, CACHE_LOCK_TTL):
+                owned.append(key)
+        if not owned:
+            return {}
+        values = compute_many({key: entries[key] for key in owned})
+        for key, value in values.items():
+            backend.set(key, value, ttl + stale_ttl)
+        return {key: key in values for key in owned}
+    finally:
+        for key in owned:
+            backend.release(key)
+        for lock in locks:
+            lock.release()
+
+
+def refresh(key, ttl, compute, stale_ttl=CACHE_STALE_TTL, backend=None):
+    """Recalcule key sans bloquer : ne fait rien si un calcul est déjà en cours."""
+    return refresh_many({key: None}, ttl, lambda entries: {key: compute()}, stale_ttl, backend).get(key, False)
+
+
+def get_or_compute(key, ttl, compute, stale_ttl=CACHE_STALE_TTL, backend=None):
+    """Valeur en cache pour key, sinon calculée une seule fois (tous processus confondus).
+
+    Une entrée plus vieille que ttl est renvoyée telle quelle et rafraîchie en arrière-plan.
+    """
+    backend = backend or get_backend()
+    entry = backend.get(key)
+    if entry is not _MISS:
+        stored_at, value = entry
+        if time.time() - stored_at > ttl:
+            annotate(cache='stale')
+            _revalidate_executor.submit(refresh, key, ttl, compute, stale_ttl, backend)
+        else:
+            annotate(cache='hit')
+        return value
+
+    with _flight_lock(key):
+        # Une autre thread a pu remplir la clé pendant l'attente du verrou
+        entry = backend.get(key)
+        if entry is not _MISS:
+            annotate(cache='hit')
+            return entry[1]
+
+        annotate(cache='miss')
+        deadline = time.time() + CACHE_LOCK_TTL
+        owner = backend.acquire(key, CACHE_LOCK_TTL)
+        while not owner and time.time() < deadline:
+            # Un autre processus calcule déjà cette clé : on attend son résultat
+            time.sleep(CACHE_POLL_INTERVAL)
+            entry = backend.get(key)
+            if entry is not _MISS:
+                return entry[1]
+            owner = backend.acquire(key, CACHE_LOCK_TTL)
+        try:
+            value = compute()
+            backend.set(key, value, ttl + stale_ttl)
+            return value
+        finally:
+            if owner:
+                backend.release(key)
+
+
+def get_many(entries, ttl, compute_many, source=None, stale_ttl=CACHE_STALE_TTL, backend=None, accept=None):
+    """Valeurs en cache de plusieurs clés, les absentes étant calculées ensemble.
+
+    entries : {clé: argument} ; compute_many({clé: argument}) -> {clé: valeur}
+    calcule ensemble les clés absentes, et sert aussi aux revalidations (toutes
+    les clés périmées en un appel) et au pré-chauffage. Les clés sans valeur
+    calculée sont absentes du résultat. accept(valeur) -> bool
+    permet de traiter comme absente une entrée qui ne convient pas (fenêtre trop courte...).
+    Comme get_or_compute, une clé absente n'est calculée qu'une fois, tous processus confondus.
+    Avec source, seules les clés qui ont une valeur sont inscrites au pré-chauffage.
+    """
+    backend = backend or get_backend()
+
+    def cached(key):
+        entry = backend.get(key)
+        if entry is _MISS or (accept is not None and not accept(entry[1])):
+            return _MISS
+        return entry
+
+    values, missing, stale = {}, [], {}
+    for key, argument in entries.items():
+        entry = cached(key)
+        if entry is _MISS:
+            missing.append(key)
+            continue
+        stored_at, values[key] = entry
+        if time.time() - stored_at > ttl:
+            stale[key] = argument
+    if stale:
+        _revalidate_executor.submit(refresh_many, stale, ttl, compute_many, stale_ttl, backend)
+
+    annotate(cache='miss' if missing and not values else 'partial' if missing else 'hit')
+    if not missing:
+        _track_values(values, entries, source, ttl, compute_many)
+        return values
+
+    # Verrous pris dans l'ordre des clés : deux appels concurrents ne peuvent pas s'interbloquer
+    missing = sorted(missing)
+    locks = [_flight_lock(key) for key in missing]
+    owned, overdue = [], []
+    for lock in locks:
+        lock.acquire()
+    try:
+        deadline = time.time() + CACHE_LOCK_TTL
+        pending = missing
+        while pending:
+            # Une autre thread ou un autre processus a pu remplir ces clés entre-temps
+            waiting = []
+            for key in pending:
+                entry = cached(key)
+                if entry is not _MISS:
+                    values[key] = entry[1]
+                elif backend.acquire(key, CACHE_LOCK_TTL):
+                    owned.append(key)
+                else:
+                    waiting.append(key)
+            if not waiting or time.time() >= deadline:
+                # Délai dépassé : les clés encore verrouillées ailleurs sont calculées ici
+                overdue = waiting
+                break
+            time.sleep(CACHE_POLL_INTERVAL)
+            pending = waiting
+
+        if owned or overdue:
+            for key, value in compute_many({key: entries[key] for key in sorted(owned + overdue)}).items():
+                backend.set(key, value, ttl + stale_ttl)
+                values[key] = value
+    finally:
+        for key in owned:
+            backend.release(key)
+        for lock in locks:
+            lock.release()
+    _track_values(values, entries, source, ttl, compute_many)
+    return values
+
+
+def _track_values(values, entries, source, ttl, compute_many):
+    # Une clé sans valeur (ticker inconnu, source en erreur) n'est pas rejouée en fond
+    if source is not None:
+        for key in values:
+            track(key, source, ttl, compute_many, entries[key])
+
+
+def entry_age(key, backend=None):
+    """Âge en secondes de l'entrée key (None si absente)."""
+    stored_at = (backend or get_backend()).stored_at(key)
+    return None if stored_at is None else time.time() - stored_at
+
+
+def peek(key, backend=None):
+    """Valeur en cache de key sans calcul ni revalidation (None si absente)."""
+    entry = (backend or get_backend()).get(key)
+    return None if entry is _MISS else entry[1]
+
+
+def track(key, source, ttl, compute_many, argument=None):
+    """Mémorise un appel pour que le pré-chauffage puisse le rejouer.
+
+    compute_many({clé: argument}) -> {clé: valeur} : les appels qui partagent
+    le même compute_many sont rechargés ensemble.
+    """
+    with _tracked_lock:
+        call = _tracked.setdefault(key, {'key': key, 'source': source, 'ttl': ttl,
+                                         'compute_many': compute_many, 'argument': argument})
+        call['last_used'] = time.time()
+        _tracked.move_to_end(key)
+        while len(_tracked) > CACHE_MAX_TRACKED:
+            _tracked.popitem(last=False)
+
+
+def tracked_calls():
+    with _tracked_lock:
+        return list(_tracked.values())
+
+
+def untrack(key):
+    with _tracked_lock:
+        _tracked.pop(key, None)
+
+
+def make_key(func, args, kwargs):
+    """Clé stable entre processus : nom qualifié de la fonction + hash des arguments."""
+    payload = pickle.dumps((args, sorted(kwargs.items())), protocol=4)
+    digest = hashlib.sha256(payload).hexdigest()[:32]
+    return f"{func.__qualname__}-{digest}"
+
+
+def submit(func, *args, **kwargs):
+    """Lance func(*args) en arrière-plan et renvoie un Future.
+
+    Le contexte est copié pour que les spans restent rattachés à l'exécution en cours.
+    """
+    return _submit_executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def shared_cache(ttl=3600, source=None):
+    """Décorateur équivalent à st.cache_data(ttl=...) mais sur le backend partagé.
+
+    source ('fred', 'yahoo'...) inscrit les appels réussis auprès du pré-chauffage.
+    wrapper.prewarm(*args) inscrit un appel sans l'exécuter.
+    wrapper.submit(*args) lance l'appel en arrière-plan et renvoie un Future.
+    """
+    def decorator(func):
+        def bind(*args, **kwargs):
+            key = make_key(func, args, kwargs)
+            return key, lambda: func(*args, **kwargs)
+
+        def register(key, compute):
+            if source is not None:
+                track(key, source, ttl, lambda entries: {key: compute()})
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key, compute = bind(*args, **kwargs)
+            with span(func.__name__, 'fetch'):
+                value = get_or_compute(key, ttl, compute)
+            # Inscrit au pré-chauffage seulement une fois la valeur obtenue
+            register(key, compute)
+            return value
+
+        wrapper.prewarm = lambda *args, **kwargs: register(*bind(*args, **kwargs))
+        wrapper.submit = functools.partial(submit, wrapper)
+        return wrapper
+    return decorator
@@ -0,0 +1,148 @@
+import base64
+import datetime
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Sérialisation des entrées des caches partagés (fichier, Redis). Contrairement
+# à pickle, le décodage ne peut pas exécuter de code : un processus qui partage
+# le volume ou le serveur Redis ne peut injecter que des données. Types pris en
+# charge : scalaires, listes, tuples, dicts (clés quelconques), Timestamp,
+# ndarray, Index / DatetimeIndex / MultiIndex, Series et DataFrame (attrs
+# compris). Un autre type lève TypeError : la valeur n'est alors pas mise en cache.
+
+_TAG = '__hirsch__'
+
+
+def _array(values):
+    values = np.asarray(values)
+    if values.dtype.kind in 'biufcmM':
+        return {_TAG: 'ndarray', 'dtype': values.dtype.str, 'shape': list(values.shape),
+                'data': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')}
+    return {_TAG: 'objects', 'shape': list(values.shape), 'values': [_encode(v) for v in values.ravel().tolist()]}
+
+
+def _index(index):
+    if isinstance(index, pd.MultiIndex):
+        return {_TAG: 'multiindex', 'names': _encode(list(index.names)), 'tuples': _encode(list(index))}
+    if isinstance(index, pd.DatetimeIndex):
+        tz = None if index.tz is None else str(index.tz)
+        naive = index if index.tz is None else index.tz_convert('UTC').tz_localize(None)
+        return {_TAG: 'datetimeindex', 'name': _encode(index.name), 'tz': tz, 'freq': index.freqstr,
+                'values': _array(naive.to_numpy())}
+    return {_TAG: 'index', 'name': _encode(index.name), 'dtype': str(index.dtype), 'values': _array(index.to_numpy())}
+
+
+def _encode(value):
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, np.generic):
+        return value
+    if isinstance(value, np.generic):
+        return _encode(value.item())
+    if value is pd.NaT:
+        return {_TAG: 'nat'}
+    if isinstance(value, datetime.datetime):
+        return {_TAG: 'timestamp', 'value': pd.Timestamp(value).isoformat()}
+    if isinstance(value, datetime.date):
+        return {_TAG: 'date', 'value': value.isoformat()}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, tuple):
+        return {_TAG: 'tuple', 'values': [_encode(v) for v in value]}
+    if isinstance(value, dict):
+        return {_TAG: 'dict', 'items': [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, np.ndarray):
+        return _array(value)
+    if isinstance(value, pd.Index):
+        return _index(value)
+    if isinstance(value, pd.Series):
+        return {_TAG: 'series', 'name': _encode(value.name), 'dtype': str(value.dtype),
+                'index': _index(value.index), 'values': _array(value.to_numpy()), 'attrs': _encode(dict(value.attrs))}
+    if isinstance(value, pd.DataFrame):
+        return {_TAG: 'frame', 'index': _index(value.index), 'columns': _index(value.columns),
+                'dtypes': [str(dtype) for dtype in value.dtypes],
+                'data': [_array(value.iloc[:, j].to_numpy()) for j in range(value.shape[1])],
+                'attrs': _encode(dict(value.attrs))}
+    raise TypeError(f"type non sérialisable dans le cache : {type(value).__name__}")
+
+
+def _with_dtype(values, dtype, build):
+    """build(values, dtype) en restaurant le dtype d'origine si possible."""
+    try:
+        return build(values, dtype)
+    except (TypeError, ValueError):
+        return build(values, None)
+
+
+def _decode_index(data):
+    kind = data[_TAG]
+    if kind == 'multiindex':
+        return pd.MultiIndex.from_tuples(_decode(data['tuples']), names=_decode(data['names']))
+    if kind == 'datetimeindex':
+        index = pd.DatetimeIndex(_decode(data['values']), name=_decode(data['name']))
+        if data['tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(data['tz'])
+        if data.get('freq'):
+            index = _with_dtype(index, data['freq'], lambda values, freq: pd.DatetimeIndex(values, freq=freq))
+        return index
+    return _with_dtype(_decode(data['values']), data['dtype'],
+                       lambda values, dtype: pd.Index(values, dtype=dtype, name=_decode(data['name'])))
+
+
+def _decode(data):
+    if isinstance(data, list):
+        return [_decode(v) for v in data]
+    if not isinstance(data, dict):
+        return data
+    kind = data[_TAG]
+    if kind == 'nat':
+        return pd.NaT
+    if kind == 'timestamp':
+        return pd.Timestamp(data['value'])
+    if kind == 'date':
+        return datetime.date.fromisoformat(data['value'])
+    if kind == 'tuple':
+        return tuple(_decode(v) for v in data['values'])
+    if kind == 'dict':
+        return {_decode(k): _decode(v) for k, v in data['items']}
+    if kind == 'ndarray':
+        raw = base64.b64decode(data['data'])
+        return np.frombuffer(raw, dtype=np.dtype(data['dtype'])).reshape(data['shape']).copy()
+    if kind == 'objects':
+        values = np.empty(len(data['values']), dtype=object)
+        values[:] = [_decode(v) for v in data['values']]
+        return values.reshape(data['shape'])
+    if kind in ('index', 'datetimeindex', 'multiindex'):
+        return _decode_index(data)
+    if kind == 'series':
+        series = _with_dtype(_decode(data['values']), data['dtype'], lambda values, dtype: pd.Series(
+            values, index=_decode_index(data['index']), name=_decode(data['name']), dtype=dtype
+        ))
+        series.attrs.update(_decode(data['attrs']))
+        return series
+    if kind == 'frame':
+        index, columns = _decode_index(data['index']), _decode_index(data['columns'])
+        frame = pd.DataFrame({
+            j: _with_dtype(_decode(values), dtype, lambda v, d: pd.Series(v, index=index, dtype=d))
+            for j, (values, dtype) in enumerate(zip(data['data'], data['dtypes']))
+        }, index=index)
+        frame.columns = columns
+        frame.attrs.update(_decode(data['attrs']))
+        return frame
+    raise ValueError(f"entrée de cache inconnue : {kind!r}")
+
+
+def dumps(value):
+    """Octets compressés représentant value (TypeError si un type n'est pas pris en charge)."""
+    return zlib.compress(json.dumps(_encode(value), separators=(',', ':')).encode(), 1)
+
+
+def loads(payload):
+    """Inverse de dumps ; ValueError si les octets ne sont pas une entrée valide."""
+    try:
+        return _decode(json.loads(zlib.decompress(payload)))
+    except (zlib.error, KeyError, TypeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"entrée de cache illisible : {exc}") from exc
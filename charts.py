@@ -0,0 +1,111 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from instrumentation import timed
+
+# Sous-échantillonnage des séries longues avant l'envoi à Plotly : l'algorithme
+# LTTB (Largest-Triangle-Three-Buckets) garde les points qui portent la forme de
+# la courbe (pics, creux), si bien que le rendu reste identique à l'œil avec
+# quelques centaines de points au lieu de plusieurs dizaines de milliers.
+
+CHART_MAX_POINTS = int(os.environ.get('HIRSCH_CHART_MAX_POINTS', 1500))
+
+
+def lttb(x, y, n_out):
+    """Indices des n_out points retenus par LTTB (x et y numériques, même longueur)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 seaux entre le premier et le dernier point, toujours conservés
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_series(series, max_points=CHART_MAX_POINTS):
+    """Version sous-échantillonnée d'une série temporelle (index de dates)."""
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    x = series.index.asi8.astype(float) if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series), dtype=float)
+    return series.iloc[lttb(x, series.to_numpy(dtype=float), max_points)]
+
+
+def _numeric_x(values):
+    """Abscisses en flottants pour LTTB, ou None si elles sont catégorielles.
+
+    Les nombres sont pris tels quels ; seules les dates (datetime ou chaînes
+    ISO) sont converties, jamais des nombres interprétés comme des époques.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        return values.astype(float)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            dates = pd.to_datetime(values, errors='raise')
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not is_datetime64_any_dtype(dates):
+        return None
+    return dates.asi8.astype(float)
+
+
+@timed('compute')
+def downsample_figure(fig, max_points=CHART_MAX_POINTS):
+    """Sous-échantillonne en place toutes les traces de lignes trop longues d'une figure."""
+    for trace in fig.data:
+        if trace.type not in ('scatter', 'scattergl') or trace.x is None or trace.y is None:
+            continue
+        if len(trace.x) <= max_points:
+            continue
+        x = _numeric_x(trace.x)
+        # Abscisses catégorielles (maturités...) ou nuage de points : rien à sous-échantillonner
+        if x is None or np.any(np.diff(x) < 0):
+            continue
+        y = np.asarray(trace.y, dtype=float)
+        kept = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+        if len(kept) <= max_points:
+            continue
+        selected = kept[lttb(x[kept], y[kept], max_points)]
+        trace.x = np.asarray(trace.x)[selected]
+        trace.y = y[selected]
+    return fig
+
+
+# Pyramides d'agrégats (voir analytics.build_pyramid) : un graphique sur une
+# longue période part directement du niveau le plus grossier qui garde assez de
+# points pour sa largeur, au lieu de re-sous-échantillonner les cotations quotidiennes.
+
+# Points visés au minimum pour un graphique pleine largeur (CHART_MAX_POINTS)
+CHART_MIN_POINTS = int(os.environ.get('HIRSCH_CHART_MIN_POINTS', 300))
+
+
+def pyramid_view(pyramid, max_points=CHART_MAX_POINTS):
+    """Série à tracer : niveau le plus grossier qui garde assez de points pour la largeur.
+
+    max_points est le plafond du graphique (CHART_MAX_POINTS en pleine largeur,
+    moins pour une colonne) ; le seuil minimal suit la même proportion.
+    """
+    min_points = CHART_MIN_POINTS * max_points / CHART_MAX_POINTS
+    for level in reversed(list(pyramid)):
+        values = pyramid[level]
+        if len(values) >= min_points or level == 'D':
+            return values['close'] if isinstance(values, pd.DataFrame) else values
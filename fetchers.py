@@ -0,0 +1,290 @@
+import json
+import os
+import threading
+import time
+import warnings
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from datetime import datetime
+
+import pandas as pd
+
+from http_session import HTTP_TIMEOUT, fred_session, yahoo_session
+from instrumentation import payload_size, span
+
+# Couche de récupération partagée : toutes les séries FRED demandées par une
+# page partent en parallèle au lieu d'être téléchargées une par une, et les
+# prix Yahoo sont téléchargés par lots de tickers.
+
+FRED_API_KEY = os.environ.get('FRED_API_KEY', '2d1c543149c61f38630e0e0ff35d539c')
+
+# Taille des lots pour les téléchargements Yahoo groupés
+YAHOO_CHUNK_SIZE = int(os.environ.get('HIRSCH_YAHOO_CHUNK', 50))
+
+# Paramètres du pool et de la politique de retry
+# 16 : toutes les maturités des courbes de la page taux partent en une seule vague
+FETCH_MAX_WORKERS = int(os.environ.get('HIRSCH_FETCH_WORKERS', 16))
+# Délai global d'un lot de séries FRED ; chaque requête est en plus bornée par HTTP_TIMEOUT
+FETCH_TIMEOUT = float(os.environ.get('HIRSCH_FETCH_TIMEOUT', 20))   # secondes
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5                                                 # secondes, doublé à chaque essai
+# Statuts HTTP qui valent la peine d'être réessayés
+RETRY_STATUSES = {408, 429}
+
+# Requêtes par seconde vers l'endpoint quoteSummary (Ticker.info), très limité par Yahoo
+YAHOO_INFO_RATE = float(os.environ.get('HIRSCH_YAHOO_INFO_RATE', 4))
+
+# Périodes de la sidebar (format yfinance) -> fenêtre de dates
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=0),
+    '5d': pd.DateOffset(days=6),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix='fred-fetch')
+_info_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix='yahoo-info')
+_fred = None
+_fred_lock = threading.Lock()
+# yf.download s'appuie sur un état global : un seul téléchargement groupé à la fois
+_yahoo_lock = threading.Lock()
+
+
+def _pooled_fred(api_key):
+    """Client fredapi dont les requêtes passent par la session HTTP partagée.
+
+    fredapi ouvre une connexion urllib par appel ; seule sa méthode privée de
+    téléchargement est remplacée, le parsing des réponses reste le sien. Cette
+    méthode n'est pas une API publique (version épinglée dans requirements.txt) :
+    si elle disparaît, le client d'origine est utilisé, sans pool.
+    """
+    from fredapi import Fred
+
+    if not hasattr(Fred, '_Fred__fetch_data'):
+        warnings.warn("fredapi sans Fred.__fetch_data : requêtes FRED hors de la session partagée", RuntimeWarning)
+        return Fred(api_key=api_key)
+
+    class PooledFred(Fred):
+        def _Fred__fetch_data(self, url):
+            response = fred_session().get(url + '&api_key=' + self.api_key, timeout=HTTP_TIMEOUT)
+            try:
+                root = ET.fromstring(response.content)
+            except ET.ParseError:
+                response.raise_for_status()
+                raise
+            if response.status_code in RETRY_STATUSES or response.status_code >= 500:
+                response.raise_for_status()
+            if not response.ok:
+                raise ValueError(root.get('message'))
+            return root
+
+    return PooledFred(api_key=api_key)
+
+
+def get_fred():
+    """Client FRED unique pour tout le processus (créé au premier appel)."""
+    global _fred
+    if _fred is None:
+        with _fred_lock:
+            if _fred is None:
+                _fred = _pooled_fred(FRED_API_KEY)
+    return _fred
+
+
+def period_start(period, end=None):
+    """Première date couverte par une période ('1mo', 'ytd', 'max'...), None pour tout l'historique."""
+    end = pd.Timestamp(end if end is not None else datetime.now()).normalize()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(end.year, 1, 1)
+    return end - PERIOD_OFFSETS[period]
+
+
+def fetch_start(period, lookback=None):
+    """Début de la fenêtre à télécharger pour une période, élargie à lookback si les indicateurs en ont besoin."""
+    start = period_start(period)
+    if start is None or lookback is None:
+        return start
+    return min(start, pd.Timestamp(datetime.now()).normalize() - lookback)
+
+
+def is_transient(exc):
+    """Vrai pour une erreur réseau ou serveur passagère (timeout, connexion, 5xx, 429).
+
+    Une erreur de requête (4xx, série inconnue, ValueError de parsing) est définitive.
+    """
+    # yfinance signale le throttling Yahoo par sa propre exception, hors hiérarchie OSError
+    if type(exc).__name__ == 'YFRateLimitError':
+        return True
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(exc, 'code', None)
+    if isinstance(status, int) and status >= 400:
+        return status in RETRY_STATUSES or status >= 500
+    # Exceptions requests, curl_cffi et urllib : toutes dérivent d'OSError
+    return isinstance(exc, (OSError, ConnectionError, TimeoutError))
+
+
+def with_retry(func, *args, retries=FETCH_RETRIES, backoff=FETCH_BACKOFF, **kwargs):
+    """Appelle func en réessayant avec un backoff exponentiel en cas d'erreur passagère."""
+    delay = backoff
+    for attempt in range(retries):
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if attempt == retries - 1 or not is_transient(exc):
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+class RateLimiter:
+    """Espace les appels d'au moins 1 / rate secondes, toutes threads confondues."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_yahoo_info_limiter = RateLimiter(YAHOO_INFO_RATE)
+
+
+def fetch_concurrently(func, keys, timeout=FETCH_TIMEOUT):
+    """Appelle func(key) pour chaque clé en parallèle ; génère (clé, résultat) au fil des réponses.
+
+    Les clés en échec ou hors délai sont ignorées.
+    """
+    futures = {_info_executor.submit(func, key): key for key in dict.fromkeys(keys)}
+    try:
+        for future in as_completed(futures, timeout=timeout * max(1, len(futures))):
+            try:
+                yield futures[future], future.result()
+            except Exception:
+                continue
+    except FuturesTimeoutError:
+        # Alias de TimeoutError seulement depuis Python 3.11
+        for future in futures:
+            future.cancel()
+
+
+def fetch_fred_series(series_ids, observation_start=None, timeout=FETCH_TIMEOUT):
+    """Récupère plusieurs séries FRED en parallèle.
+
+    observation_start est soit une date commune, soit un dict
+    {series_id: date} (None = tout l'historique).
+    Renvoie un dict {series_id: pd.Series}. Les séries en échec (erreur
+    persistante ou timeout) sont absentes du résultat. timeout borne le lot
+    entier, pas chaque série.
+    """
+    fred = get_fred()
+    series_ids = list(dict.fromkeys(series_ids))
+    if isinstance(observation_start, dict):
+        starts = observation_start
+    else:
+        starts = dict.fromkeys(series_ids, observation_start)
+    futures = {
+        series_id: _executor.submit(
+            with_retry, fred.get_series, series_id, observation_start=starts.get(series_id)
+        )
+        for series_id in series_ids
+    }
+
+    results = {}
+    with span('fred.get_series', 'http', series=len(series_ids)) as event:
+        _, late = wait(futures.values(), timeout=timeout)
+        for series_id, future in futures.items():
+            if future in late:
+                future.cancel()
+                continue
+            try:
+                series = future.result()
+            except Exception:
+                continue
+            if series is not None and len(series) > 0:
+                results[series_id] = series
+        event['rows'], event['payload_bytes'] = payload_size(results)
+    return results
+
+
+def _download_chunk(tickers, field, **kwargs):
+    """Un téléchargement Yahoo groupé pour un lot de tickers."""
+    # Import différé : yfinance est lourd et inutile aux pages sans prix de marché
+    import yfinance as yf
+    with _yahoo_lock:
+        raw = with_retry(
+            yf.download, tickers, group_by='ticker', threads=True,
+            progress=False, auto_adjust=True, session=yahoo_session(), **kwargs
+        )
+    columns = {}
+    if raw is None or raw.empty:
+        return columns
+    for ticker in tickers:
+        series = _ticker_column(raw, ticker, field, single=len(tickers) == 1)
+        if series is not None and not series.dropna().empty:
+            columns[ticker] = series.dropna()
+    return columns
+
+
+def _ticker_column(raw, ticker, field, single):
+    """Colonne field de ticker dans le résultat de yf.download, quelle que soit sa forme.
+
+    Selon la version de yfinance, les colonnes sont (ticker, champ), (champ, ticker),
+    ou à plat (champ) pour un seul ticker.
+    """
+    if isinstance(raw.columns, pd.MultiIndex):
+        for column in [(ticker, field), (field, ticker)]:
+            if column in raw.columns:
+                return raw[column]
+        return None
+    if single and field in raw.columns:
+        return raw[field]
+    return None
+
+
+def fetch_yahoo_info(ticker):
+    """Fiche Ticker.info d'un ticker, sous la limite de débit YAHOO_INFO_RATE."""
+    import yfinance as yf
+
+    def fetch():
+        _yahoo_info_limiter.wait()
+        return yf.Ticker(ticker, session=yahoo_session()).info
+
+    with span('yahoo.info', 'http') as event:
+        info = with_retry(fetch)
+        event['payload_bytes'] = len(json.dumps(info, default=str).encode())
+    return info
+
+
+def fetch_yahoo_prices(tickers, period='1y', field='Close', chunk_size=YAHOO_CHUNK_SIZE, **kwargs):
+    """Télécharge les prix de plusieurs tickers par lots et renvoie un DataFrame aligné.
+
+    Une colonne par ticker (dans l'ordre demandé), index des dates commun.
+    Les tickers sans données sont absents des colonnes.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if 'start' not in kwargs:
+        kwargs['period'] = period
+
+    columns = {}
+    with span('yahoo.download', 'http', tickers=len(tickers)) as event:
+        for i in range(0, len(tickers), chunk_size):
+            columns.update(_download_chunk(tickers[i:i + chunk_size], field, **kwargs))
+        event['rows'], event['payload_bytes'] = payload_size(columns)
+
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame({t: columns[t] for t in tickers if t in columns}).sort_index()
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+
+from instrumentation import count
+
+# Transport HTTP partagé par les clients FRED et Yahoo : une session par client
+# pour tout le processus, dont les connexions restent ouvertes (keep-alive) et
+# sont réutilisées d'un appel à l'autre et entre threads de récupération, avec
+# des réponses compressées (gzip). Compteurs exportés :
+#   - hirsch_http_requests_total : requêtes envoyées ;
+#   - hirsch_http_connections_total : nouvelles connexions (poignées de main TCP/TLS) ;
+#   - hirsch_http_handshake_seconds_total : temps passé à les établir.
+# Requêtes - connexions = requêtes servies par une connexion réutilisée.
+
+HTTP_POOL_SIZE = int(os.environ.get('HIRSCH_HTTP_POOL_SIZE', 16))     # connexions gardées par hôte
+HTTP_TIMEOUT = float(os.environ.get('HIRSCH_HTTP_TIMEOUT', 20))       # secondes par requête
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _shared(name, factory):
+    if name not in _sessions:
+        with _sessions_lock:
+            if name not in _sessions:
+                _sessions[name] = factory()
+    return _sessions[name]
+
+
+def _pooled_requests_session(client):
+    """Session requests dont le pool compte requêtes et nouvelles connexions."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def counting(connection_cls):
+        class Connection(connection_cls):
+            def connect(self):
+                start = time.perf_counter()
+                super().connect()
+                count('hirsch_http_connections_total', client=client)
+                count('hirsch_http_handshake_seconds_total', time.perf_counter() - start, client=client)
+        return Connection
+
+    class Pool(HTTPConnectionPool):
+        ConnectionCls = counting(HTTPConnection)
+
+    class SecurePool(HTTPSConnectionPool):
+        ConnectionCls = counting(HTTPSConnection)
+
+    class Adapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {'http': Pool, 'https': SecurePool}
+
+        def send(self, request, **kwargs):
+            count('hirsch_http_requests_total', client=client)
+            return super().send(request, **kwargs)
+
+    session = requests.Session()
+    # requests envoie déjà Connection: keep-alive et Accept-Encoding: gzip, deflate
+    adapter = Adapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fred_session():
+    """Session HTTP partagée pour l'API FRED."""
+    return _shared('fred', lambda: _pooled_requests_session('fred'))
+
+
+def _yahoo_session_factory():
+    try:
+        from curl_cffi import CurlInfo, CurlOpt
+        from curl_cffi.requests import Session
+    except ImportError:
+        # Sans curl_cffi, yfinance garde sa propre session
+        return None
+
+    class YahooSession(Session):
+        def request(self, *args, **kwargs):
+            response = super().request(*args, **kwargs)
+            count('hirsch_http_requests_total', client='yahoo')
+            connects = response.infos.get(CurlInfo.NUM_CONNECTS) or 0
+            if connects:
+                count('hirsch_http_connections_total', connects, client='yahoo')
+                count('hirsch_http_handshake_seconds_total', response.infos.get(CurlInfo.APPCONNECT_TIME) or 0, client='yahoo')
+            return response
+
+    # Même empreinte navigateur que la session par défaut de yfinance ; curl
+    # garde les connexions ouvertes et accepte les réponses compressées
+    return YahooSession(
+        impersonate='chrome',
+        timeout=HTTP_TIMEOUT,
+        curl_options={CurlOpt.MAXCONNECTS: HTTP_POOL_SIZE},
+        curl_infos=[CurlInfo.NUM_CONNECTS, CurlInfo.APPCONNECT_TIME],
+    )
+
+
+def yahoo_session():
+    """Session curl_cffi partagée pour yfinance (None si curl_cffi est absent)."""
+    return _shared('yahoo', _yahoo_session_factory)
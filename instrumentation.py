@@ -0,0 +1,197 @@
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Instrumentation légère du chemin critique. Chaque span (récupération,
+# calcul, rendu d'un graphique) enregistre sa durée, le statut du cache,
+# la taille des données reçues (objets parsés, pas octets sur le réseau) et
+# les lignes traitées :
+#   - dans l'exécution (rerun) Streamlit courante, pour le panneau de debug ;
+#   - dans des compteurs globaux exportés au format Prometheus.
+
+METRICS_PORT = os.environ.get('HIRSCH_METRICS_PORT')        # ex. 9108 pour exposer /metrics
+METRICS_HOST = os.environ.get('HIRSCH_METRICS_HOST', '127.0.0.1')   # 0.0.0.0 pour un scrape distant
+METRICS_LOG = os.environ.get('HIRSCH_METRICS_LOG')          # fichier JSON lines (un span par ligne)
+
+_current_run = contextvars.ContextVar('hirsch_run', default=None)
+_open_spans = contextvars.ContextVar('hirsch_spans', default=())
+
+_totals = defaultdict(float)      # (métrique, labels) -> valeur cumulée
+_totals_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+class RunRecorder:
+    """Spans d'une exécution du script."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.events = []
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def finish(self):
+        """Marque la fin de l'exécution complète du script."""
+        self.finished = True
+
+    def add(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def to_jsonl(self):
+        return ''.join(json.dumps(e, default=str) + '\n' for e in self.events)
+
+
+def start_run():
+    """Démarre l'enregistrement d'une nouvelle exécution dans le contexte courant."""
+    recorder = RunRecorder()
+    _current_run.set(recorder)
+    return recorder
+
+
+def recorded(func):
+    """Décorateur de fragment : relancé seul, il enregistre ses spans dans une nouvelle exécution.
+
+    Pendant une exécution complète, ses spans vont dans celle-ci (panneau de debug).
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _current_run.get()
+        if recorder is None or recorder.finished:
+            start_run()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _add_total(metric, labels, value):
+    with _totals_lock:
+        _totals[(metric, labels)] += value
+
+
+def _record(event):
+    labels = (('kind', event['kind']), ('name', event['name']))
+    _add_total('hirsch_span_seconds_total', labels, event['duration_ms'] / 1000)
+    _add_total('hirsch_span_count_total', labels, 1)
+    if event.get('cache'):
+        _add_total('hirsch_cache_requests_total', (('name', event['name']), ('status', event['cache'])), 1)
+    if event.get('payload_bytes'):
+        _add_total('hirsch_payload_bytes_total', (('name', event['name']),), event['payload_bytes'])
+    if event.get('rows'):
+        _add_total('hirsch_rows_processed_total', (('name', event['name']),), event['rows'])
+
+    recorder = _current_run.get()
+    if recorder is not None:
+        recorder.add(event)
+    if METRICS_LOG:
+        with _log_lock, open(METRICS_LOG, 'a') as f:
+            f.write(json.dumps(event, default=str) + '\n')
+
+
+@contextlib.contextmanager
+def span(name, kind, **fields):
+    """Mesure un bloc ; le dict renvoyé peut être complété (rows, payload_bytes, cache...)."""
+    event = {'name': name, 'kind': kind, 'start': time.time(), **fields}
+    token = _open_spans.set(_open_spans.get() + (event,))
+    start = time.perf_counter()
+    try:
+        yield event
+    finally:
+        event['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        _open_spans.reset(token)
+        _record(event)
+
+
+def count(metric, value=1, **labels):
+    """Incrémente un compteur Prometheus hors span (ex. connexions HTTP ouvertes)."""
+    _add_total(metric, tuple(sorted(labels.items())), value)
+
+
+def annotate(**fields):
+    """Complète le span ouvert le plus interne (ex. statut du cache)."""
+    spans = _open_spans.get()
+    if spans:
+        spans[-1].update(fields)
+
+
+def timed(kind, name=None):
+    """Décorateur : un span par appel de la fonction."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name or func.__name__, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def payload_size(value):
+    """(lignes, octets) d'un résultat : Series/DataFrame, ou dict/list de ceux-ci."""
+    if hasattr(value, 'memory_usage') and hasattr(value, '__len__'):
+        usage = value.memory_usage(deep=True)
+        return len(value), int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        rows = size = 0
+        for item in value:
+            r, s = payload_size(item)
+            rows, size = rows + r, size + s
+        return rows, size
+    return 0, 0
+
+
+def prometheus_text():
+    """Compteurs cumulés au format texte Prometheus."""
+    with _totals_lock:
+        items = sorted(_totals.items())
+    lines = []
+    seen = set()
+    for (metric, labels), value in items:
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f'# TYPE {metric} counter')
+        label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+        lines.append(f'{metric}{{{label_text}}} {value:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Expose /metrics sur le port donné (une seule fois par processus, rien si port vide)."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError:
+                # Port déjà pris (autre réplica sur la même machine)
+                return None
+            threading.Thread(target=_server.serve_forever, name='hirsch-metrics', daemon=True).start()
+    return _server
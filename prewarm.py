@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+from cache_backend import entry_age, refresh_many, tracked_calls, untrack
+
+# Pré-chauffage : une thread de fond rejoue les appels de données vus
+# récemment avant leur expiration, pour que les utilisateurs soient servis
+# depuis un cache chaud. La fréquence dépend de la source.
+
+PREWARM_ENABLED = os.environ.get('HIRSCH_PREWARM', '1') != '0'
+PREWARM_INTERVALS = {
+    'fred': float(os.environ.get('HIRSCH_PREWARM_FRED', 3000)),    # séries mensuelles / trimestrielles
+    'yahoo': float(os.environ.get('HIRSCH_PREWARM_YAHOO', 300)),   # prix de marché
+}
+PREWARM_TICK = 15                  # secondes entre deux passages du scheduler
+PREWARM_RETENTION = 24 * 3600      # un appel non redemandé depuis ce délai n'est plus rafraîchi
+# Après un échec (source en erreur, clé sans données) l'appel est retenté après
+# 2, 4... intervalles, puis abandonné au bout de PREWARM_MAX_FAILURES échecs consécutifs
+PREWARM_MAX_FAILURES = int(os.environ.get('HIRSCH_PREWARM_MAX_FAILURES', 3))
+
+
+class Prewarmer(threading.Thread):
+    """Thread de fond qui rafraîchit les appels suivis selon PREWARM_INTERVALS."""
+
+    def __init__(self, intervals=None, tick=PREWARM_TICK):
+        super().__init__(name='hirsch-prewarm', daemon=True)
+        self.intervals = intervals or PREWARM_INTERVALS
+        self.tick = tick
+        self._failures = {}        # clé -> (échecs consécutifs, prochain essai)
+        self._stop_event = threading.Event()
+
+    def run_once(self):
+        """Un passage : rafraîchit chaque appel dont l'entrée est plus vieille que l'intervalle de sa source.
+
+        Les appels dus qui partagent un chargeur (toutes les séries Yahoo, toutes
+        les séries FRED) sont rechargés ensemble, en un seul appel amont.
+        """
+        now = time.time()
+        due, intervals = {}, {}
+        calls = tracked_calls()
+        # Échecs d'appels qui ne sont plus suivis (évincés du cache entre-temps)
+        tracked = {call['key'] for call in calls}
+        self._failures = {key: failure for key, failure in self._failures.items() if key in tracked}
+        for call in calls:
+            key = call['key']
+            if now - call['last_used'] > PREWARM_RETENTION:
+                self._forget(key)
+                continue
+            if key in self._failures and now < self._failures[key][1]:
+                continue
+            interval = intervals[key] = min(self.intervals.get(call['source'], call['ttl']), call['ttl'])
+            age = entry_age(key)
+            # Une entrée récente a pu être écrite par un autre réplica : rien à faire
+            if age is not None and age < interval:
+                continue
+            due.setdefault((call['compute_many'], call['ttl']), {})[key] = call['argument']
+
+        refreshed = 0
+        for (compute_many, ttl), entries in due.items():
+            try:
+                results = refresh_many(entries, ttl, compute_many)
+            except Exception:
+                # La source est indisponible : les entrées périmées restent servies
+                results = dict.fromkeys(entries, False)
+            for key, stored in results.items():
+                if stored:
+                    refreshed += 1
+                    self._failures.pop(key, None)
+                else:
+                    self._failed(key, now, intervals[key])
+        return refreshed
+
+    def _failed(self, key, now, interval):
+        failures = self._failures.get(key, (0, now))[0] + 1
+        if failures >= PREWARM_MAX_FAILURES:
+            self._forget(key)
+        else:
+            self._failures[key] = (failures, now + interval * 2 ** failures)
+
+    def _forget(self, key):
+        untrack(key)
+        self._failures.pop(key, None)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.tick)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_prewarmer = None
+_prewarmer_lock = threading.Lock()
+
+
+def start_prewarmer():
+    """Démarre la thread de pré-chauffage une seule fois par processus (HIRSCH_PREWARM=0 pour la désactiver)."""
+    global _prewarmer
+    if not PREWARM_ENABLED:
+        return None
+    with _prewarmer_lock:
+        if _prewarmer is None or not _prewarmer.is_alive():
+            _prewarmer = Prewarmer()
+            _prewarmer.start()
+    return _prewarmer
@@ -0,0 +1,120 @@
+# Registre central des séries du dashboard : chaque identifiant FRED et chaque
+# ticker Yahoo y est décrit une seule fois (source, libellé, fréquence, unité).
+# Les fetchers des pages piochent leurs listes dans les regroupements ci-dessous ;
+# une série commune à plusieurs pages (DGS10 : taux 10 ans et courbe des taux,
+# GC=F / CL=F sur toutes les périodes...) partage la même entrée de cache par série.
+
+# Fréquences : 'D' quotidienne, 'M' mensuelle, 'Q' trimestrielle, 'A' annuelle
+SERIES = {
+    # PIB
+    'GDP': {'source': 'fred', 'label': 'US GDP', 'frequency': 'Q', 'unit': 'USD bn'},
+    'CPMNACSCAB1GQFR': {'source': 'fred', 'label': 'France GDP', 'frequency': 'Q', 'unit': 'EUR m'},
+    'UKNGDP': {'source': 'fred', 'label': 'UK GDP', 'frequency': 'Q', 'unit': 'GBP m'},
+    'CPMNACSCAB1GQDE': {'source': 'fred', 'label': 'Germany GDP', 'frequency': 'Q', 'unit': 'EUR m'},
+    'JPNNGDP': {'source': 'fred', 'label': 'Japan GDP', 'frequency': 'Q', 'unit': 'JPY bn'},
+    'MKTGDPCNA646NWDB': {'source': 'fred', 'label': 'China GDP', 'frequency': 'A', 'unit': 'USD'},
+    # Inflation
+    'CPIAUCSL': {'source': 'fred', 'label': 'US CPI', 'frequency': 'M', 'unit': 'index'},
+    'CP0000FRM086NEST': {'source': 'fred', 'label': 'France HICP', 'frequency': 'M', 'unit': 'index'},
+    'CP0000GBM086NEST': {'source': 'fred', 'label': 'UK HICP', 'frequency': 'M', 'unit': 'index'},
+    'CP0000DEM086NEST': {'source': 'fred', 'label': 'Germany HICP', 'frequency': 'M', 'unit': 'index'},
+    'CPALTT01JPM657N': {'source': 'fred', 'label': 'Japan CPI', 'frequency': 'M', 'unit': '%'},
+    'CPALTT01CNM657N': {'source': 'fred', 'label': 'China CPI', 'frequency': 'M', 'unit': '%'},
+    # Chômage
+    'UNRATE': {'source': 'fred', 'label': 'US Unemployment Rate', 'frequency': 'M', 'unit': '%'},
+    'LRHUTTTTEUM156S': {'source': 'fred', 'label': 'Euro Area Unemployment Rate', 'frequency': 'M', 'unit': '%'},
+    # Taux directeurs
+    'EFFR': {'source': 'fred', 'label': 'Effective Federal Funds Rate', 'frequency': 'D', 'unit': '%'},
+    'ECBESTRVOLWGTTRMDMNRT': {'source': 'fred', 'label': 'Euro Short-Term Rate', 'frequency': 'D', 'unit': '%'},
+    # Courbe des taux US
+    'DGS1MO': {'source': 'fred', 'label': 'US Treasury 1M', 'frequency': 'D', 'unit': '%'},
+    'DGS3MO': {'source': 'fred', 'label': 'US Treasury 3M', 'frequency': 'D', 'unit': '%'},
+    'DGS6MO': {'source': 'fred', 'label': 'US Treasury 6M', 'frequency': 'D', 'unit': '%'},
+    'DGS1': {'source': 'fred', 'label': 'US Treasury 1Y', 'frequency': 'D', 'unit': '%'},
+    'DGS2': {'source': 'fred', 'label': 'US Treasury 2Y', 'frequency': 'D', 'unit': '%'},
+    'DGS5': {'source': 'fred', 'label': 'US Treasury 5Y', 'frequency': 'D', 'unit': '%'},
+    'DGS7': {'source': 'fred', 'label': 'US Treasury 7Y', 'frequency': 'D', 'unit': '%'},
+    'DGS10': {'source': 'fred', 'label': 'US Treasury 10Y', 'frequency': 'D', 'unit': '%'},
+    'DGS20': {'source': 'fred', 'label': 'US Treasury 20Y', 'frequency': 'D', 'unit': '%'},
+    'DGS30': {'source': 'fred', 'label': 'US Treasury 30Y', 'frequency': 'D', 'unit': '%'},
+    # Taux OCDE (mensuels) : interbancaire 3 mois et emprunt d'État 10 ans
+    'IR3TIB01DEM156N': {'source': 'fred', 'label': 'Germany 3M Interbank', 'frequency': 'M', 'unit': '%'},
+    'IR3TIB01FRM156N': {'source': 'fred', 'label': 'France 3M Interbank', 'frequency': 'M', 'unit': '%'},
+    'IR3TIB01GBM156N': {'source': 'fred', 'label': 'UK 3M Interbank', 'frequency': 'M', 'unit': '%'},
+    'IR3TIB01JPM156N': {'source': 'fred', 'label': 'Japan 3M Interbank', 'frequency': 'M', 'unit': '%'},
+    'IRLTLT01DEM156N': {'source': 'fred', 'label': 'Germany 10Y', 'frequency': 'M', 'unit': '%'},
+    'IRLTLT01FRM156N': {'source': 'fred', 'label': 'France 10Y', 'frequency': 'M', 'unit': '%'},
+    'IRLTLT01GBM156N': {'source': 'fred', 'label': 'UK 10Y', 'frequency': 'M', 'unit': '%'},
+    'IRLTLT01JPM156N': {'source': 'fred', 'label': 'Japan 10Y', 'frequency': 'M', 'unit': '%'},
+    # Changes et matières premières
+    'EURUSD=X': {'source': 'yahoo', 'label': 'EUR/USD', 'frequency': 'D', 'unit': 'USD'},
+    'GBPUSD=X': {'source': 'yahoo', 'label': 'GBP/USD', 'frequency': 'D', 'unit': 'USD'},
+    'JPY=X': {'source': 'yahoo', 'label': 'USD/JPY', 'frequency': 'D', 'unit': 'JPY'},
+    'CNY=X': {'source': 'yahoo', 'label': 'USD/CNY', 'frequency': 'D', 'unit': 'CNY'},
+    'CHF=X': {'source': 'yahoo', 'label': 'USD/CHF', 'frequency': 'D', 'unit': 'CHF'},
+    'GC=F': {'source': 'yahoo', 'label': 'Gold', 'frequency': 'D', 'unit': 'USD/oz'},
+    'CL=F': {'source': 'yahoo', 'label': 'Crude Oil (WTI)', 'frequency': 'D', 'unit': 'USD/bbl'},
+}
+
+# Regroupements utilisés par les pages : {pays / libellé: identifiant}
+GDP_SERIES = {
+    'USA': 'GDP',
+    'France': 'CPMNACSCAB1GQFR',
+    'UK': 'UKNGDP',
+    'Germany': 'CPMNACSCAB1GQDE',
+    'Japan': 'JPNNGDP',
+    'China': 'MKTGDPCNA646NWDB'
+}
+CPI_SERIES = {
+    'USA': 'CPIAUCSL',
+    'France': 'CP0000FRM086NEST',
+    'UK': 'CP0000GBM086NEST',
+    'Germany': 'CP0000DEM086NEST',
+    'Japan': 'CPALTT01JPM657N',
+    'China': 'CPALTT01CNM657N'
+}
+UNEMPLOYMENT_SERIES = {
+    'USA': 'UNRATE',
+    'Europe': 'LRHUTTTTEUM156S'
+}
+POLICY_RATE_SERIES = {
+    'US_Fed': 'EFFR',
+    'Euro_ECB': 'ECBESTRVOLWGTTRMDMNRT'
+}
+BOND_10Y_SERIES = {
+    'USA': 'DGS10',
+    'Germany': 'IRLTLT01DEM156N',
+    'France': 'IRLTLT01FRM156N',
+    'UK': 'IRLTLT01GBM156N',
+    'Japan': 'IRLTLT01JPM156N'
+}
+# Courbe des taux, par maturité croissante. Hors USA, FRED ne publie que les
+# séries mensuelles OCDE : taux interbancaire 3 mois et taux long 10 ans
+YIELD_CURVE_SERIES = {
+    'USA': {
+        '1M': 'DGS1MO', '3M': 'DGS3MO', '6M': 'DGS6MO',
+        '1Y': 'DGS1', '2Y': 'DGS2', '5Y': 'DGS5',
+        '7Y': 'DGS7', '10Y': 'DGS10', '20Y': 'DGS20', '30Y': 'DGS30'
+    },
+    'Germany': {'3M': 'IR3TIB01DEM156N', '10Y': 'IRLTLT01DEM156N'},
+    'France': {'3M': 'IR3TIB01FRM156N', '10Y': 'IRLTLT01FRM156N'},
+    'UK': {'3M': 'IR3TIB01GBM156N', '10Y': 'IRLTLT01GBM156N'},
+    'Japan': {'3M': 'IR3TIB01JPM156N', '10Y': 'IRLTLT01JPM156N'}
+}
+MATURITY_ORDER = ['1M', '3M', '6M', '1Y', '2Y', '5Y', '7Y', '10Y', '20Y', '30Y']
+FOREX_TICKERS = {
+    'EURUSD': 'EURUSD=X',
+    'GBPUSD': 'GBPUSD=X',
+    'USDJPY': 'JPY=X',
+    'USDCNY': 'CNY=X',
+    'USDCHF': 'CHF=X'
+}
+COMMODITY_TICKERS = {
+    'Gold': 'GC=F',
+    'Oil': 'CL=F'
+}
+
+
+def series_info(series_id):
+    """Description d'une série du registre (None pour un ticker libre de l'equity suite)."""
+    return SERIES.get(series_id)
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import (
+    align_calendars, align_frequencies, build_pyramid, cluster_order, correlation_matrix, infer_frequency,
+    rolling_correlations, summarize, top_pairs
+)
+
+
+def _random_panel(seed=0):
+    rng = np.random.default_rng(seed)
+    monthly = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60))),
+                        index=pd.date_range('2019-01-01', periods=60, freq='MS'))
+    quarterly = pd.Series(50 + np.cumsum(rng.normal(0, 1, 20)),
+                          index=pd.date_range('2019-01-01', periods=20, freq='QS'))
+    quarterly.iloc[[3, 11]] = np.nan
+    short = pd.Series([10.0, 11.0, 9.0], index=pd.date_range('2023-01-01', periods=3, freq='MS'))
+    return {'monthly': monthly, 'quarterly': quarterly, 'short': short}
+
+
+def test_summarize_matches_pandas_reference():
+    panel = _random_panel()
+    horizons = {'1p': 1, 'YoY': 12}
+    table = summarize(panel, horizons, vol_window=21)
+
+    for name, series in panel.items():
+        series = series.dropna()
+        row = table.loc[name]
+        assert row['last'] == pytest.approx(series.iloc[-1])
+        for column, periods in horizons.items():
+            expected = (series.iloc[-1] / series.iloc[-1 - periods] - 1) * 100 if periods < len(series) else np.nan
+            assert row[column] == pytest.approx(expected, nan_ok=True)
+        returns = series.pct_change().dropna().iloc[-21:]
+        assert row['volatility'] == pytest.approx(returns.std() * 100)
+        assert row['drawdown'] == pytest.approx((series.iloc[-1] / series.max() - 1) * 100)
+
+
+def test_summarize_empty_panel_keeps_columns():
+    table = summarize({'a': pd.Series(dtype=float)}, {'QoQ': 1})
+    assert list(table.columns) == ['last', 'QoQ', 'volatility', 'drawdown']
+    assert table.isna().all().all()
+
+
+def _returns_frame(seed=1, length=300, columns=4):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 1, (length, 1))
+    values = 0.6 * common + rng.normal(0, 1, (length, columns))
+    frame = pd.DataFrame(values, index=pd.bdate_range('2022-01-03', periods=length),
+                         columns=[f"S{i}" for i in range(columns)])
+    frame.iloc[40:55, 1] = np.nan
+    frame.iloc[::17, 2] = np.nan
+    return frame
+
+
+def test_rolling_correlations_match_pandas_rolling_corr():
+    frame = _returns_frame()
+    window = 30
+    dates, matrices = rolling_correlations(frame, window, step=7, min_periods=20)
+    reference = frame.rolling(window, min_periods=20).corr()
+
+    assert dates[-1] == frame.index[-1]
+    assert np.all(np.diff(dates.asi8) > 0)
+    for date, matrix in zip(dates, matrices):
+        expected = reference.loc[date].to_numpy()
+        off_diagonal = ~np.eye(len(expected), dtype=bool)
+        np.testing.assert_allclose(matrix[off_diagonal], expected[off_diagonal], atol=1e-9)
+
+
+def test_rolling_correlations_default_step_bounds_frame_count():
+    frame = _returns_frame(length=2000, columns=3)
+    dates, matrices = rolling_correlations(frame, 60)
+    assert len(dates) <= 520
+    assert dates[-1] == frame.index[-1]
+    assert matrices.shape == (len(dates), 3, 3)
+
+
+def test_correlation_matrix_pearson_matches_pandas():
+    frame = _returns_frame()
+    result = correlation_matrix(frame, min_periods=20)
+    pd.testing.assert_frame_equal(result, frame.corr(min_periods=20), atol=1e-9)
+
+
+def test_correlation_matrix_spearman_matches_pandas():
+    frame = _returns_frame().dropna()
+    result = correlation_matrix(frame, method='spearman')
+    pd.testing.assert_frame_equal(result, frame.corr(method='spearman'), atol=1e-9)
+
+
+def test_correlation_matrix_spearman_ranks_each_pair_on_common_dates():
+    frame = _returns_frame()
+    frame.iloc[:30, 3] = np.nan
+    frame.iloc[::4, 0] = 0.0          # ex aequo
+    result = correlation_matrix(frame, method='spearman', min_periods=20)
+    pd.testing.assert_frame_equal(result, frame.corr(method='spearman', min_periods=20), atol=1e-9)
+
+
+def test_correlation_matrix_ledoit_wolf_matches_reference():
+    frame = _returns_frame(length=60, columns=6).dropna()
+    result = correlation_matrix(frame, shrinkage=True)
+
+    # Référence : estimateur de Ledoit-Wolf vers l'identité sur les rendements standardisés
+    x = ((frame - frame.mean()) / frame.std(ddof=0)).to_numpy()
+    length, n = x.shape
+    sample = x.T @ x / length
+    distance = ((sample - np.eye(n)) ** 2).sum()
+    dispersion = sum(((np.outer(row, row) - sample) ** 2).sum() for row in x) / length ** 2
+    intensity = min(dispersion, distance) / distance
+    expected = (1 - intensity) * sample + intensity * np.eye(n)
+
+    assert 0 < result.attrs['shrinkage'] < 1
+    assert result.attrs['shrinkage'] == pytest.approx(intensity)
+    np.testing.assert_allclose(result.to_numpy(), expected, atol=1e-9)
+
+
+def test_correlation_matrix_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        correlation_matrix(_returns_frame(), method='kendall')
+
+
+def test_align_calendars_fills_holidays_only_inside_each_history():
+    index = pd.to_datetime(['2024-01-02 16:00', '2024-01-03 16:00', '2024-01-04 16:00', '2024-01-05 16:00'])
+    prices = pd.DataFrame({'US': [1.0, np.nan, 3.0, 4.0], 'JP': [np.nan, 10.0, 11.0, np.nan]}, index=index)
+
+    filled = align_calendars(prices, max_gap=5)
+    assert list(filled.index) == list(pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']))
+    assert filled['US'].tolist() == [1.0, 1.0, 3.0, 4.0]
+    assert filled['JP'].isna().tolist() == [True, False, False, True]
+
+    common = align_calendars(prices, policy='intersect')
+    assert list(common.index) == [pd.Timestamp('2024-01-04')]
+
+
+def _block_correlation(seed=2, blocks=3, size=5):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 1, (400, blocks))
+    columns = {}
+    for b in range(blocks):
+        for i in range(size):
+            columns[f"B{b}_{i}"] = factors[:, b] + 0.5 * rng.normal(0, 1, 400)
+    names = list(columns)
+    shuffled = [names[k] for k in rng.permutation(len(names))]
+    return pd.DataFrame(columns)[shuffled].corr()
+
+
+def test_cluster_order_groups_correlated_blocks():
+    corr = _block_correlation()
+    order = cluster_order(corr)
+
+    assert sorted(order) == sorted(corr.index)
+    blocks = [name.split('_')[0] for name in order]
+    # Chaque bloc forme une plage contiguë dans l'ordre renvoyé
+    assert len([b for k, b in enumerate(blocks) if k == 0 or b != blocks[k - 1]]) == 3
+
+
+def test_top_pairs_matches_brute_force():
+    corr = _block_correlation()
+    corr.iloc[0, 1] = corr.iloc[1, 0] = np.nan
+    pairs = top_pairs(corr, k=10, threshold=0.3)
+
+    names = list(corr.index)
+    reference = sorted(
+        ((names[i], names[j], corr.iloc[i, j]) for i in range(len(names)) for j in range(i + 1, len(names))
+         if not np.isnan(corr.iloc[i, j]) and abs(corr.iloc[i, j]) >= 0.3),
+        key=lambda pair: -abs(pair[2])
+    )[:10]
+
+    assert len(pairs) == 10
+    assert [(a, b) for a, b, _ in reference] == list(zip(pairs['asset_1'], pairs['asset_2']))
+    np.testing.assert_allclose(pairs['correlation'], [value for _, _, value in reference])
+
+
+def _daily_and_monthly():
+    daily = pd.Series(np.arange(1.0, 91.0), index=pd.date_range('2024-01-01', periods=90, freq='D'))
+    monthly = pd.Series([10.0, 20.0, 30.0], index=pd.date_range('2024-01-01', periods=3, freq='MS'))
+    return daily, monthly
+
+
+def test_infer_frequency():
+    daily, monthly = _daily_and_monthly()
+    assert infer_frequency(daily) == 'D'
+    assert infer_frequency(monthly) == 'M'
+    assert infer_frequency(pd.Series(1.0, index=pd.date_range('2000-01-01', periods=8, freq='QS'))) == 'Q'
+    assert infer_frequency(pd.Series(1.0, index=pd.date_range('2000-01-01', periods=8, freq='YS'))) == 'A'
+
+
+def test_align_frequencies_resample_matches_pandas():
+    daily, monthly = _daily_and_monthly()
+    aligned = align_frequencies({'daily': daily, 'monthly': monthly}, 'resample')
+    pd.testing.assert_series_equal(aligned['daily'], daily.resample('MS').mean(), check_names=False, check_freq=False)
+    pd.testing.assert_series_equal(aligned['monthly'], monthly, check_names=False, check_freq=False)
+
+
+def test_align_frequencies_asof_has_no_look_ahead():
+    daily, monthly = _daily_and_monthly()
+    aligned = align_frequencies({'daily': daily, 'monthly': monthly}, 'asof')
+
+    pd.testing.assert_index_equal(aligned.index, daily.index, check_names=False)
+    # Janvier (daté du 1er janvier) n'est connu qu'à partir du 1er février
+    assert aligned.loc['2024-01-01':'2024-01-31', 'monthly'].isna().all()
+    assert (aligned.loc['2024-02-01':'2024-02-29', 'monthly'] == 10.0).all()
+    assert (aligned.loc['2024-03-01':'2024-03-30', 'monthly'] == 20.0).all()
+
+
+def test_align_frequencies_asof_tolerance_is_one_period():
+    daily = pd.Series(1.0, index=pd.date_range('2024-01-01', '2024-06-30', freq='D'))
+    monthly = pd.Series([10.0], index=pd.DatetimeIndex(['2024-01-01']))
+    aligned = align_frequencies({'daily': daily, 'monthly': monthly}, 'asof', frequencies={'monthly': 'M'})
+
+    known = aligned['monthly'].dropna()
+    assert known.index[0] == pd.Timestamp('2024-02-01')
+    assert known.index[-1] == pd.Timestamp('2024-03-03')
+
+
+def _daily_prices():
+    index = pd.bdate_range('2022-01-03', '2023-12-29')
+    return pd.Series(100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(index))), index=index)
+
+
+def test_build_pyramid_levels_match_pandas_resample():
+    prices = _daily_prices()
+    pyramid = build_pyramid(prices)
+
+    assert list(pyramid) == ['D', 'W', 'M']
+    pd.testing.assert_series_equal(pyramid['D'], prices)
+    pd.testing.assert_series_equal(pyramid['W'], prices.resample('W-FRI').last(), check_freq=False)
+    pd.testing.assert_series_equal(pyramid['M'], prices.resample('ME').last(), check_freq=False)
+
+
+def test_build_pyramid_close_ohlc():
+    prices = _daily_prices()
+    monthly = build_pyramid(prices, close_ohlc=True)['M']
+    january = prices.loc['2022-01']
+
+    assert list(monthly.columns) == ['open', 'high', 'low', 'close']
+    assert monthly.iloc[0].tolist() == [january.iloc[0], january.max(), january.min(), january.iloc[-1]]
+
+
+def test_build_pyramid_skips_levels_that_do_not_reduce():
+    monthly = pd.Series(np.arange(24.0), index=pd.date_range('2022-01-01', periods=24, freq='MS'))
+    assert list(build_pyramid(monthly)) == ['D']
@@ -0,0 +1,264 @@
+import gc
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_backend
+import cache_codec
+from cache_backend import FileBackend, MemoryBackend, get_many, get_or_compute, track, tracked_calls
+
+
+def test_get_many_computes_each_missing_key_once():
+    backend = MemoryBackend()
+    calls = []
+    barrier = threading.Barrier(4)
+
+    def compute_many(keys):
+        calls.append(list(keys))
+        time.sleep(0.05)
+        return {key: key.upper() for key in keys}
+
+    def worker(keys, results):
+        barrier.wait()
+        entries = {key: (lambda key=key: key.upper()) for key in keys}
+        results.append(get_many(entries, 60, compute_many, backend=backend))
+
+    results = []
+    threads = [
+        threading.Thread(target=worker, args=(keys, results))
+        for keys in (['a', 'b'], ['b', 'a'], ['b', 'c'], ['c', 'a'])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    computed = [key for batch in calls for key in batch]
+    assert sorted(computed) == ['a', 'b', 'c']
+    for result in results:
+        assert all(value == key.upper() for key, value in result.items())
+        assert len(result) == 2
+
+
+def test_get_many_only_computes_keys_still_missing():
+    backend = MemoryBackend()
+    backend.set('a', 'cached', 60)
+    seen = []
+
+    def compute_many(keys):
+        seen.extend(keys)
+        return {key: key for key in keys}
+
+    values = get_many({'a': None, 'b': None}, 60, compute_many, backend=backend)
+    assert values == {'a': 'cached', 'b': 'b'}
+    assert seen == ['b']
+
+
+def test_get_many_rejected_entry_is_recomputed():
+    backend = MemoryBackend()
+    backend.set('a', 'short', 60)
+    values = get_many({'a': None}, 60, lambda keys: {k: 'long' for k in keys},
+                      backend=backend, accept=lambda value: value == 'long')
+    assert values == {'a': 'long'}
+    assert cache_backend._MISS is not backend.get('a')
+
+
+def test_get_many_tracks_entries_only_with_a_source():
+    backend = MemoryBackend()
+    get_many({'untracked-key': None}, 60, lambda keys: {k: 1 for k in keys}, backend=backend)
+    get_many({'tracked-key': None}, 60, lambda keys: {k: 1 for k in keys}, source='yahoo', backend=backend)
+
+    keys = {call['key'] for call in cache_backend.tracked_calls()}
+    assert 'tracked-key' in keys
+    assert 'untracked-key' not in keys
+
+
+def test_get_many_does_not_track_keys_without_value():
+    backend = MemoryBackend()
+    get_many({'BADTKR': None, 'GOOD': None}, 60, lambda keys: {'GOOD': 1}, source='yahoo', backend=backend)
+
+    keys = {call['key'] for call in cache_backend.tracked_calls()}
+    assert 'GOOD' in keys
+    assert 'BADTKR' not in keys
+
+
+def test_get_many_revalidates_all_stale_keys_in_one_call():
+    backend = MemoryBackend()
+    keys = [f"stale-{i}" for i in range(30)]
+    for key in keys:
+        backend.set(key, 'old', 60)
+    time.sleep(0.01)
+    batches = []
+
+    def compute_many(entries):
+        batches.append(sorted(entries))
+        return {key: 'new' for key in entries}
+
+    values = get_many({key: None for key in keys}, 0.001, compute_many, backend=backend)
+    assert set(values.values()) == {'old'}
+    deadline = time.time() + 2
+    while backend.get(keys[-1])[1] != 'new' and time.time() < deadline:
+        time.sleep(0.01)
+    assert batches == [sorted(keys)]
+    assert all(backend.get(key)[1] == 'new' for key in keys)
+
+
+def test_get_or_compute_computes_once_under_concurrency():
+    backend = MemoryBackend()
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    def worker(results):
+        barrier.wait()
+        results.append(get_or_compute('single-flight', 60, compute, backend=backend))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['value'] * 8
+
+
+def test_stale_entry_is_served_then_revalidated():
+    backend = MemoryBackend()
+    backend.set('swr', 'old', 60)
+    time.sleep(0.01)
+
+    # ttl dépassé : valeur périmée renvoyée tout de suite, rafraîchie en arrière-plan
+    assert get_or_compute('swr', 0.001, lambda: 'new', backend=backend) == 'old'
+    deadline = time.time() + 2
+    while backend.get('swr')[1] != 'new' and time.time() < deadline:
+        time.sleep(0.01)
+    assert backend.get('swr')[1] == 'new'
+
+
+def test_memory_backend_hands_out_private_copies():
+    backend = MemoryBackend()
+    frame = pd.DataFrame({'close': [1.0, 2.0]})
+    backend.set('frame', {'D': frame}, 60)
+
+    frame.iloc[0, 0] = 99.0
+    first = backend.get('frame')[1]
+    first['D'].iloc[1, 0] = -1.0
+    first['W'] = 'added'
+
+    second = backend.get('frame')[1]
+    assert list(second) == ['D']
+    assert second['D']['close'].tolist() == [1.0, 2.0]
+
+
+def test_flight_locks_are_released_with_their_last_user():
+    lock = cache_backend._flight_lock('weak-lock-key')
+    assert cache_backend._flight_lock('weak-lock-key') is lock
+    del lock
+    gc.collect()
+    assert 'weak-lock-key' not in cache_backend._flight_locks
+
+
+def test_lru_eviction_untracks_prewarm_calls(monkeypatch):
+    monkeypatch.setattr(cache_backend, '_tracked', cache_backend.OrderedDict())
+    evicted = []
+    backend = MemoryBackend(max_bytes=1, on_evict=lambda key: (evicted.append(key), cache_backend.untrack(key)))
+    track('first', 'fred', 60, None)
+    track('second', 'fred', 60, None)
+    backend.set('first', 'a' * 100, 60)
+    backend.set('second', 'b' * 100, 60)
+
+    assert evicted == ['first']
+    assert [call['key'] for call in tracked_calls()] == ['second']
+
+
+def test_tracked_calls_are_bounded(monkeypatch):
+    monkeypatch.setattr(cache_backend, '_tracked', cache_backend.OrderedDict())
+    monkeypatch.setattr(cache_backend, 'CACHE_MAX_TRACKED', 3)
+    for key in ['a', 'b', 'c', 'a', 'd']:
+        track(key, 'yahoo', 60, None)
+    assert [call['key'] for call in tracked_calls()] == ['c', 'a', 'd']
+
+
+def test_codec_round_trips_cached_values():
+    index = pd.date_range('2024-01-01', periods=5, freq='D', tz='America/New_York')
+    series = pd.Series([1.0, np.nan, 3.0, 4.0, 5.0], index=index, name='GC=F')
+    frame = pd.DataFrame({'open': [1.0, 2.0], 'label': ['a', None]}, index=pd.to_datetime(['2024-01-31', '2024-02-29']))
+    frame.attrs['shrinkage'] = 0.25
+    statement = pd.DataFrame(np.arange(4.0).reshape(2, 2), index=['Revenue', 'EBIT'],
+                             columns=pd.to_datetime(['2023-12-31', '2022-12-31']))
+
+    covered_from, pyramid = cache_codec.loads(cache_codec.dumps(('2020-01-01', {'D': series, 'M': frame})))
+    assert covered_from == '2020-01-01'
+    pd.testing.assert_series_equal(pyramid['D'], series)
+    pd.testing.assert_frame_equal(pyramid['M'], frame)
+    assert pyramid['M'].attrs == {'shrinkage': 0.25}
+
+    pd.testing.assert_frame_equal(cache_codec.loads(cache_codec.dumps(statement)), statement)
+
+    dates, matrices = cache_codec.loads(cache_codec.dumps((index, np.eye(3)[None])))
+    pd.testing.assert_index_equal(dates, index)
+    np.testing.assert_array_equal(matrices, np.eye(3)[None])
+
+    info = {'sector': 'Tech', 'marketCap': 10 ** 12, 'ratios': [1.5, None], ('nested', 1): {'ok': True}}
+    assert cache_codec.loads(cache_codec.dumps(info)) == info
+    assert cache_codec.loads(cache_codec.dumps(pd.Timestamp('2024-01-01', tz='UTC'))) == pd.Timestamp('2024-01-01', tz='UTC')
+
+
+def test_codec_refuses_arbitrary_objects():
+    class Payload:
+        pass
+
+    with pytest.raises(TypeError):
+        cache_codec.dumps(Payload())
+    with pytest.raises(ValueError):
+        cache_codec.loads(b'not a cache entry')
+
+
+def test_file_backend_round_trip_and_unserializable_values(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    series = pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-01-01', '2024-01-02']))
+    backend.set('series', series, 60)
+    pd.testing.assert_series_equal(backend.get('series')[1], series)
+    assert backend.stored_at('series') is not None
+
+    backend.set('object', object(), 60)
+    assert backend.get('object') is cache_backend._MISS
+
+
+def test_file_backend_stored_at_does_not_decode_the_entry(tmp_path, monkeypatch):
+    backend = FileBackend(str(tmp_path))
+    before = time.time()
+    backend.set('frame', pd.DataFrame({'close': np.arange(1000.0)}), 60)
+
+    def loads(payload):
+        raise AssertionError('stored_at decoded the payload')
+
+    monkeypatch.setattr(cache_codec, 'loads', loads)
+    assert before <= backend.stored_at('frame') <= time.time()
+    assert backend.stored_at('absent') is None
+
+
+def test_shared_cache_tracks_calls_only_after_success(monkeypatch):
+    monkeypatch.setattr(cache_backend, '_tracked', cache_backend.OrderedDict())
+    monkeypatch.setattr(cache_backend, '_backend', MemoryBackend())
+
+    @cache_backend.shared_cache(ttl=60, source='yahoo')
+    def quote(ticker):
+        if ticker == 'BADTKR':
+            raise ValueError(ticker)
+        return 1.0
+
+    with pytest.raises(ValueError):
+        quote('BADTKR')
+    assert tracked_calls() == []
+    assert quote('GOOD') == 1.0
+    assert len(tracked_calls()) == 1
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from analytics import build_pyramid, slice_pyramid
+from charts import CHART_MAX_POINTS, downsample_figure, lttb, pyramid_view
+
+
+def _brute_force_lttb(x, y, n_out):
+    """LTTB de référence, seau par seau."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = [0]
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg = (x[end:next_end].mean(), y[end:next_end].mean())
+        a = selected[-1]
+        areas = [abs((x[a] - avg[0]) * (y[k] - y[a]) - (x[a] - x[k]) * (avg[1] - y[a])) for k in range(start, end)]
+        selected.append(start + int(np.argmax(areas)))
+    return selected + [n - 1]
+
+
+def test_lttb_keeps_endpoints_and_matches_reference():
+    rng = np.random.default_rng(0)
+    x = np.arange(5000, dtype=float)
+    y = np.cumsum(rng.normal(0, 1, 5000))
+    indices = lttb(x, y, 200)
+
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert np.all(np.diff(indices) > 0)
+    assert list(indices) == _brute_force_lttb(x, y, 200)
+
+
+def test_lttb_keeps_extremes():
+    y = np.zeros(1000)
+    y[321], y[777] = 50.0, -50.0
+    indices = lttb(np.arange(1000, dtype=float), y, 50)
+    assert 321 in indices and 777 in indices
+
+
+def test_lttb_short_input_is_untouched():
+    assert list(lttb(np.arange(10.0), np.arange(10.0), 20)) == list(range(10))
+
+
+def test_downsample_figure_dates_and_iso_strings():
+    dates = pd.date_range('2000-01-01', periods=4000, freq='D')
+    y = np.sin(np.arange(4000) / 50)
+    fig = go.Figure([
+        go.Scatter(x=dates, y=y),
+        go.Scatter(x=dates.strftime('%Y-%m-%d'), y=y),
+    ])
+    downsample_figure(fig, max_points=500)
+
+    for trace in fig.data:
+        assert len(trace.x) == 500
+        assert pd.Timestamp(trace.x[0]) == dates[0]
+        assert pd.Timestamp(trace.x[-1]) == dates[-1]
+
+
+def test_downsample_figure_numeric_x_is_not_read_as_dates():
+    x = np.linspace(0.0, 1.0, 3000)
+    y = x ** 2
+    fig = go.Figure(go.Scatter(x=x, y=y))
+    downsample_figure(fig, max_points=300)
+
+    trace = fig.data[0]
+    assert len(trace.x) == 300
+    assert np.asarray(trace.x).dtype.kind == 'f'
+    np.testing.assert_allclose(np.asarray(trace.y), np.asarray(trace.x) ** 2)
+    assert trace.x[0] == 0.0 and trace.x[-1] == 1.0
+
+
+def test_downsample_figure_leaves_categorical_traces():
+    labels = [f"T{i}" for i in range(3000)]
+    fig = go.Figure(go.Scatter(x=labels, y=np.arange(3000.0)))
+    downsample_figure(fig, max_points=300)
+    assert len(fig.data[0].x) == 3000
+
+
+def _daily_prices():
+    index = pd.bdate_range('2022-01-03', '2023-12-29')
+    return pd.Series(100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(index))), index=index)
+
+
+def test_slice_pyramid_and_view_pick_level_for_width():
+    pyramid = build_pyramid(_daily_prices(), close_ohlc=True)
+    sliced = slice_pyramid(pyramid, '2023-07-01')
+    assert all(values.index[0] >= pd.Timestamp('2023-07-01') for values in sliced.values())
+
+    # Deux ans : ~520 points quotidiens, 104 hebdomadaires, 24 mensuels
+    assert (len(pyramid['D']), len(pyramid['W']), len(pyramid['M'])) == (520, 104, 24)
+    # Pleine largeur (seuil 300) : seul le niveau quotidien a assez de points
+    assert pyramid_view(pyramid, CHART_MAX_POINTS) is pyramid['D']
+    # Colonne de 200 points (seuil 40) : le mensuel est trop court, l'hebdomadaire suffit, en clôtures
+    pd.testing.assert_series_equal(pyramid_view(pyramid, 200), pyramid['W']['close'])
+    # Vignette de 60 points (seuil 12) : le mensuel suffit
+    pd.testing.assert_series_equal(pyramid_view(pyramid, 60), pyramid['M']['close'])
+    # Six mois en pleine largeur : aucun niveau n'atteint le seuil, repli sur le quotidien
+    assert len(sliced['D']) < 300
+    assert pyramid_view(sliced, CHART_MAX_POINTS) is sliced['D']
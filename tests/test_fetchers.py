@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+import fetchers
+from fetchers import fetch_fred_series, is_transient, with_retry
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize('exc, expected', [
+    (requests.ConnectionError(), True),
+    (requests.Timeout(), True),
+    (TimeoutError(), True),
+    (_http_error(503), True),
+    (_http_error(429), True),
+    (_http_error(404), False),
+    (_http_error(400), False),
+    (ValueError('Bad Request.  The series does not exist.'), False),
+    (KeyError('Close'), False),
+])
+def test_is_transient(exc, expected):
+    assert is_transient(exc) is expected
+
+
+def test_with_retry_retries_only_transient_errors():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise requests.ConnectionError()
+        return 'ok'
+
+    assert with_retry(flaky, backoff=0) == 'ok'
+    assert len(calls) == 3
+
+    calls.clear()
+
+    def invalid():
+        calls.append(1)
+        raise ValueError('Bad Request.')
+
+    with pytest.raises(ValueError):
+        with_retry(invalid, backoff=0)
+    assert len(calls) == 1
+
+
+def test_fetch_fred_series_uses_one_overall_deadline(monkeypatch):
+    class SlowFred:
+        def get_series(self, series_id, observation_start=None):
+            if series_id.startswith('SLOW'):
+                time.sleep(1)
+            return pd.Series([1.0], index=pd.to_datetime(['2024-01-01']))
+
+    monkeypatch.setattr(fetchers, 'get_fred', SlowFred)
+    started = time.monotonic()
+    results = fetch_fred_series(['FAST', 'SLOW1', 'SLOW2', 'SLOW3'], timeout=0.2)
+    elapsed = time.monotonic() - started
+
+    assert list(results) == ['FAST']
+    assert elapsed < 0.6
+
+
+@pytest.mark.parametrize('columns', [
+    pd.MultiIndex.from_tuples([('AAPL', 'Close'), ('AAPL', 'Open')]),
+    pd.MultiIndex.from_tuples([('Close', 'AAPL'), ('Open', 'AAPL')]),
+    pd.Index(['Close', 'Open']),
+])
+def test_download_chunk_handles_every_column_layout(monkeypatch, columns):
+    import yfinance
+
+    index = pd.date_range('2024-01-01', periods=3)
+    raw = pd.DataFrame([[1.0, 0.5], [np.nan, 0.5], [3.0, 0.5]], index=index, columns=columns)
+    monkeypatch.setattr(yfinance, 'download', lambda *args, **kwargs: raw)
+
+    result = fetchers._download_chunk(['AAPL'], 'Close', period='1y')
+    assert list(result) == ['AAPL']
+    assert result['AAPL'].tolist() == [1.0, 3.0]
+
+
+def test_download_chunk_skips_missing_tickers(monkeypatch):
+    import yfinance
+
+    raw = pd.DataFrame({('AAPL', 'Close'): [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2))
+    monkeypatch.setattr(yfinance, 'download', lambda *args, **kwargs: raw)
+
+    assert list(fetchers._download_chunk(['AAPL', 'NOPE'], 'Close')) == ['AAPL']
+
+
+def test_fetch_concurrently_drops_failures_and_late_keys():
+    def work(key):
+        if key == 'fail':
+            raise requests.ConnectionError()
+        if key == 'slow':
+            time.sleep(1)
+        return key.upper()
+
+    started = time.monotonic()
+    results = dict(fetchers.fetch_concurrently(work, ['a', 'fail', 'slow', 'b'], timeout=0.1))
+    assert results == {'a': 'A', 'b': 'B'}
+    assert time.monotonic() - started < 0.9
@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetchers
+import instrumentation
+
+OBSERVATIONS = (
+    b'<?xml version="1.0"?><observations count="2">'
+    b'<observation realtime_start="2024-01-01" realtime_end="2024-01-01" date="2020-01-01" value="1.5"/>'
+    b'<observation realtime_start="2024-01-01" realtime_end="2024-01-01" date="2020-02-01" value="."/>'
+    b'</observations>'
+)
+UNKNOWN_SERIES = b'<?xml version="1.0"?><error code="400" message="Bad Request.  The series does not exist."/>'
+
+
+class FredHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        code, body = (400, UNKNOWN_SERIES) if 'BAD' in self.path else (200, OBSERVATIONS)
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fred_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FredHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def _total(metric):
+    return instrumentation._totals.get((metric, (('client', 'fred'),)), 0)
+
+
+def test_fred_get_series_goes_through_pooled_session(fred_server):
+    fred = fetchers._pooled_fred('test-key')
+    fred.root_url = fred_server
+    requests_before = _total('hirsch_http_requests_total')
+    connections_before = _total('hirsch_http_connections_total')
+
+    series = fred.get_series('DGS10')
+    assert series.iloc[0] == 1.5
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: fred.get_series('DGS10'), range(20)))
+
+    requests_sent = _total('hirsch_http_requests_total') - requests_before
+    connections = _total('hirsch_http_connections_total') - connections_before
+    assert requests_sent == 21
+    # Connexions keep-alive réutilisées : au plus une par thread
+    assert 1 <= connections <= 5
+    assert all('api_key=test-key' in path for path in FredHandler.paths)
+
+
+def test_fred_error_message_is_raised_as_value_error(fred_server):
+    fred = fetchers._pooled_fred('test-key')
+    fred.root_url = fred_server
+    with pytest.raises(ValueError, match='series does not exist'):
+        fred.get_series('BAD')
@@ -0,0 +1,47 @@
+import contextvars
+import urllib.request
+
+import instrumentation
+from instrumentation import recorded, span, start_run
+
+
+def test_payload_bytes_feed_payload_metric():
+    with span('fixture.fetch', 'http') as event:
+        event['payload_bytes'] = 1234
+    assert instrumentation._totals[('hirsch_payload_bytes_total', (('name', 'fixture.fetch'),))] >= 1234
+    assert 'hirsch_bytes_received_total' not in instrumentation.prometheus_text()
+
+
+def test_fragment_rerun_records_into_a_new_run():
+    def scenario():
+        @recorded
+        def fragment():
+            with span('fragment.work', 'compute'):
+                pass
+
+        full_run = start_run()
+        fragment()
+        assert [e['name'] for e in full_run.events] == ['fragment.work']
+
+        # Rerun du fragment seul, après la fin de l'exécution complète
+        full_run.finish()
+        fragment()
+        assert len(full_run.events) == 1
+        rerun = instrumentation._current_run.get()
+        assert rerun is not full_run
+        assert [e['name'] for e in rerun.events] == ['fragment.work']
+
+    contextvars.copy_context().run(scenario)
+
+
+def test_metrics_server_binds_loopback_by_default(monkeypatch):
+    monkeypatch.setattr(instrumentation, '_server', None)
+    # Port '0' (comme lu depuis HIRSCH_METRICS_PORT) : port libre choisi par le système
+    server = instrumentation.start_metrics_server('0')
+    try:
+        assert server.server_address[0] == '127.0.0.1'
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+            assert response.status == 200
+    finally:
+        server.shutdown()
+        server.server_close()
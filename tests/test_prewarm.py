@@ -0,0 +1,52 @@
+import pandas as pd
+
+import prewarm
+
+import cache_backend
+import timeseries_store
+from prewarm import Prewarmer
+
+
+def test_prewarmer_reloads_due_series_of_a_source_together(monkeypatch):
+    monkeypatch.setattr(cache_backend, '_tracked', cache_backend.OrderedDict())
+    monkeypatch.setattr(cache_backend, '_backend', cache_backend.MemoryBackend())
+    calls = []
+
+    def load(keys, start):
+        calls.append(sorted(keys))
+        index = pd.bdate_range('2024-01-01', periods=30)
+        return {key: pd.Series(range(30), index=index, dtype=float) for key in keys}
+
+    tickers = [f"T{i}" for i in range(30)]
+    timeseries_store._prewarm_series('yahoo', tickers, '2024-01-01', load, 300, close_ohlc=True)
+
+    assert Prewarmer(intervals={'yahoo': 300}).run_once() == 30
+    assert calls == [sorted(tickers)]
+    # Entrées fraîches : rien à recharger au passage suivant
+    assert Prewarmer(intervals={'yahoo': 300}).run_once() == 0
+    assert len(calls) == 1
+
+
+def test_prewarmer_backs_off_then_drops_keys_without_data(monkeypatch):
+    monkeypatch.setattr(cache_backend, '_tracked', cache_backend.OrderedDict())
+    monkeypatch.setattr(cache_backend, '_backend', cache_backend.MemoryBackend())
+    clock = [1000.0]
+    monkeypatch.setattr(prewarm.time, 'time', lambda: clock[0])
+    calls = []
+
+    def load(keys, start):
+        calls.append(sorted(keys))
+        return {}
+
+    timeseries_store._prewarm_series('yahoo', ['BADTKR'], '2024-01-01', load, 300)
+    prewarmer = Prewarmer(intervals={'yahoo': 300})
+    prewarmer.run_once()
+    # Pas de nouvel essai avant la fin du délai d'attente
+    prewarmer.run_once()
+    assert len(calls) == 1
+
+    for _ in range(prewarm.PREWARM_MAX_FAILURES):
+        clock[0] += 300 * 2 ** prewarm.PREWARM_MAX_FAILURES
+        prewarmer.run_once()
+    assert len(calls) == prewarm.PREWARM_MAX_FAILURES
+    assert cache_backend.tracked_calls() == []
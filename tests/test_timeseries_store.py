@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from timeseries_store import TimeSeriesStore
+
+OVERLAP = pd.Timedelta(days=3)
+
+
+def _series(values, start='2024-01-01'):
+    return pd.Series(values, index=pd.date_range(start, periods=len(values), freq='D'), dtype=float)
+
+
+class FakeSource:
+    """fetch_window sur un historique en mémoire ; garde la trace des fenêtres demandées."""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, starts):
+        self.calls.append(dict(starts))
+        result = {}
+        for key, start in starts.items():
+            series = self.history[key]
+            result[key] = series if start is None else series[series.index >= pd.Timestamp(start)]
+        return result
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeSeriesStore(str(tmp_path / 'store.sqlite'))
+
+
+def test_sync_fetches_full_window_then_only_the_overlap(store):
+    source = FakeSource({'A': _series(range(10))})
+    store.sync('fred', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0)
+    assert source.calls == [{'A': '2024-01-01'}]
+    pd.testing.assert_series_equal(store.read('fred', 'A'), source.history['A'], check_freq=False)
+
+    # Nouvelles observations et révision d'une valeur du recouvrement
+    history = _series(range(12))
+    history.iloc[8] = 80.0
+    source.history['A'] = history
+    store.sync('fred', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0)
+
+    assert source.calls[-1] == {'A': pd.Timestamp('2024-01-10') - OVERLAP}
+    pd.testing.assert_series_equal(store.read('fred', 'A'), history, check_freq=False)
+    assert store.meta('fred', 'A')['last_date'] == '2024-01-12'
+    assert store.meta('fred', 'A')['covered_from'] == '2024-01-01'
+
+
+def test_sync_skips_recent_series_and_extends_shorter_coverage(store):
+    source = FakeSource({'A': _series(range(30))})
+    store.sync('fred', ['A'], '2024-01-20', source, OVERLAP, min_refresh=0)
+    store.sync('fred', ['A'], '2024-01-20', source, OVERLAP, min_refresh=3600)
+    assert len(source.calls) == 1
+
+    # Fenêtre plus longue que la couverture : téléchargement complet depuis le nouveau début
+    store.sync('fred', ['A'], '2024-01-05', source, OVERLAP, min_refresh=3600)
+    assert source.calls[-1] == {'A': '2024-01-05'}
+    assert store.meta('fred', 'A')['covered_from'] == '2024-01-05'
+    assert store.read('fred', 'A').index[0] == pd.Timestamp('2024-01-05')
+
+
+def test_sync_refetches_history_when_overlap_was_readjusted(store):
+    source = FakeSource({'A': _series([100.0] * 10)})
+    store.sync('yahoo', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0, rebase_tolerance=1e-4)
+
+    # Split 2:1 : Yahoo renvoie tout l'historique ajusté
+    source.history['A'] = _series([50.0] * 12)
+    store.sync('yahoo', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0, rebase_tolerance=1e-4)
+
+    assert source.calls[-1] == {'A': pd.Timestamp('2024-01-01')}
+    pd.testing.assert_series_equal(store.read('yahoo', 'A'), source.history['A'], check_freq=False)
+    assert store.meta('yahoo', 'A')['covered_from'] == '2024-01-01'
+
+
+def test_sync_ignores_change_of_last_live_bar(store):
+    source = FakeSource({'A': _series([100.0] * 10)})
+    store.sync('yahoo', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0, rebase_tolerance=1e-4)
+
+    history = _series([100.0] * 11)
+    history.iloc[9] = 103.0     # clôture définitive de la dernière séance stockée
+    source.history['A'] = history
+    store.sync('yahoo', ['A'], '2024-01-01', source, OVERLAP, min_refresh=0, rebase_tolerance=1e-4)
+
+    assert len(source.calls) == 2
+    pd.testing.assert_series_equal(store.read('yahoo', 'A'), history, check_freq=False)
@@ -0,0 +1,428 @@
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from analytics import build_pyramid, slice_pyramid
+from cache_backend import get_many, peek, track
+from fetchers import fetch_fred_series, fetch_yahoo_prices, period_start
+from instrumentation import timed
+
+# Stockage local des séries (SQLite) : l'historique est conservé entre les
+# redémarrages et chaque rafraîchissement ne demande que les observations
+# postérieures à la dernière date stockée.
+
+STORE_PATH = os.environ.get(
+    'HIRSCH_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.hirsch_store', 'timeseries.sqlite')
+)
+# Pas de nouvel appel réseau si la série a été rafraîchie il y a moins de ... (secondes)
+STORE_MIN_REFRESH = {
+    'fred': float(os.environ.get('HIRSCH_STORE_MIN_REFRESH', 900)),
+    'yahoo': float(os.environ.get('HIRSCH_STORE_MIN_REFRESH_YAHOO', 120)),
+}
+
+# Recouvrement demandé à chaque rafraîchissement pour capter les révisions
+FRED_REVISION_OVERLAP = pd.Timedelta(days=400)
+YAHOO_REVISION_OVERLAP = pd.Timedelta(days=7)
+# Les clôtures Yahoo sont ajustées : un split ou un dividende modifie tout
+# l'historique. Écart relatif au-delà duquel le recouvrement est jugé réajusté
+# et le ticker entièrement retéléchargé.
+YAHOO_REBASE_TOLERANCE = 1e-4
+# Marge pour les périodes courtes qui tombent sur un week-end / jour férié
+YAHOO_FETCH_PADDING = pd.Timedelta(days=7)
+
+# Durée de vie des entrées de cache par série (cached_fred_series, cached_yahoo_prices)
+FRED_SERIES_TTL = 3600
+YAHOO_SERIES_TTL = 900
+
+# Borne de couverture pour un historique complet ('max')
+_FULL_HISTORY = '0001-01-01'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (source, key, date)
+);
+CREATE TABLE IF NOT EXISTS series_meta (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    covered_from TEXT NOT NULL,
+    last_date TEXT,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (source, key)
+);
+"""
+
+
+def _as_date(value):
+    """Date au format texte stocké en base ('YYYY-MM-DD'), ou borne complète si None."""
+    if value is None:
+        return _FULL_HISTORY
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class TimeSeriesStore:
+    """Séries temporelles indexées par (source, clé) : 'fred'/series_id ou 'yahoo'/ticker."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def meta(self, source, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT covered_from, last_date, refreshed_at FROM series_meta WHERE source=? AND key=?',
+                (source, key)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'covered_from': row[0], 'last_date': row[1], 'refreshed_at': row[2]}
+
+    def read(self, source, key, start=None):
+        """Série stockée à partir de start (incluse)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT date, value FROM observations WHERE source=? AND key=? AND date>=? ORDER BY date',
+                (source, key, _as_date(start))
+            ).fetchall()
+        if not rows:
+            return pd.Series(dtype=float)
+        dates, values = zip(*rows)
+        return pd.Series(values, index=pd.DatetimeIndex(dates), dtype=float)
+
+    def write(self, source, key, series, covered_from=None):
+        """Ajoute (ou remplace) les observations et met à jour la couverture de la série.
+
+        covered_from=None conserve la couverture existante (rafraîchissement incrémental).
+        """
+        index = pd.DatetimeIndex(series.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        dates = list(index.strftime('%Y-%m-%d'))
+        values = [None if pd.isna(v) else float(v) for v in series.values]
+
+        previous = self.meta(source, key)
+        bounds = [d for d in [covered_from, previous and previous['covered_from']] if d]
+        if not bounds:
+            return
+        covered_from = min(bounds)
+        last_date = max(dates) if dates else None
+        if previous and previous['last_date']:
+            last_date = max(filter(None, [last_date, previous['last_date']]))
+
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)',
+                [(source, key, d, v) for d, v in zip(dates, values)]
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO series_meta VALUES (?, ?, ?, ?, ?)',
+                (source, key, covered_from, last_date, time.time())
+            )
+
+    def replace(self, source, key, series, covered_from):
+        """Remplace toutes les observations d'une série (historique réajusté)."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM observations WHERE source=? AND key=?', (source, key))
+            conn.execute('DELETE FROM series_meta WHERE source=? AND key=?', (source, key))
+        self.write(source, key, series, covered_from)
+
+    def _rebased(self, source, key, fetched, last_date, tolerance):
+        """Vrai si le recouvrement téléchargé diffère du stock (hors dernière cotation, encore vivante)."""
+        stored = self.read(source, key, fetched.index.min())
+        stored = stored[stored.index < pd.Timestamp(last_date)]
+        common = stored.index.intersection(pd.DatetimeIndex(fetched.index))
+        if common.empty:
+            return False
+        before = stored.loc[common]
+        after = fetched.loc[common].astype(float)
+        drift = ((after - before).abs() / before.abs().where(before != 0, 1)).max()
+        return bool(drift > tolerance)
+
+    def sync(self, source, keys, start, fetch_window, overlap, min_refresh=None, rebase_tolerance=None):
+        """Met à jour les séries demandées pour qu'elles couvrent au moins [start, aujourd'hui].
+
+        fetch_window({key: date_debut}) -> {key: pd.Series} est l'appel réseau.
+        Une série déjà couverte depuis start ne demande que ses dernières
+        observations (moins le recouvrement) ; sinon toute la fenêtre est téléchargée.
+        Avec rebase_tolerance, une série dont le recouvrement a changé (prix
+        ajustés après un split ou un dividende) est retéléchargée en entier.
+        """
+        if min_refresh is None:
+            min_refresh = STORE_MIN_REFRESH.get(source, 0)
+        wanted_from = _as_date(start)
+        now = time.time()
+        requests = {}
+        incremental = {}
+        for key in keys:
+            meta = self.meta(source, key)
+            if meta is not None and meta['covered_from'] <= wanted_from and meta['last_date']:
+                if now - meta['refreshed_at'] < min_refresh:
+                    continue
+                requests[key] = pd.Timestamp(meta['last_date']) - overlap
+                incremental[key] = meta
+            else:
+                requests[key] = start
+
+        if not requests:
+            return
+        fetched = fetch_window(requests)
+        rebased = {}
+        for key in requests:
+            meta = incremental.get(key)
+            if key in fetched:
+                if (meta is not None and rebase_tolerance is not None
+                        and self._rebased(source, key, fetched[key], meta['last_date'], rebase_tolerance)):
+                    rebased[key] = meta['covered_from']
+                    continue
+                self.write(source, key, fetched[key], None if meta is not None else wanted_from)
+            elif meta is not None:
+                # Rien de nouveau (ou source indisponible) : on garde le stock
+                self.write(source, key, pd.Series(dtype=float))
+
+        if rebased:
+            refetched = fetch_window({key: _as_start(covered_from) for key, covered_from in rebased.items()})
+            for key, covered_from in rebased.items():
+                if key in refetched:
+                    self.replace(source, key, refetched[key], covered_from)
+                else:
+                    # Historique complet indisponible : au moins les dernières observations
+                    self.write(source, key, fetched[key])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Store unique pour tout le processus."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimeSeriesStore()
+    return _store
+
+
+def _fetch_yahoo_window(starts):
+    """Télécharge les fenêtres Yahoo demandées en au plus deux lots (historique complet / depuis une date)."""
+    full = [t for t, s in starts.items() if s is None]
+    partial = {t: s for t, s in starts.items() if s is not None}
+
+    frames = []
+    if full:
+        frames.append(fetch_yahoo_prices(full, period='max'))
+    if partial:
+        first = min(partial.values()) - YAHOO_FETCH_PADDING
+        frames.append(fetch_yahoo_prices(list(partial), start=first.strftime('%Y-%m-%d')))
+
+    result = {}
+    for frame in frames:
+        for ticker in frame.columns:
+            result[ticker] = frame[ticker].dropna()
+    return result
+
+
+@timed('store', 'store.fred')
+def load_fred_series(series_ids, observation_start=None):
+    """Séries FRED depuis le store local, rafraîchies de façon incrémentale.
+
+    Renvoie un dict {series_id: pd.Series} (séries indisponibles absentes).
+    """
+    store = get_store()
+    series_ids = list(dict.fromkeys(series_ids))
+    store.sync(
+        'fred', series_ids, observation_start,
+        lambda starts: fetch_fred_series(starts.keys(), observation_start=starts),
+        FRED_REVISION_OVERLAP
+    )
+    result = {}
+    for series_id in series_ids:
+        series = store.read('fred', series_id, observation_start)
+        if not series.empty:
+            result[series_id] = series
+    return result
+
+
+def _as_start(covered_from):
+    """Inverse de _as_date : début de fenêtre à passer aux chargeurs (None = tout l'historique)."""
+    return None if covered_from == _FULL_HISTORY else pd.Timestamp(covered_from)
+
+
+def _reload_entries(load, close_ohlc, entries):
+    """Charge des entrées {clé de cache: (clé, début demandé)}, un appel à load par début de fenêtre.
+
+    Une entrée déjà en cache est rechargée sur toute la fenêtre qu'elle couvre
+    (revalidation, pré-chauffage) : elle ne rétrécit jamais.
+    """
+    windows = {}
+    for cache_key, (key, covered_from) in entries.items():
+        entry = peek(cache_key)
+        if entry is not None:
+            covered_from = min(covered_from, entry[0])
+        windows.setdefault(covered_from, {})[cache_key] = key
+
+    values = {}
+    for covered_from, keys in windows.items():
+        loaded = load(list(keys.values()), _as_start(covered_from))
+        values.update({
+            cache_key: (covered_from, build_pyramid(loaded[key], close_ohlc))
+            for cache_key, key in keys.items() if key in loaded
+        })
+    return values
+
+
+@functools.lru_cache(maxsize=None)
+def _series_loader(load, close_ohlc):
+    """Chargeur groupé propre à (load, close_ohlc) : le même objet d'un appel à l'autre,
+    pour que le pré-chauffage recharge ensemble toutes les séries d'une source."""
+    return functools.partial(_reload_entries, load, close_ohlc)
+
+
+def _series_entries(source, keys, start):
+    """Entrées par série : {clé de cache: (clé, début demandé)}."""
+    covered_from = _as_date(start)
+    return {f"{source}-pyramid-{key}": (key, covered_from) for key in dict.fromkeys(keys)}
+
+
+def _cached_series(source, keys, start, load, ttl, close_ohlc=False, prewarm=True):
+    """Une seule entrée de cache par série, quelle que soit la fenêtre demandée.
+
+    L'entrée vaut (début couvert, pyramide de la série, voir analytics.build_pyramid) :
+    une fenêtre plus courte la réutilise, une fenêtre plus longue la recharge
+    depuis le store et la remplace. load(clés, début) -> {clé: pd.Series}.
+    Renvoie {clé: pyramide complète en cache}. prewarm=False n'inscrit pas les
+    entrées au pré-chauffage.
+    """
+    covered_from = _as_date(start)
+    entries = _series_entries(source, keys, start)
+    values = get_many(entries, ttl, _series_loader(load, close_ohlc), source=source if prewarm else None,
+                      accept=lambda entry: entry[0] <= covered_from)
+    return {key: values[cache_key][1] for cache_key, (key, _) in entries.items() if cache_key in values}
+
+
+def _prewarm_series(source, keys, start, load, ttl, close_ohlc=False):
+    """Inscrit des séries auprès du pré-chauffage, sans les charger."""
+    loader = _series_loader(load, close_ohlc)
+    for cache_key, argument in _series_entries(source, keys, start).items():
+        track(cache_key, source, ttl, loader, argument)
+
+
+def _fred_pyramids(series_ids, observation_start, ttl):
+    pyramids = _cached_series('fred', series_ids, observation_start, load_fred_series, ttl)
+    return {series_id: slice_pyramid(pyramid, observation_start) for series_id, pyramid in pyramids.items()}
+
+
+@timed('cache', 'fred.series')
+def cached_fred_series(series_ids, observation_start=None, ttl=FRED_SERIES_TTL):
+    """load_fred_series avec une entrée de cache partagé par série.
+
+    Seules les séries absentes (ou couvrant une fenêtre trop courte) sont chargées,
+    en un seul appel groupé : ajouter un pays à une sélection ne coûte qu'une requête,
+    et une série utilisée par plusieurs pages n'est tenue qu'une fois en mémoire.
+    """
+    return {series_id: pyramid['D'] for series_id, pyramid in _fred_pyramids(series_ids, observation_start, ttl).items()}
+
+
+@timed('cache', 'fred.pyramids')
+def cached_fred_pyramids(series_ids, observation_start=None, ttl=FRED_SERIES_TTL):
+    """Comme cached_fred_series, mais chaque série avec ses niveaux agrégés (pour les graphiques)."""
+    return _fred_pyramids(series_ids, observation_start, ttl)
+
+
+def prewarm_fred_series(series_ids, observation_start=None, ttl=FRED_SERIES_TTL):
+    """Entrées de cached_fred_series inscrites au pré-chauffage sans appel réseau."""
+    _prewarm_series('fred', series_ids, observation_start, load_fred_series, ttl)
+
+
+@timed('store', 'store.yahoo')
+def load_yahoo_prices(tickers, period='1y'):
+    """Prix de clôture Yahoo depuis le store local, en DataFrame aligné (une colonne par ticker)."""
+    store = get_store()
+    tickers = list(dict.fromkeys(tickers))
+    store.sync('yahoo', tickers, period_start(period), _fetch_yahoo_window, YAHOO_REVISION_OVERLAP,
+               rebase_tolerance=YAHOO_REBASE_TOLERANCE)
+
+    columns = {}
+    for ticker in tickers:
+        meta = store.meta('yahoo', ticker)
+        if meta is None or not meta['last_date']:
+            continue
+        # Fenêtre recalée sur la dernière cotation (week-ends, jours fériés)
+        series = store.read('yahoo', ticker, period_start(period, end=meta['last_date']))
+        if not series.empty:
+            columns[ticker] = series
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame(columns).sort_index()
+
+
+def _load_yahoo_series(tickers, start):
+    """Prix Yahoo depuis le store, sous forme {ticker: pd.Series} à partir de start."""
+    store = get_store()
+    store.sync('yahoo', tickers, start, _fetch_yahoo_window, YAHOO_REVISION_OVERLAP,
+               rebase_tolerance=YAHOO_REBASE_TOLERANCE)
+    result = {}
+    for ticker in tickers:
+        series = store.read('yahoo', ticker, start)
+        if not series.empty:
+            result[ticker] = series
+    return result
+
+
+def _yahoo_start(period):
+    start = period_start(period)
+    if start is not None:
+        # Marge pour recaler la fenêtre sur la dernière cotation
+        start -= YAHOO_FETCH_PADDING
+    return start
+
+
+def _yahoo_pyramids(tickers, period, ttl, prewarm=True):
+    pyramids = _cached_series('yahoo', tickers, _yahoo_start(period), _load_yahoo_series, ttl, close_ohlc=True, prewarm=prewarm)
+
+    result = {}
+    for ticker in dict.fromkeys(tickers):
+        pyramid = pyramids.get(ticker)
+        if pyramid is not None and not pyramid['D'].empty:
+            result[ticker] = slice_pyramid(pyramid, period_start(period, end=pyramid['D'].index[-1]))
+    return result
+
+
+@timed('cache', 'yahoo.series')
+def cached_yahoo_prices(tickers, period='1y', ttl=YAHOO_SERIES_TTL, prewarm=True):
+    """load_yahoo_prices avec une entrée de cache partagé par ticker.
+
+    Toutes les périodes d'un ticker partagent la même série : '1mo' est une
+    tranche de l'entrée chargée pour '1y', sans nouveau téléchargement.
+    prewarm=False pour les grands univers (screener) à ne pas rafraîchir en fond.
+    """
+    columns = {ticker: pyramid['D'] for ticker, pyramid in _yahoo_pyramids(tickers, period, ttl, prewarm).items()}
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame(columns).sort_index()
+
+
+@timed('cache', 'yahoo.pyramids')
+def cached_yahoo_pyramids(tickers, period='1y', ttl=YAHOO_SERIES_TTL):
+    """Comme cached_yahoo_prices, mais chaque ticker avec ses niveaux agrégés en OHLC des clôtures (pour les graphiques)."""
+    return _yahoo_pyramids(tickers, period, ttl)
+
+
+def prewarm_yahoo_prices(tickers, period='1y', ttl=YAHOO_SERIES_TTL):
+    """Entrées de cached_yahoo_prices inscrites au pré-chauffage sans appel réseau."""
+    _prewarm_series('yahoo', tickers, _yahoo_start(period), _load_yahoo_series, ttl, close_ohlc=True)